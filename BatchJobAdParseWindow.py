@@ -0,0 +1,428 @@
+# BatchJobAdParseWindow.py
+import re
+import tkinter as tk
+from tkinter import ttk, messagebox, filedialog
+from pathlib import Path
+
+import tksheet as tks
+
+import model as m
+import repository
+import company_match
+import task_runner
+import ai_cache
+
+# Parallel AI calls per batch (kept small: the model API rate-limits)
+BATCH_WORKERS = 4
+
+# A line made only of ---, ===, *** or ### (3+ chars) separates two ads
+AD_SEPARATOR = re.compile(r"^\s*([-=*#])\1{2,}\s*$", re.MULTILINE)
+
+HUNT_KEYS = [
+    "jobTitle",
+    "jobDescription",
+    "jobSource",
+    "salaryBaseMin",
+    "salaryBaseMax",
+    "salaryIndustryAvg",
+    "salaryExpecting",
+    "currency",
+    "otRateRatio",
+    "workArrangement",
+    "hasHealthInsurance",
+]
+
+# NewHuntWindow data key -> parsed company field
+COMPANY_KEYS = {
+    "companyName": "name",
+    "companyIndustry": "industry",
+    "companyDescription": "description",
+    "companyIsMnc": "isMnc",
+    "companyAddress": "address",
+    "companyWebsite": "website",
+    "companyPhone": "phone",
+    "companyEmail": "email",
+    "companyReputation": "reputation",
+}
+
+
+def split_ads(text: str):
+    """Split a multi-ad text on separator lines; blank chunks are dropped."""
+    parts = AD_SEPARATOR.split(text or "")
+    # re.split also returns the captured separator character; skip those
+    chunks = parts[::2]
+    return [c.strip() for c in chunks if c.strip()]
+
+
+def parse_ad(raw: str):
+    """
+    Parse one ad on a worker thread. The AI client is imported here, so
+    the UI does not wait for it and an import failure shows up as that
+    ad's error.
+    """
+    from ai_service import parse_job_ad  # AI client loads on first use
+
+    return ai_cache.cached_call("parse_job_ad", parse_job_ad, raw)
+
+
+def hunt_data(parsed) -> dict:
+    """A parsed ad as the data dict NewHuntWindow.on_create() sends the controller."""
+    hunt = parsed.get("hunt", {}) or {}
+    company = parsed.get("company", {}) or {}
+
+    data = {key: str(hunt.get(key, "") or "") for key in HUNT_KEYS}
+    for key, field in COMPANY_KEYS.items():
+        data[key] = str(company.get(field, "") or "").strip()
+    return data
+
+
+class BatchJobAdParseWindow(tk.Toplevel):
+    """
+    Parse many job ads at once and create all hunts in one go.
+
+    Results sheet columns:
+      0: #            1: Status       2: Job Title
+      3: Company      4: Company Link (existing / new / batch / skipped)
+
+    Hunts are created through controller.create_new_hunt, like a single
+    parsed ad; ads without a company name are skipped.
+    """
+
+    def __init__(self, parent, controller):
+        super().__init__(parent)
+        self.controller = controller
+
+        self.ads = []        # raw ad texts
+        self.results = []    # parsed dict or None, same order as self.ads
+        self.tasks = []
+        self.runner = None
+        self.done_count = 0
+
+        self.title("Batch Parse Job Ads with AI")
+        self.geometry("1100x750")
+        self.iconbitmap("icon.ico")
+
+        main = tk.Frame(self)
+        main.pack(fill="both", expand=True, padx=10, pady=10)
+        main.columnconfigure(0, weight=1)
+        main.rowconfigure(0, weight=1)
+        main.rowconfigure(2, weight=1)
+
+        # -----------------------------
+        # Top: ads input
+        # -----------------------------
+        top_frame = tk.LabelFrame(
+            main,
+            text="Job Advertisements (separate ads with a line of --- )",
+        )
+        top_frame.grid(row=0, column=0, sticky="nsew", pady=(0, 5))
+
+        self.txt_ads = tk.Text(top_frame, wrap="word", height=10)
+        self.txt_ads.pack(fill="both", expand=True, padx=5, pady=5)
+
+        load_row = tk.Frame(top_frame)
+        load_row.pack(fill="x", padx=5, pady=(0, 5))
+
+        tk.Button(load_row, text="Load File...", command=self._on_load_file).pack(side="left")
+        tk.Button(load_row, text="Load Folder...", command=self._on_load_folder).pack(
+            side="left", padx=(5, 0)
+        )
+
+        # -----------------------------
+        # Middle: parse controls + progress
+        # -----------------------------
+        ctrl = tk.Frame(main)
+        ctrl.grid(row=1, column=0, sticky="we", pady=5)
+
+        self.btn_parse = tk.Button(ctrl, text="Parse All with AI", command=self._on_parse_clicked)
+        self.btn_parse.pack(side="right")
+
+        self.btn_cancel = tk.Button(ctrl, text="Cancel", command=self._on_cancel, state="disabled")
+        self.btn_cancel.pack(side="right", padx=(0, 5))
+
+        self.progress = ttk.Progressbar(ctrl, mode="determinate", length=300)
+        self.progress.pack(side="left")
+
+        self.lbl_status = tk.Label(ctrl, text="", anchor="w")
+        self.lbl_status.pack(side="left", padx=(10, 0))
+
+        # -----------------------------
+        # Results
+        # -----------------------------
+        self.sheet = tks.Sheet(
+            main,
+            data=[],
+            headers=["#", "Status", "Job Title", "Company", "Company Link"],
+        )
+        self.sheet.grid(row=2, column=0, sticky="nsew")
+        self.sheet.enable_bindings((
+            "arrowkeys",
+            "copy",
+            "column_width_resize",
+            "row_select",
+            "single_select",
+        ))
+
+        # -----------------------------
+        # Bottom buttons
+        # -----------------------------
+        btn_row = tk.Frame(main)
+        btn_row.grid(row=3, column=0, sticky="e", pady=(5, 0))
+
+        self.btn_create = tk.Button(
+            btn_row,
+            text="Create All Hunts & Close",
+            command=self._on_create_all,
+            state="disabled",
+        )
+        self.btn_create.pack(side="right")
+
+        self.protocol("WM_DELETE_WINDOW", self._on_close)
+
+    # =========================================================
+    # Loading
+    # =========================================================
+    def _on_load_file(self):
+        path = filedialog.askopenfilename(
+            parent=self,
+            title="Select a text file with one or more job ads",
+            filetypes=[("Text files", "*.txt"), ("All files", "*.*")],
+        )
+        if not path:
+            return
+
+        text = Path(path).read_text(encoding="utf-8", errors="replace")
+        self._append_ads_text(text)
+
+    def _on_load_folder(self):
+        folder = filedialog.askdirectory(parent=self, title="Select a folder of job ads")
+        if not folder:
+            return
+
+        texts = []
+        for p in sorted(Path(folder).glob("*.txt")):
+            texts.append(p.read_text(encoding="utf-8", errors="replace").strip())
+
+        if not texts:
+            messagebox.showinfo("No ads", "No .txt files found in that folder.", parent=self)
+            return
+
+        self._append_ads_text("\n---\n".join(t for t in texts if t))
+
+    def _append_ads_text(self, text: str):
+        current = self.txt_ads.get("1.0", "end").strip()
+        if current:
+            self.txt_ads.insert("end", "\n---\n")
+        self.txt_ads.insert("end", text)
+
+    # =========================================================
+    # Parsing
+    # =========================================================
+    def _on_parse_clicked(self):
+        self.ads = split_ads(self.txt_ads.get("1.0", "end"))
+        if not self.ads:
+            messagebox.showerror("No text", "Please paste or load job advertisements first.", parent=self)
+            return
+
+        self.results = [None] * len(self.ads)
+        self.done_count = 0
+
+        rows = []
+        for i, ad in enumerate(self.ads):
+            first_line = ad.splitlines()[0][:80] if ad else ""
+            rows.append([str(i + 1), "Queued", first_line, "", ""])
+        self.sheet.set_sheet_data(rows)
+
+        self.progress.config(maximum=len(self.ads), value=0)
+        self.btn_parse.config(state="disabled")
+        self.btn_cancel.config(state="normal")
+        self.btn_create.config(state="disabled")
+        self._update_status()
+
+        # Dedicated bounded pool so a big batch does not starve other windows
+        self.runner = task_runner.TaskRunner(self, max_workers=BATCH_WORKERS)
+        self.tasks = []
+        for i, ad in enumerate(self.ads):
+            task = self.runner.submit(
+                parse_ad,
+                ad,
+                on_done=lambda parsed, i=i: self._on_one_done(i, parsed),
+                on_error=lambda e, i=i: self._on_one_error(i, e),
+                name=f"parse_job_ad[{i}]",
+            )
+            self.tasks.append(task)
+
+    def _on_one_done(self, i, parsed):
+        self.results[i] = parsed or {}
+        hunt = self.results[i].get("hunt", {}) or {}
+        company = self.results[i].get("company", {}) or {}
+
+        self.sheet.set_cell_data(i, 1, "Parsed", redraw=False)
+        self.sheet.set_cell_data(i, 2, hunt.get("jobTitle", ""), redraw=False)
+        self.sheet.set_cell_data(i, 3, company.get("name", ""), redraw=False)
+        self._finish_one()
+
+    def _on_one_error(self, i, e):
+        self.sheet.set_cell_data(i, 1, f"Error: {e}", redraw=False)
+        self._finish_one()
+
+    def _finish_one(self):
+        self.done_count += 1
+        self.progress.config(value=self.done_count)
+        self._update_status()
+
+        if self.done_count >= len(self.ads):
+            self._on_batch_finished()
+        else:
+            self.sheet.redraw()
+
+    def _on_batch_finished(self):
+        self.runner.shutdown()
+        self.runner = None
+        self.btn_parse.config(state="normal")
+        self.btn_cancel.config(state="disabled")
+
+        self._refresh_company_links()
+        self.sheet.redraw()
+
+        if any(r for r in self.results):
+            self.btn_create.config(state="normal")
+
+    def _update_status(self):
+        ok = sum(1 for r in self.results if r)
+        self.lbl_status.config(
+            text=f"{self.done_count}/{len(self.ads)} done, {ok} parsed"
+        )
+
+    def _on_cancel(self):
+        if self.runner is not None:
+            self.runner.shutdown()
+            self.runner = None
+        self.tasks = []
+        self.btn_parse.config(state="normal")
+        self.btn_cancel.config(state="disabled")
+
+        if any(r for r in self.results):
+            self._refresh_company_links()
+            self.btn_create.config(state="normal")
+        self.lbl_status.config(text=self.lbl_status.cget("text") + " (cancelled)")
+
+    def _on_close(self):
+        if self.runner is not None:
+            self.runner.shutdown()
+            self.runner = None
+        self.destroy()
+
+    # =========================================================
+    # Company de-duplication
+    # =========================================================
+    def _company_plan(self):
+        """
+        For each parsed result:
+            ("existing", row) | ("new", key) | ("batch", key) | ("skip", None) | None
+        Companies with the same name inside the batch are created once; ads
+        without a company name are skipped rather than given a blank company.
+        """
+        repo = repository.for_controller(self.controller)
+        plan = []
+        seen_new = set()
+
+        for parsed in self.results:
+            if not parsed:
+                plan.append(None)
+                continue
+
+            company = parsed.get("company", {}) or {}
+            cname = (company.get("name") or "").strip()
+            if not cname:
+                plan.append(("skip", None))
+                continue
+
+            existing = repo.resolve_company(cname)
+            if existing is not None:
+                plan.append(("existing", existing))
+                continue
+
+            key = company_match.normalize_name(cname)
+            if key in seen_new:
+                plan.append(("batch", key))
+            else:
+                seen_new.add(key)
+                plan.append(("new", key))
+
+        return plan
+
+    def _refresh_company_links(self):
+        labels = {
+            "existing": "Existing",
+            "new": "New",
+            "batch": "New (shared in batch)",
+            "skip": "No company (skipped)",
+        }
+        for i, entry in enumerate(self._company_plan()):
+            self.sheet.set_cell_data(i, 4, labels[entry[0]] if entry else "", redraw=False)
+
+    # =========================================================
+    # Create all hunts (through the controller, one table refresh)
+    # =========================================================
+    def _on_create_all(self):
+        repo = repository.for_controller(self.controller)
+        plan = self._company_plan()
+        name_idx = m.COMPANY_FIELDS.index("name")
+        id_idx = m.COMPANY_FIELDS.index("id")
+
+        todo = [
+            (i, parsed, entry)
+            for i, (parsed, entry) in enumerate(zip(self.results, plan))
+            if parsed and entry is not None and entry[0] != "skip"
+        ]
+
+        # Same near-duplicate check as a single ad, asked once for the batch
+        duplicates = set()
+        for i, parsed, (kind, ref) in todo:
+            hunt = parsed.get("hunt", {}) or {}
+            company_id = ref[id_idx] if kind == "existing" else ""
+            if repo.duplicates.check(hunt.get("jobTitle", ""), hunt.get("jobDescription", ""), company_id):
+                duplicates.add(i)
+                self.sheet.set_cell_data(i, 1, "Possible duplicate", redraw=False)
+        if duplicates:
+            self.sheet.redraw()
+            answer = messagebox.askyesnocancel(
+                "Possible Duplicates",
+                f"{len(duplicates)} ad(s) look like hunts you already have "
+                "(marked \"Possible duplicate\").\n\n"
+                "Create them anyway? Choose No to skip them.",
+                icon="warning",
+                parent=self,
+            )
+            if answer is None:
+                return
+            if not answer:
+                todo = [item for item in todo if item[0] not in duplicates]
+
+        new_company_names = {}   # normalized name -> name created in this batch
+        created = 0
+
+        # One main-sheet reload for the whole batch
+        with self.controller.view.hold_refresh():
+            for i, parsed, (kind, ref) in todo:
+                data = hunt_data(parsed)
+                if kind == "existing":
+                    data["companyMode"] = "existing"
+                    data["companyName"] = ref[name_idx]
+                elif kind == "batch":
+                    data["companyMode"] = "existing"
+                    data["companyName"] = new_company_names[ref]
+                else:
+                    data["companyMode"] = "new"
+                    new_company_names[ref] = data["companyName"]
+
+                self.controller.create_new_hunt(data)
+                created += 1
+
+        skipped = sum(1 for r in self.results if r) - created
+        message = f"Created {created} hunt(s)."
+        if skipped:
+            message += f" Skipped {skipped} (no company name or duplicate)."
+        messagebox.showinfo("Batch Parse", message, parent=self)
+        self._on_close()
@@ -0,0 +1,338 @@
+# BatchResumeWindow.py
+import os
+import tkinter as tk
+from tkinter import ttk, messagebox
+from datetime import datetime
+from typing import Dict, Any
+
+import tksheet as tks
+
+import repository
+import task_runner
+import profile_digest
+import resume_service
+from app_paths import OUTPUT_DIR
+from ResumeWindow import default_target_role, resume_filename
+
+# Parallel AI calls per batch (kept small: the model API rate-limits)
+BATCH_WORKERS = 4
+
+COL_STATUS = 2
+COL_FILE = 3
+
+
+def _render_all(jobs, task):
+    """Worker thread: render every DOCX in resume_service's process pool."""
+    return resume_service.render_resumes(
+        jobs,
+        on_result=lambda i, path, error: task.report((i, path, error)),
+        cancelled=lambda: task.cancelled,
+    )
+
+
+class BatchResumeWindow(tk.Toplevel):
+    """
+    Generate resumes for many hunts at once.
+
+    Stage 1: generate_resume_structure for every hunt (bounded thread pool).
+    Stage 2: render all DOCX files into OUTPUT_DIR in worker processes.
+
+    Results sheet columns:
+      0: #       1: Hunt       2: Status       3: File
+    """
+
+    def __init__(self, parent, controller, hunt_ids):
+        super().__init__(parent)
+        self.controller = controller
+        self.hunt_ids = list(hunt_ids)
+
+        repo = repository.for_controller(controller)
+        self.contexts = [repo.hunt_context(hunt_id) for hunt_id in self.hunt_ids]
+
+        self.resumes = []   # resume JSON or None, same order as hunt_ids
+        self.files = []     # output path or "", same order as hunt_ids
+        self.runner = None
+        self.done_count = 0
+
+        self.title(f"Batch Resumes ({len(self.hunt_ids)} hunts)")
+        self.geometry("1000x650")
+        self.iconbitmap("icon.ico")
+
+        main = tk.Frame(self)
+        main.pack(fill="both", expand=True, padx=10, pady=10)
+        main.columnconfigure(0, weight=1)
+        main.rowconfigure(2, weight=1)
+
+        # -----------------------------
+        # Shared preferences
+        # -----------------------------
+        pref_frame = tk.LabelFrame(main, text="Resume Preferences (optional, shared by all hunts)")
+        pref_frame.grid(row=0, column=0, sticky="we", pady=(0, 5))
+        pref_frame.columnconfigure(1, weight=1)
+
+        tk.Label(pref_frame, text="Target role (blank: each hunt's job title)").grid(
+            row=0, column=0, sticky="w", pady=3
+        )
+        self.ent_target_role = tk.Entry(pref_frame)
+        self.ent_target_role.grid(row=0, column=1, sticky="we", pady=3)
+
+        tk.Label(pref_frame, text="Tone (e.g. concise, formal)").grid(row=1, column=0, sticky="w", pady=3)
+        self.ent_tone = tk.Entry(pref_frame)
+        self.ent_tone.grid(row=1, column=1, sticky="we", pady=3)
+
+        tk.Label(pref_frame, text="Skills to emphasise (comma-separated)").grid(
+            row=2, column=0, sticky="w", pady=3
+        )
+        self.ent_skills = tk.Entry(pref_frame)
+        self.ent_skills.grid(row=2, column=1, sticky="we", pady=3)
+
+        tk.Label(pref_frame, text="Extra notes for AI").grid(row=3, column=0, sticky="nw", pady=3)
+        self.txt_notes = tk.Text(pref_frame, height=3)
+        self.txt_notes.grid(row=3, column=1, sticky="we", pady=3)
+
+        # -----------------------------
+        # Controls + progress
+        # -----------------------------
+        ctrl = tk.Frame(main)
+        ctrl.grid(row=1, column=0, sticky="we", pady=5)
+
+        self.btn_generate = tk.Button(ctrl, text="Generate All Resumes", command=self._on_generate_clicked)
+        self.btn_generate.pack(side="right")
+
+        # Generate All reuses cached content for unchanged contexts
+        self.btn_regenerate = tk.Button(
+            ctrl, text="Regenerate All", command=lambda: self._on_generate_clicked(refresh=True)
+        )
+        self.btn_regenerate.pack(side="right", padx=(0, 5))
+
+        self.btn_cancel = tk.Button(ctrl, text="Cancel", command=self._on_cancel, state="disabled")
+        self.btn_cancel.pack(side="right", padx=(0, 5))
+
+        self.progress = ttk.Progressbar(ctrl, mode="determinate", length=300)
+        self.progress.pack(side="left")
+
+        self.lbl_status = tk.Label(ctrl, text="", anchor="w")
+        self.lbl_status.pack(side="left", padx=(10, 0))
+
+        # -----------------------------
+        # Per-hunt results
+        # -----------------------------
+        rows = []
+        for i, hunt_id in enumerate(self.hunt_ids):
+            try:
+                label = self.controller._build_hunt_label(hunt_id)
+            except Exception:
+                label = hunt_id
+            rows.append([str(i + 1), label, "", ""])
+
+        self.sheet = tks.Sheet(main, data=rows, headers=["#", "Hunt", "Status", "File"])
+        self.sheet.grid(row=2, column=0, sticky="nsew")
+        self.sheet.enable_bindings((
+            "arrowkeys",
+            "copy",
+            "column_width_resize",
+            "row_select",
+            "single_select",
+        ))
+
+        # -----------------------------
+        # Bottom buttons
+        # -----------------------------
+        btn_row = tk.Frame(main)
+        btn_row.grid(row=3, column=0, sticky="we", pady=(5, 0))
+
+        tk.Button(btn_row, text="Open Selected", command=self._on_open_selected).pack(side="left")
+        tk.Button(btn_row, text="Open Output Folder", command=self._on_open_folder).pack(
+            side="left", padx=(5, 0)
+        )
+        tk.Button(btn_row, text="Close", command=self._on_close).pack(side="right")
+
+        self.protocol("WM_DELETE_WINDOW", self._on_close)
+
+    # =========================================================
+    # Stage 1: AI resume structures
+    # =========================================================
+    def _collect_prefs(self) -> Dict[str, Any]:
+        return {
+            "targetRole": self.ent_target_role.get().strip(),
+            "tone": self.ent_tone.get().strip(),
+            "skillsToEmphasise": self.ent_skills.get().strip(),
+            "notes": self.txt_notes.get("1.0", "end").strip(),
+        }
+
+    def _on_generate_clicked(self, refresh=False):
+        personal = profile_digest.personal_for_prompt()
+        prefs = self._collect_prefs()
+
+        n = len(self.hunt_ids)
+        self.resumes = [None] * n
+        self.files = [""] * n
+        self.done_count = 0
+
+        for i in range(n):
+            self._set_cells(i, "Queued", "")
+        self.sheet.redraw()
+
+        # One step per AI call plus one per rendered file
+        self.progress.config(maximum=2 * n, value=0)
+        self.btn_generate.config(state="disabled")
+        self.btn_regenerate.config(state="disabled")
+        self.btn_cancel.config(state="normal")
+        self.lbl_status.config(text="Generating resume content...")
+
+        # Dedicated bounded pool so a big batch does not starve other windows
+        self.runner = task_runner.TaskRunner(self, max_workers=BATCH_WORKERS)
+        for i, ctx in enumerate(self.contexts):
+            hunt_prefs = dict(prefs)
+            hunt_prefs["targetRole"] = prefs["targetRole"] or default_target_role(ctx)
+            context = {"personal": personal, **ctx, "prefs": hunt_prefs}
+
+            self.runner.submit(
+                resume_service.generate_resume_structure,
+                context,
+                refresh=refresh,
+                on_done=lambda resume, i=i: self._on_structure_done(i, resume),
+                on_error=lambda e, i=i: self._on_structure_error(i, e),
+                name=f"resume_structure[{i}]",
+            )
+
+    def _on_structure_done(self, i, resume):
+        self.resumes[i] = resume or {}
+        self._set_cells(i, "Content ready")
+        self._finish_structure()
+
+    def _on_structure_error(self, i, e):
+        self._set_cells(i, f"AI error: {e}")
+        self._finish_structure()
+
+    def _finish_structure(self):
+        self.done_count += 1
+        self.progress.config(value=self.done_count)
+        self.sheet.redraw()
+
+        if self.done_count >= len(self.hunt_ids):
+            self._start_render()
+
+    # =========================================================
+    # Stage 2: DOCX rendering (process pool)
+    # =========================================================
+    def _output_paths(self):
+        """Output file per generated resume; same-name hunts get a suffix."""
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        used = set()
+        paths = {}
+        for i, resume in enumerate(self.resumes):
+            if resume is None:
+                continue
+            name = resume_filename(self.contexts[i], timestamp)
+            stem, n = name[:-len(".docx")], 2
+            while name in used:
+                name = f"{stem}_{n}.docx"
+                n += 1
+            used.add(name)
+            paths[i] = OUTPUT_DIR / name
+        return paths
+
+    def _start_render(self):
+        paths = self._output_paths()
+        self.render_rows = sorted(paths)
+        if not self.render_rows:
+            self._on_batch_finished()
+            return
+
+        jobs = []
+        for i in self.render_rows:
+            jobs.append((self.resumes[i], paths[i]))
+            self._set_cells(i, "Rendering")
+        self.sheet.redraw()
+
+        # Rows with no resume will never render; count them as done
+        self.progress.config(value=self.done_count + len(self.hunt_ids) - len(jobs))
+        self.lbl_status.config(text=f"Writing {len(jobs)} DOCX file(s)...")
+
+        self.runner.submit(
+            _render_all,
+            jobs,
+            pass_task=True,
+            on_progress=self._on_rendered,
+            on_done=lambda results: self._on_batch_finished(),
+            on_error=self._on_render_error,
+            name="render_resumes",
+        )
+
+    def _on_rendered(self, value):
+        j, path, error = value
+        i = self.render_rows[j]
+        if error is None:
+            self.files[i] = path
+            self._set_cells(i, "Done", path)
+        else:
+            self._set_cells(i, f"DOCX error: {error}")
+
+        self.progress.step(1)
+        self.sheet.redraw()
+
+    def _on_render_error(self, e):
+        for i in self.render_rows:
+            if not self.files[i]:
+                self._set_cells(i, f"DOCX error: {e}")
+        self._on_batch_finished()
+
+    def _on_batch_finished(self):
+        if self.runner is not None:
+            self.runner.shutdown()
+            self.runner = None
+        self.btn_generate.config(state="normal")
+        self.btn_regenerate.config(state="normal")
+        self.btn_cancel.config(state="disabled")
+        self.progress.config(value=self.progress.cget("maximum"))
+        self.sheet.redraw()
+
+        ok = sum(1 for f in self.files if f)
+        self.lbl_status.config(text=f"{ok}/{len(self.hunt_ids)} resume(s) written to {OUTPUT_DIR}")
+
+    def _on_cancel(self):
+        if self.runner is not None:
+            self.runner.shutdown()
+            self.runner = None
+
+        for i in range(len(self.hunt_ids)):
+            status = self.sheet.get_cell_data(i, COL_STATUS)
+            if status in ("Queued", "Content ready", "Rendering"):
+                self._set_cells(i, "Cancelled")
+        self.sheet.redraw()
+
+        self.btn_generate.config(state="normal")
+        self.btn_regenerate.config(state="normal")
+        self.btn_cancel.config(state="disabled")
+        self.lbl_status.config(text=self.lbl_status.cget("text") + " (cancelled)")
+
+    # =========================================================
+    # Helpers / buttons
+    # =========================================================
+    def _set_cells(self, i, status, file=None):
+        self.sheet.set_cell_data(i, COL_STATUS, status, redraw=False)
+        if file is not None:
+            self.sheet.set_cell_data(i, COL_FILE, str(file), redraw=False)
+
+    def _open_path(self, path):
+        try:
+            os.startfile(path)  # type: ignore[attr-defined]
+        except Exception as e:
+            messagebox.showerror("Open", f"Could not open:\n{path}\n\n{e}", parent=self)
+
+    def _on_open_selected(self):
+        for d in self.sheet.get_selected_rows(get_cells_as_rows=True):
+            i = self.sheet.displayed_row_to_data(d)
+            if i < len(self.files) and self.files[i]:
+                self._open_path(self.files[i])
+
+    def _on_open_folder(self):
+        OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+        self._open_path(OUTPUT_DIR)
+
+    def _on_close(self):
+        if self.runner is not None:
+            self.runner.shutdown()
+            self.runner = None
+        self.destroy()
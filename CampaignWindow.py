@@ -0,0 +1,390 @@
+# CampaignWindow.py
+import tkinter as tk
+from tkinter import ttk, messagebox, filedialog
+from typing import Dict, Any
+
+import repository
+import task_runner
+import ai_cache
+import mail_queue
+import profile_digest
+from EmailWindow import default_subject, company_recipient
+
+# Parallel AI calls while generating a campaign
+CAMPAIGN_WORKERS = 4
+
+# Emails shown per page in the review list
+PAGE_SIZE = 15
+
+
+class CampaignWindow(tk.Toplevel):
+    """
+    Mail-merge over the hunts selected on the main sheet:
+      1. shared preferences + attachments
+      2. generate every email concurrently (bounded)
+      3. review / edit them in one paged list
+      4. queue the included ones on mail_queue (rate-limited, retried)
+    """
+
+    def __init__(self, parent, controller, hunt_ids):
+        super().__init__(parent)
+        self.controller = controller
+
+        repo = repository.for_controller(controller)
+        personal = profile_digest.personal_for_prompt()
+
+        # One item per hunt:
+        # {"hunt_id", "label", "context", "to", "subject", "body", "status", "include"}
+        self.items = []
+        for hunt_id in hunt_ids:
+            context = {"personal": personal, **repo.hunt_context(hunt_id), "prefs": {}}
+            hunt = context["hunt"]
+            company = context["company"]
+            self.items.append({
+                "hunt_id": hunt_id,
+                "label": f"{company.get('name', '') or '?'} — {hunt.get('jobTitle', '') or '?'}",
+                "context": context,
+                # Blank when the company has no email (never the user's own)
+                "to": company_recipient(context),
+                "subject": default_subject(context),
+                "body": "",
+                "status": "Not generated",
+                "include": True,
+            })
+
+        self.attachments = []
+        self.runner = None
+        self.done_count = 0
+        self.page = 0
+        self.current = None   # index into self.items shown in the editor
+
+        self.title(f"Email Campaign ({len(self.items)} hunts)")
+        self.geometry("1100x750")
+        self.iconbitmap("icon.ico")
+
+        main = tk.Frame(self)
+        main.pack(fill="both", expand=True, padx=10, pady=10)
+        main.columnconfigure(0, weight=1)
+        main.rowconfigure(2, weight=1)
+
+        # -----------------------------
+        # Shared preferences
+        # -----------------------------
+        pref_frame = tk.LabelFrame(main, text="Shared Email Preferences (optional)")
+        pref_frame.grid(row=0, column=0, sticky="we", pady=(0, 5))
+        pref_frame.columnconfigure(1, weight=1)
+
+        tk.Label(pref_frame, text="Tone (e.g. concise, formal)").grid(row=0, column=0, sticky="w", pady=3)
+        self.ent_tone = tk.Entry(pref_frame)
+        self.ent_tone.grid(row=0, column=1, sticky="we", pady=3)
+
+        tk.Label(pref_frame, text="Skills to emphasise (comma-separated)").grid(
+            row=1, column=0, sticky="w", pady=3
+        )
+        self.ent_skills = tk.Entry(pref_frame)
+        self.ent_skills.grid(row=1, column=1, sticky="we", pady=3)
+
+        tk.Label(pref_frame, text="Extra notes for AI").grid(row=2, column=0, sticky="nw", pady=3)
+        self.txt_notes = tk.Text(pref_frame, height=2)
+        self.txt_notes.grid(row=2, column=1, sticky="we", pady=3)
+
+        # -----------------------------
+        # Generate controls
+        # -----------------------------
+        gen_row = tk.Frame(main)
+        gen_row.grid(row=1, column=0, sticky="we", pady=5)
+
+        self.btn_generate = tk.Button(gen_row, text="Generate All", command=self._on_generate_all)
+        self.btn_generate.pack(side="left")
+
+        # Generate All reuses cached drafts for unchanged contexts
+        self.btn_regenerate = tk.Button(
+            gen_row, text="Regenerate All", command=lambda: self._on_generate_all(refresh=True)
+        )
+        self.btn_regenerate.pack(side="left", padx=(5, 0))
+
+        self.btn_cancel = tk.Button(gen_row, text="Cancel", command=self._on_cancel, state="disabled")
+        self.btn_cancel.pack(side="left", padx=(5, 0))
+
+        self.progress = ttk.Progressbar(gen_row, mode="determinate", length=250)
+        self.progress.pack(side="left", padx=(10, 0))
+
+        self.lbl_status = tk.Label(gen_row, text="", anchor="w")
+        self.lbl_status.pack(side="left", padx=(10, 0))
+
+        # -----------------------------
+        # Review: paged list (left) + editor (right)
+        # -----------------------------
+        review = tk.Frame(main)
+        review.grid(row=2, column=0, sticky="nsew")
+        review.columnconfigure(1, weight=1)
+        review.rowconfigure(0, weight=1)
+
+        list_frame = tk.Frame(review)
+        list_frame.grid(row=0, column=0, sticky="nsw", padx=(0, 10))
+
+        self.listbox = tk.Listbox(list_frame, width=55, exportselection=False)
+        self.listbox.pack(fill="both", expand=True)
+        self.listbox.bind("<<ListboxSelect>>", self._on_list_select)
+
+        pager = tk.Frame(list_frame)
+        pager.pack(fill="x", pady=(5, 0))
+        tk.Button(pager, text="◀ Prev", command=lambda: self._goto_page(self.page - 1)).pack(side="left")
+        self.lbl_page = tk.Label(pager, text="")
+        self.lbl_page.pack(side="left", expand=True)
+        tk.Button(pager, text="Next ▶", command=lambda: self._goto_page(self.page + 1)).pack(side="right")
+
+        editor = tk.LabelFrame(review, text="Email")
+        editor.grid(row=0, column=1, sticky="nsew")
+        editor.columnconfigure(1, weight=1)
+        editor.rowconfigure(3, weight=1)
+
+        self.include_var = tk.BooleanVar(value=True)
+        tk.Checkbutton(
+            editor, text="Include in campaign", variable=self.include_var,
+            command=self._on_include_toggled,
+        ).grid(row=0, column=1, sticky="w")
+
+        tk.Label(editor, text="To").grid(row=1, column=0, sticky="w", pady=3)
+        self.ent_to = tk.Entry(editor)
+        self.ent_to.grid(row=1, column=1, sticky="we", pady=3)
+
+        tk.Label(editor, text="Subject").grid(row=2, column=0, sticky="w", pady=3)
+        self.ent_subject = tk.Entry(editor)
+        self.ent_subject.grid(row=2, column=1, sticky="we", pady=3)
+
+        tk.Label(editor, text="Body").grid(row=3, column=0, sticky="nw", pady=3)
+        self.txt_body = tk.Text(editor, wrap="word")
+        self.txt_body.grid(row=3, column=1, sticky="nsew", pady=3)
+
+        # -----------------------------
+        # Bottom: attachments + send
+        # -----------------------------
+        btn_row = tk.Frame(main)
+        btn_row.grid(row=3, column=0, sticky="we", pady=(5, 0))
+
+        self.lbl_attachments = tk.Label(btn_row, text="No attachments")
+        self.lbl_attachments.pack(side="left", padx=(0, 10))
+        tk.Button(btn_row, text="Attach file(s)...", command=self._on_attach_files).pack(side="left")
+
+        self.btn_send = tk.Button(btn_row, text="Queue Included Emails", command=self._on_send_all)
+        self.btn_send.pack(side="right")
+
+        self.protocol("WM_DELETE_WINDOW", self._on_close)
+        self._goto_page(0)
+
+    # =========================================================
+    # Paging / editor
+    # =========================================================
+    def _page_count(self):
+        return max(1, (len(self.items) + PAGE_SIZE - 1) // PAGE_SIZE)
+
+    def _goto_page(self, page):
+        self._store_editor()
+        self.page = min(max(page, 0), self._page_count() - 1)
+        self._refresh_list()
+
+        first = self.page * PAGE_SIZE
+        if first < len(self.items):
+            self.listbox.selection_set(0)
+            self._show_item(first)
+
+    def _refresh_list(self):
+        selected = self.listbox.curselection()
+        self.listbox.delete(0, "end")
+
+        first = self.page * PAGE_SIZE
+        for item in self.items[first:first + PAGE_SIZE]:
+            mark = "✓" if item["include"] else " "
+            self.listbox.insert("end", f"[{mark}] {item['label']}  ({item['status']})")
+
+        if selected:
+            self.listbox.selection_set(selected[0])
+        self.lbl_page.config(text=f"Page {self.page + 1}/{self._page_count()}")
+
+    def _on_list_select(self, event=None):
+        selected = self.listbox.curselection()
+        if not selected:
+            return
+        self._store_editor()
+        self._show_item(self.page * PAGE_SIZE + selected[0])
+
+    def _show_item(self, i):
+        self.current = i
+        item = self.items[i]
+
+        self.include_var.set(item["include"])
+        self.ent_to.delete(0, "end")
+        self.ent_to.insert(0, item["to"])
+        self.ent_subject.delete(0, "end")
+        self.ent_subject.insert(0, item["subject"])
+        self.txt_body.delete("1.0", "end")
+        self.txt_body.insert("1.0", item["body"])
+
+    def _store_editor(self):
+        """Keep the user's edits of the item currently in the editor."""
+        if self.current is None:
+            return
+        item = self.items[self.current]
+        item["to"] = self.ent_to.get().strip()
+        item["subject"] = self.ent_subject.get().strip()
+        item["body"] = self.txt_body.get("1.0", "end").strip()
+
+    def _on_include_toggled(self):
+        if self.current is None:
+            return
+        self.items[self.current]["include"] = self.include_var.get()
+        self._refresh_list()
+
+    # =========================================================
+    # Generate (bounded parallelism, shared prefs)
+    # =========================================================
+    def _collect_prefs(self) -> Dict[str, Any]:
+        return {
+            "tone": self.ent_tone.get().strip(),
+            "skillsToEmphasise": self.ent_skills.get().strip(),
+            "notes": self.txt_notes.get("1.0", "end").strip(),
+        }
+
+    def _on_generate_all(self, refresh=False):
+        import email_service  # AI client loads on first use
+
+        self._store_editor()
+        prefs = self._collect_prefs()
+
+        todo = [i for i, item in enumerate(self.items) if item["include"]]
+        if not todo:
+            messagebox.showinfo("Campaign", "No hunts are included.", parent=self)
+            return
+
+        self.done_count = 0
+        self.progress.config(maximum=len(todo), value=0)
+        self.btn_generate.config(state="disabled")
+        self.btn_regenerate.config(state="disabled")
+        self.btn_cancel.config(state="normal")
+        self.btn_send.config(state="disabled")
+
+        self.runner = task_runner.TaskRunner(self, max_workers=CAMPAIGN_WORKERS)
+        self.pending = len(todo)
+        for i in todo:
+            item = self.items[i]
+            item["context"]["prefs"] = prefs
+            item["status"] = "Generating"
+            self.runner.submit(
+                ai_cache.cached_call,
+                "application_email",
+                email_service.generate_application_email,
+                dict(item["context"]),
+                refresh=refresh,
+                on_done=lambda result, i=i: self._on_generated(i, result),
+                on_error=lambda e, i=i: self._on_generate_error(i, e),
+                name=f"campaign_email[{i}]",
+            )
+
+        self._refresh_list()
+        self._update_status()
+
+    def _on_generated(self, i, email_json):
+        item = self.items[i]
+        email_json = email_json or {}
+        subject = (email_json.get("subject") or "").strip()
+        body = (email_json.get("body") or "").strip()
+        if subject:
+            item["subject"] = subject
+        if body:
+            item["body"] = body
+        item["status"] = "Ready"
+        self._finish_one(i)
+
+    def _on_generate_error(self, i, e):
+        self.items[i]["status"] = f"Error: {e}"
+        self._finish_one(i)
+
+    def _finish_one(self, i):
+        self.done_count += 1
+        self.progress.config(value=self.done_count)
+        self._update_status()
+        self._refresh_list()
+
+        if i == self.current:
+            self._show_item(i)
+
+        if self.done_count >= self.pending:
+            self._on_generate_finished()
+
+    def _on_generate_finished(self):
+        if self.runner is not None:
+            self.runner.shutdown()
+            self.runner = None
+        self.btn_generate.config(state="normal")
+        self.btn_regenerate.config(state="normal")
+        self.btn_cancel.config(state="disabled")
+        self.btn_send.config(state="normal")
+
+    def _on_cancel(self):
+        for item in self.items:
+            if item["status"] == "Generating":
+                item["status"] = "Not generated"
+        self._on_generate_finished()
+        self._refresh_list()
+        self.lbl_status.config(text=self.lbl_status.cget("text") + " (cancelled)")
+
+    def _update_status(self):
+        ready = sum(1 for item in self.items if item["status"] == "Ready")
+        self.lbl_status.config(text=f"{ready}/{len(self.items)} ready")
+
+    # =========================================================
+    # Attachments / send
+    # =========================================================
+    def _on_attach_files(self):
+        paths = filedialog.askopenfilenames(parent=self, title="Select attachment(s)")
+        if not paths:
+            return
+        for p in paths:
+            if p not in self.attachments:
+                self.attachments.append(p)
+        self.lbl_attachments.config(text=f"{len(self.attachments)} attachment(s)")
+
+    def _on_send_all(self):
+        self._store_editor()
+
+        to_send = [item for item in self.items if item["include"] and item["body"]]
+        missing = [item for item in to_send if not item["to"]]
+        if missing:
+            messagebox.showwarning(
+                "Missing recipient",
+                f"{len(missing)} included email(s) have no 'To' address:\n"
+                + "\n".join(item["label"] for item in missing[:10]),
+                parent=self,
+            )
+            return
+        if not to_send:
+            messagebox.showinfo("Campaign", "Nothing to send: generate or write emails first.", parent=self)
+            return
+
+        if not messagebox.askyesno(
+            "Campaign",
+            f"Queue {len(to_send)} email(s) for sending via Gmail?\n"
+            f"They go out at most {mail_queue.SEND_RATE_PER_MIN} per minute.",
+            parent=self,
+        ):
+            return
+
+        queue = mail_queue.get_queue(self, self.controller)
+        for item in to_send:
+            queue.enqueue(item["hunt_id"], item["to"], item["subject"], item["body"], self.attachments)
+            item["status"] = "Queued"
+            item["include"] = False
+
+        self._refresh_list()
+        messagebox.showinfo(
+            "Campaign",
+            f"{len(to_send)} email(s) queued.\nResults will appear in each hunt's progress log.",
+            parent=self,
+        )
+
+    def _on_close(self):
+        if self.runner is not None:
+            self.runner.shutdown()
+            self.runner = None
+        self.destroy()
@@ -0,0 +1,151 @@
+# DiagnosticsWindow.py
+import tkinter as tk
+from tkinter import messagebox
+
+import tksheet as tks
+
+import tracing
+
+REFRESH_MS = 1000
+RECENT_SPANS = 200
+
+
+class DiagnosticsWindow(tk.Toplevel):
+    """
+    Live view of tracing spans (hidden: Ctrl+Shift+D in the main window).
+
+    Top sheet: one row per span name (count, total/avg/max ms, errors, sizes,
+    estimated AI tokens).
+    Bottom sheet: the most recent spans, newest first.
+    """
+
+    def __init__(self, parent):
+        super().__init__(parent)
+
+        self.title("Diagnostics")
+        self.geometry("1000x650")
+        self.iconbitmap("icon.ico")
+
+        self._refresh_job = None
+        self.auto_var = tk.BooleanVar(value=True)
+
+        main = tk.Frame(self)
+        main.pack(fill="both", expand=True, padx=10, pady=10)
+        main.columnconfigure(0, weight=1)
+        main.rowconfigure(1, weight=1)
+        main.rowconfigure(3, weight=1)
+
+        # -----------------------------
+        # Aggregates
+        # -----------------------------
+        tk.Label(main, text="Spans by name", anchor="w").grid(row=0, column=0, sticky="w")
+
+        self.stats_sheet = tks.Sheet(
+            main,
+            data=[],
+            headers=[
+                "Name", "Count", "Total ms", "Avg ms", "Max ms", "Errors",
+                "In size", "Out size", "In tokens", "Out tokens",
+            ],
+        )
+        self.stats_sheet.grid(row=1, column=0, sticky="nsew", pady=(0, 10))
+        self.stats_sheet.enable_bindings(("arrowkeys", "copy", "column_width_resize", "single_select"))
+
+        # -----------------------------
+        # Recent spans
+        # -----------------------------
+        tk.Label(main, text=f"Recent spans (last {RECENT_SPANS})", anchor="w").grid(
+            row=2, column=0, sticky="w"
+        )
+
+        self.recent_sheet = tks.Sheet(
+            main,
+            data=[],
+            headers=["Name", "ms", "Thread", "Error", "Attributes"],
+        )
+        self.recent_sheet.grid(row=3, column=0, sticky="nsew")
+        self.recent_sheet.enable_bindings(("arrowkeys", "copy", "column_width_resize", "single_select"))
+
+        # -----------------------------
+        # Buttons
+        # -----------------------------
+        btn_row = tk.Frame(main)
+        btn_row.grid(row=4, column=0, sticky="we", pady=(10, 0))
+
+        tk.Checkbutton(btn_row, text="Auto refresh", variable=self.auto_var).pack(side="left")
+        tk.Button(btn_row, text="Close", command=self._on_close).pack(side="right")
+        tk.Button(btn_row, text="Dump JSON", command=self._on_dump).pack(side="right", padx=(0, 5))
+        tk.Button(btn_row, text="Clear", command=self._on_clear).pack(side="right", padx=(0, 5))
+        tk.Button(btn_row, text="Refresh", command=self.refresh).pack(side="right", padx=(0, 5))
+
+        self.protocol("WM_DELETE_WINDOW", self._on_close)
+        self.refresh()
+
+    # =========================================================
+    # Refresh
+    # =========================================================
+    def refresh(self):
+        snap = tracing.snapshot()
+
+        stats_rows = []
+        for name, stat in sorted(snap["stats"].items(), key=lambda kv: kv[1]["total_ms"], reverse=True):
+            stats_rows.append([
+                name,
+                stat["count"],
+                f"{stat['total_ms']:.1f}",
+                f"{stat['avg_ms']:.2f}",
+                f"{stat['max_ms']:.2f}",
+                stat["errors"],
+                stat["in_size"],
+                stat["out_size"],
+                stat["in_tokens"],
+                stat["out_tokens"],
+            ])
+        self.stats_sheet.set_sheet_data(stats_rows)
+
+        recent_rows = []
+        for record in reversed(snap["spans"][-RECENT_SPANS:]):
+            attrs = record.get("attrs", {})
+            recent_rows.append([
+                record["name"],
+                f"{record['ms']:.2f}",
+                record["thread"],
+                record.get("error", ""),
+                ", ".join(f"{k}={v}" for k, v in attrs.items()),
+            ])
+        self.recent_sheet.set_sheet_data(recent_rows)
+
+        self._schedule_refresh()
+
+    def _schedule_refresh(self):
+        if self._refresh_job is not None:
+            self.after_cancel(self._refresh_job)
+        self._refresh_job = self.after(REFRESH_MS, self._on_auto_refresh)
+
+    def _on_auto_refresh(self):
+        self._refresh_job = None
+        if self.auto_var.get():
+            self.refresh()
+        else:
+            self._schedule_refresh()
+
+    # =========================================================
+    # Buttons
+    # =========================================================
+    def _on_dump(self):
+        try:
+            path = tracing.dump()
+        except OSError as e:
+            messagebox.showerror("Diagnostics", f"Failed to write trace:\n{e}", parent=self)
+            return
+        messagebox.showinfo("Diagnostics", f"Trace written to:\n{path}", parent=self)
+
+    def _on_clear(self):
+        tracing.clear()
+        self.refresh()
+
+    def _on_close(self):
+        if self._refresh_job is not None:
+            self.after_cancel(self._refresh_job)
+            self._refresh_job = None
+        self.destroy()
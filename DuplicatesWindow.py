@@ -0,0 +1,233 @@
+# DuplicatesWindow.py
+import tkinter as tk
+from tkinter import messagebox
+
+import tksheet as tks
+
+import model as m
+import repository
+import task_runner
+import dedupe
+
+# Matches listed in the "possible duplicate" warning
+MAX_WARNED = 5
+
+COL_ACTION = 1
+
+
+def _hunt_label(controller, hunt_id):
+    try:
+        return controller._build_hunt_label(hunt_id)
+    except Exception:
+        return hunt_id
+
+
+def confirm_not_duplicate(parent, controller, data) -> bool:
+    """
+    Called before creating a hunt from a NewHuntWindow-shaped data dict.
+    Returns True to go ahead: no near-duplicate exists, the index is still
+    being built, or the user chose to create it anyway.
+    """
+    repo = repository.for_controller(controller)
+
+    # Hunts were replaced wholesale: fingerprint them in the background (as
+    # MainWindow.apply_search does for search) instead of on the Tk thread,
+    # and skip the warning until the index is ready
+    if repo.duplicates.needs_rebuild and not repo.duplicates.building:
+        repo.duplicates.rebuild_async(task_runner.get_runner(parent))
+    if repo.duplicates.building:
+        return True
+
+    company_id = ""
+    if data.get("companyMode") == "existing":
+        company = repo.find_company_by_name(data.get("companyName", ""))
+        if company is not None:
+            company_id = company[m.COMPANY_FIELDS.index("id")]
+
+    matches = repo.duplicates.check(
+        data.get("jobTitle", ""),
+        data.get("jobDescription", ""),
+        company_id,
+    )
+    if not matches:
+        return True
+
+    lines = [
+        f"  • {_hunt_label(controller, hunt_id)}  ({similarity:.0%} similar)"
+        for hunt_id, similarity in matches[:MAX_WARNED]
+    ]
+    if len(matches) > MAX_WARNED:
+        lines.append(f"  … and {len(matches) - MAX_WARNED} more")
+
+    return messagebox.askyesno(
+        "Possible Duplicate",
+        "This job ad looks like one you already have:\n\n"
+        + "\n".join(lines)
+        + "\n\nCreate it anyway?",
+        icon="warning",
+        parent=parent,
+    )
+
+
+class DuplicatesWindow(tk.Toplevel):
+    """
+    Review and merge groups of near-duplicate hunts.
+
+    Each group keeps one hunt (the oldest, unless another row is picked
+    with "Keep Selected"); merging moves the others' reminders and progress
+    onto it, fills its empty fields from them and deletes them.
+
+    Sheet columns:
+      0: Group       1: Action       2: Hunt       3: Reminders       4: Progress
+    """
+
+    def __init__(self, parent, controller):
+        super().__init__(parent)
+        self.controller = controller
+
+        self.groups = []      # [[hunt_id, ...], ...]
+        self.keep = []        # kept hunt_id per group
+        self.row_group = []   # sheet row -> group number
+        self.row_hunt = []    # sheet row -> hunt_id
+
+        self.title("Duplicate Hunts")
+        self.geometry("1000x600")
+        self.iconbitmap("icon.ico")
+
+        main = tk.Frame(self)
+        main.pack(fill="both", expand=True, padx=10, pady=10)
+        main.columnconfigure(0, weight=1)
+        main.rowconfigure(1, weight=1)
+
+        self.lbl_status = tk.Label(main, text="", anchor="w")
+        self.lbl_status.grid(row=0, column=0, sticky="we", pady=(0, 5))
+
+        self.sheet = tks.Sheet(
+            main,
+            data=[],
+            headers=["Group", "Action", "Hunt", "Reminders", "Progress"],
+        )
+        self.sheet.grid(row=1, column=0, sticky="nsew")
+        self.sheet.enable_bindings((
+            "arrowkeys",
+            "copy",
+            "column_width_resize",
+            "row_select",
+            "single_select",
+        ))
+
+        # -----------------------------
+        # Buttons
+        # -----------------------------
+        btn_row = tk.Frame(main)
+        btn_row.grid(row=2, column=0, sticky="we", pady=(5, 0))
+
+        tk.Button(btn_row, text="Keep Selected", command=self._on_keep_selected).pack(side="left")
+        tk.Button(btn_row, text="Refresh", command=self.refresh).pack(side="left", padx=(5, 0))
+
+        tk.Button(btn_row, text="Close", command=self.destroy).pack(side="right")
+        tk.Button(btn_row, text="Merge All Groups", command=self._on_merge_all).pack(
+            side="right", padx=(0, 5)
+        )
+        tk.Button(btn_row, text="Merge Selected Groups", command=self._on_merge_selected).pack(
+            side="right", padx=(0, 5)
+        )
+
+        self.refresh()
+
+    # =========================================================
+    # Listing
+    # =========================================================
+    def refresh(self):
+        repo = repository.for_controller(self.controller)
+        self.groups = repo.duplicates.duplicate_groups()
+        self.keep = [group[0] for group in self.groups]
+        self._fill_sheet()
+
+        hunts = sum(len(group) for group in self.groups)
+        if self.groups:
+            self.lbl_status.config(
+                text=f"{len(self.groups)} group(s) of near-duplicate hunts ({hunts} hunts)."
+            )
+        else:
+            self.lbl_status.config(text="No duplicate hunts found.")
+
+    def _fill_sheet(self):
+        repo = repository.for_controller(self.controller)
+        rows = []
+        self.row_group = []
+        self.row_hunt = []
+
+        for g, group in enumerate(self.groups):
+            for hunt_id in group:
+                rows.append([
+                    str(g + 1),
+                    self._action(g, hunt_id),
+                    _hunt_label(self.controller, hunt_id),
+                    str(len(repo.reminders_for_hunt(hunt_id))),
+                    str(len(repo.progress_for_hunt(hunt_id))),
+                ])
+                self.row_group.append(g)
+                self.row_hunt.append(hunt_id)
+
+        self.sheet.set_sheet_data(rows)
+
+    def _action(self, g, hunt_id):
+        return "Keep" if self.keep[g] == hunt_id else "Merge"
+
+    def _selected_rows(self):
+        rows = set()
+        for d in self.sheet.get_selected_rows(get_cells_as_rows=True):
+            r = self.sheet.displayed_row_to_data(d)
+            if 0 <= r < len(self.row_hunt):
+                rows.add(r)
+        return sorted(rows)
+
+    def _on_keep_selected(self):
+        for r in self._selected_rows():
+            g = self.row_group[r]
+            self.keep[g] = self.row_hunt[r]
+
+        for r, hunt_id in enumerate(self.row_hunt):
+            g = self.row_group[r]
+            self.sheet.set_cell_data(r, COL_ACTION, self._action(g, hunt_id), redraw=False)
+        self.sheet.redraw()
+
+    # =========================================================
+    # Merging
+    # =========================================================
+    def _on_merge_selected(self):
+        groups = sorted({self.row_group[r] for r in self._selected_rows()})
+        if not groups:
+            messagebox.showinfo("Merge", "Select a row of each group to merge.", parent=self)
+            return
+        self._merge(groups)
+
+    def _on_merge_all(self):
+        self._merge(range(len(self.groups)))
+
+    def _merge(self, group_numbers):
+        group_numbers = list(group_numbers)
+        if not group_numbers:
+            return
+
+        removing = sum(len(self.groups[g]) - 1 for g in group_numbers)
+        if not messagebox.askyesno(
+            "Merge",
+            f"Merge {len(group_numbers)} group(s)? {removing} hunt(s) will be deleted; "
+            "their reminders and progress move to the kept hunt.\n\n"
+            "(Changes are written on Save.)",
+            parent=self,
+        ):
+            return
+
+        repo = repository.for_controller(self.controller)
+        removed = 0
+        for g in group_numbers:
+            removed += dedupe.merge_hunts(repo, self.keep[g], self.groups[g])
+
+        # Single refresh of the main Hunt sheet
+        self.controller.view.reload_hunt_table()
+
+        self.refresh()
+        self.lbl_status.config(text=f"Merged: {removed} hunt(s) removed. " + self.lbl_status.cget("text"))
@@ -5,9 +5,48 @@ from typing import Dict, Any
 from urllib.parse import quote
 from pathlib import Path
 
-import email_service
+import ai_stream
+import mail_queue
+import profile_digest
 
 
+def default_subject(context: Dict[str, Any]) -> str:
+    """Best-effort subject from job title + company."""
+    hunt    = context.get("hunt", {}) or {}
+    company = context.get("company", {}) or {}
+
+    job_title = (hunt.get("jobTitle") or "").strip()
+    company_name = (company.get("name") or "").strip()
+
+    if job_title and company_name:
+        return f"Application for {job_title} at {company_name}"
+    elif job_title:
+        return f"Application for {job_title}"
+    return "Job Application"
+
+
+def company_recipient(context: Dict[str, Any]) -> str:
+    """Company email if available; otherwise ""."""
+    company = context.get("company", {}) or {}
+
+    candidates = [
+        company.get("email", ""),
+        company.get("companyEmail", ""),
+        company.get("hrEmail", ""),
+    ]
+
+    for cand in candidates:
+        cand = (cand or "").strip()
+        if cand:
+            return cand
+    return ""
+
+
+def default_recipient(context: Dict[str, Any]) -> str:
+    """Company email if available; otherwise the personal email."""
+    personal = context.get("personal", {}) or {}
+    return company_recipient(context) or (personal.get("email", "") or "").strip()
+
 
 class EmailWindow(tk.Toplevel):
     def __init__(self, parent, controller, hunt_id: str, context: Dict[str, Any]):
@@ -21,6 +60,11 @@ class EmailWindow(tk.Toplevel):
         # Keep track of attachments (list of file paths)
         self.attachments = []
 
+        # Running AI generation (ai_stream task), if any
+        self.generate_task = None
+        # Whether that generation has replaced the previous body yet
+        self.body_started = False
+
 
         self.title("Compose Application Email")
         self.geometry("900x700")
@@ -129,6 +173,14 @@ class EmailWindow(tk.Toplevel):
         )
         self.btn_generate.pack(side="right", padx=(5, 0))
 
+        # Same inputs as last time are answered from ai_cache; this asks anew
+        self.btn_regenerate = tk.Button(
+            btn_row,
+            text="Regenerate",
+            command=lambda: self._on_generate_clicked(refresh=True),
+        )
+        self.btn_regenerate.pack(side="right", padx=(5, 0))
+
         self.btn_send_direct = tk.Button(
             btn_row,
             text="Send (direct via Gmail)",
@@ -151,8 +203,8 @@ class EmailWindow(tk.Toplevel):
         self.btn_copy.pack(side="right")
 
 
-        # X button just closes
-        self.protocol("WM_DELETE_WINDOW", self.destroy)
+        # X button closes (and stops a running generation)
+        self.protocol("WM_DELETE_WINDOW", self._on_close)
 
         # Fill context + default subject
         self._populate_summary()
@@ -206,19 +258,8 @@ class EmailWindow(tk.Toplevel):
 
     def _prefill_subject(self):
         """Best-effort default subject from job title + company."""
-        hunt    = self.context.get("hunt", {}) or {}
-        company = self.context.get("company", {}) or {}
-
-        job_title = (hunt.get("jobTitle") or "").strip()
-        company_name = (company.get("name") or "").strip()
-
         if not self.ent_subject.get().strip():
-            if job_title and company_name:
-                self.ent_subject.insert(0, f"Application for {job_title} at {company_name}")
-            elif job_title:
-                self.ent_subject.insert(0, f"Application for {job_title}")
-            else:
-                self.ent_subject.insert(0, "Job Application")
+            self.ent_subject.insert(0, default_subject(self.context))
 
     # =========================================================
     # Helpers
@@ -238,68 +279,104 @@ class EmailWindow(tk.Toplevel):
         if self.ent_to.get().strip():
             return  # user already typed something
 
-        company = self.context.get("company", {}) or {}
-        personal = self.context.get("personal", {}) or {}
-
-        candidates = [
-            company.get("email", ""),
-            company.get("companyEmail", ""),
-            company.get("hrEmail", ""),
-            personal.get("email", ""),
-        ]
-
-        for cand in candidates:
-            cand = (cand or "").strip()
-            if cand:
-                self.ent_to.insert(0, cand)
-                break
+        recipient = default_recipient(self.context)
+        if recipient:
+            self.ent_to.insert(0, recipient)
 
     # =========================================================
     # Button handlers
     # =========================================================
-    def _on_generate_clicked(self):
-        """Call AI to generate subject + body into the lower fields."""
-        self.btn_generate.config(state="disabled")
-        self.config(cursor="watch")
-        self.update_idletasks()
+    def _on_generate_clicked(self, refresh=False):
+        """
+        Generate subject + body with AI. The body streams into txt_body as
+        it is written; the button turns into Cancel while generating.
+        A context seen before is answered from ai_cache unless refresh=True
+        (Regenerate).
+        """
+        if self.generate_task is not None:
+            return
+
+        prefs = self._collect_prefs()
+        context = {
+            "personal": profile_digest.personal_for_prompt(),
+            "hunt": self.context.get("hunt", {}),
+            "company": self.context.get("company", {}),
+            "prefs": prefs,
+        }
 
         try:
-            prefs = self._collect_prefs()
-            context = {
-                "personal": self.context.get("personal", {}),
-                "hunt": self.context.get("hunt", {}),
-                "company": self.context.get("company", {}),
-                "prefs": prefs,
-            }
+            import email_service  # Gmail/AI clients load on first use
+        except Exception as e:
+            messagebox.showerror("Email Error", f"Failed to generate email:\n{e}", parent=self)
+            return
 
-            email_json = email_service.generate_application_email(context)
+        # The previous body stays until the first text arrives
+        self.body_started = False
+        self.btn_generate.config(text="Cancel", command=self._on_cancel_generate)
+        self.btn_regenerate.config(state="disabled")
+
+        self.generate_task = ai_stream.start(
+            self,
+            "application_email",
+            context,
+            stream_fn=getattr(email_service, "stream_application_email", None),
+            fallback_fn=email_service.generate_application_email,
+            assemble=ai_stream.assemble_email,
+            to_text=ai_stream.email_text,
+            on_text=self._on_generate_text,
+            on_done=self._on_generate_done,
+            on_error=self._on_generate_error,
+            refresh=refresh,
+        )
 
-            subject = email_json.get("subject", "").strip()
-            body = email_json.get("body", "").strip()
+    def _on_generate_text(self, chunk):
+        if not self.body_started:
+            self.body_started = True
+            self.txt_body.delete("1.0", "end")
+        self.txt_body.insert("end", chunk)
+        self.txt_body.see("end")
 
-            if subject:
-                self.ent_subject.delete(0, "end")
-                self.ent_subject.insert(0, subject)
+    def _on_generate_done(self, email_json):
+        self._end_generate()
 
-            if body:
-                self.txt_body.delete("1.0", "end")
-                self.txt_body.insert("1.0", body)
+        email_json = email_json or {}
+        subject = email_json.get("subject", "").strip()
+        body = email_json.get("body", "").strip()
 
-            # After generating text, auto-fill To from company/personal
-            self._auto_fill_to_from_context()
+        if subject:
+            self.ent_subject.delete(0, "end")
+            self.ent_subject.insert(0, subject)
 
-        except Exception as e:
-            self.config(cursor="")
-            self.btn_generate.config(state="normal")
-            messagebox.showerror(
-                "Email Error",
-                f"Failed to generate email:\n{e}",
-                parent=self,
-            )
-            return
+        if body and body != self.txt_body.get("1.0", "end").strip():
+            self.txt_body.delete("1.0", "end")
+            self.txt_body.insert("1.0", body)
 
-        self.config(cursor="")
-        self.btn_generate.config(state="normal")
+        # After generating text, auto-fill To from company/personal
+        self._auto_fill_to_from_context()
+
+    def _on_generate_error(self, e):
+        self._end_generate()
+        messagebox.showerror(
+            "Email Error",
+            f"Failed to generate email:\n{e}",
+            parent=self,
+        )
+
+    def _on_cancel_generate(self):
+        """Stop generating; text received so far stays in the body."""
+        if self.generate_task is not None:
+            self.generate_task.cancel()
+        self._end_generate()
+
+    def _end_generate(self):
+        self.generate_task = None
+        self.btn_generate.config(text="Generate Email", command=self._on_generate_clicked)
+        self.btn_regenerate.config(state="normal")
+
+    def _on_close(self):
+        if self.generate_task is not None:
+            self.generate_task.cancel()
+        self.destroy()
 
     def _on_send_clicked(self):
         """
@@ -344,6 +421,8 @@ class EmailWindow(tk.Toplevel):
     def _on_send_direct_clicked(self):
         """
         Send email directly via Gmail API (no manual mail client).
+        The message goes into the outbox (mail_queue) and is sent in the
+        background with retries; the result lands in the hunt's progress log.
         First time: browser opens for login + consent.
         Later: uses stored token silently.
         """
@@ -367,36 +446,27 @@ class EmailWindow(tk.Toplevel):
             ):
                 return
 
-        self.btn_send_direct.config(state="disabled")
-        self.config(cursor="watch")
-        self.update_idletasks()
-
         try:
-            # Now send with attachments (if any)
-            msg_info = email_service.send_direct_email(
-                to=to,
-                subject=subject,
-                body=body,
-                attachments=self.attachments,
+            # Now queue with attachments (if any)
+            mail_queue.get_queue(self, self.controller).enqueue(
+                self.hunt_id,
+                to,
+                subject,
+                body,
+                self.attachments,
             )
-        except Exception as e:
-            self.config(cursor="")
-            self.btn_send_direct.config(state="normal")
+        except OSError as e:
             messagebox.showerror(
                 "Send Email",
-                f"Failed to send via Gmail:\n{e}",
+                f"Failed to queue the email:\n{e}",
                 parent=self,
             )
             return
 
-        self.config(cursor="")
-        self.btn_send_direct.config(state="normal")
-
-        # msg_info is the dict returned by Gmail API; typically has 'id'
-        msg_id = msg_info.get("id", "(unknown)")
         messagebox.showinfo(
             "Send Email",
-            f"Email sent via Gmail API.\nMessage ID: {msg_id}",
+            "Email queued for sending via Gmail API.\n"
+            "The result will appear in this hunt's progress log.",
             parent=self,
         )
 
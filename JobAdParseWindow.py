@@ -2,7 +2,22 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
 
-from ai_service import parse_job_ad
+import model as m
+import repository
+import task_runner
+import ai_cache
+from DuplicatesWindow import confirm_not_duplicate
+
+
+def parse_ad(raw: str):
+    """
+    Parse on the worker thread. The AI client is imported here, so an
+    import failure reaches on_error (and clears the busy state) like any
+    other parse error.
+    """
+    from ai_service import parse_job_ad  # AI client loads on first use
+
+    return ai_cache.cached_call("parse_job_ad", parse_job_ad, raw)
 
 
 class JobAdParseWindow(tk.Toplevel):
@@ -10,6 +25,7 @@ class JobAdParseWindow(tk.Toplevel):
         super().__init__(parent)
         self.controller = controller
         self.parsed_data = None  # will hold {"hunt": {...}, "company": {...}}
+        self.parse_task = None   # running task_runner.TaskHandle, if any
 
         self.title("Parse Job Ad with AI")
         self.geometry("1000x700")
@@ -34,13 +50,30 @@ class JobAdParseWindow(tk.Toplevel):
         self.txt_ad = tk.Text(top_frame, wrap="word", height=12)
         self.txt_ad.pack(fill="both", expand=True, padx=5, pady=5)
 
-        # Parse button
-        btn_parse = tk.Button(
-            top_frame,
+        # Parse row: progress + status on the left, buttons on the right
+        parse_row = tk.Frame(top_frame)
+        parse_row.pack(fill="x", padx=5, pady=(0, 5))
+
+        self.btn_parse = tk.Button(
+            parse_row,
             text="Parse with AI",
             command=self._on_parse_clicked,
         )
-        btn_parse.pack(anchor="e", padx=5, pady=(0, 5))
+        self.btn_parse.pack(side="right")
+
+        self.btn_cancel_parse = tk.Button(
+            parse_row,
+            text="Cancel",
+            command=self._on_cancel_parse,
+            state="disabled",
+        )
+        self.btn_cancel_parse.pack(side="right", padx=(0, 5))
+
+        self.progress = ttk.Progressbar(parse_row, mode="indeterminate", length=160)
+        self.progress.pack(side="left")
+
+        self.lbl_status = tk.Label(parse_row, text="", anchor="w")
+        self.lbl_status.pack(side="left", padx=(10, 0))
 
         # -----------------------------
         # Bottom: Parsed preview
@@ -78,10 +111,14 @@ class JobAdParseWindow(tk.Toplevel):
         )
         self.btn_create.pack(side="right")
 
-        self.protocol("WM_DELETE_WINDOW", self.destroy)
+        self.protocol("WM_DELETE_WINDOW", self._on_close)
+
+    def _on_close(self):
+        self._on_cancel_parse()
+        self.destroy()
 
     # =========================================================
-    # Parse button
+    # Parse button (runs off the Tk thread)
     # =========================================================
     def _on_parse_clicked(self):
         raw = self.txt_ad.get("1.0", "end").strip()
@@ -89,24 +126,48 @@ class JobAdParseWindow(tk.Toplevel):
             messagebox.showerror("No text", "Please paste a job advertisement first.", parent=self)
             return
 
-        # Simple "busy" cursor while waiting
-        self.config(cursor="watch")
-        self.update_idletasks()
+        self._set_busy(True, "Parsing with AI...")
 
-        try:
-            parsed = parse_job_ad(raw)
-        except Exception as e:
-            self.config(cursor="")
-            messagebox.showerror("AI Error", f"Failed to parse job ad:\n{e}", parent=self)
-            return
+        self.parse_task = task_runner.get_runner(self).submit(
+            parse_ad,
+            raw,
+            on_done=self._on_parse_done,
+            on_error=self._on_parse_error,
+            name="parse_job_ad",
+        )
 
-        self.config(cursor="")
+    def _on_cancel_parse(self):
+        if self.parse_task is not None:
+            self.parse_task.cancel()
+            self.parse_task = None
+            if self.winfo_exists():
+                self._set_busy(False, "Cancelled.")
+
+    def _on_parse_done(self, parsed):
+        self.parse_task = None
+        self._set_busy(False, "")
 
         # Store and show
         self.parsed_data = parsed
         self._update_preview_widgets()
         self.btn_create.config(state="normal")
 
+    def _on_parse_error(self, e):
+        self.parse_task = None
+        self._set_busy(False, "")
+        messagebox.showerror("AI Error", f"Failed to parse job ad:\n{e}", parent=self)
+
+    def _set_busy(self, busy: bool, status: str):
+        self.lbl_status.config(text=status)
+        if busy:
+            self.btn_parse.config(state="disabled")
+            self.btn_cancel_parse.config(state="normal")
+            self.progress.start(15)
+        else:
+            self.progress.stop()
+            self.btn_parse.config(state="normal")
+            self.btn_cancel_parse.config(state="disabled")
+
     # =========================================================
     # Preview helpers
     # =========================================================
@@ -196,12 +257,19 @@ class JobAdParseWindow(tk.Toplevel):
         # Decide whether to treat company as existing or new
         company_mode = "new"
         if cname:
-            existing = self.controller.find_company_by_name(cname)
+            repo = repository.for_controller(self.controller)
+            existing = repo.resolve_company(cname)
             if existing is not None:
                 company_mode = "existing"
+                # Use the stored spelling so the controller links the same row
+                data["companyName"] = existing[m.COMPANY_FIELDS.index("name")]
 
         data["companyMode"] = company_mode
 
+        # Same ad already tracked? (user may still go ahead)
+        if not confirm_not_duplicate(self, self.controller, data):
+            return
+
         # Delegate to controller – this already updates hunt_rows,
         # company_rows, and refreshes the main Hunt sheet.
         self.controller.create_new_hunt(data)
@@ -1,11 +1,44 @@
 # MainWindow.py
+import contextlib
+import functools
 import tkinter as tk
-from tkinter import ttk
+from tkinter import ttk, messagebox
 import tksheet as tks
 
 import model as m
-import SingleCompanyWindow as scw
-import debug
+import repository
+import hunt_display as hd
+import mail_queue
+import reminder_scheduler
+import salary_columns
+import search_index
+import task_runner
+import tracing
+
+# Rows above/below the visible window whose derived columns are prefetched
+PREFETCH_ROWS = 50
+
+# Typing pause before the hunt search filter is applied
+SEARCH_DELAY_MS = 150
+
+# Salary filter choices: sheet header -> hunt field
+SALARY_FILTER_FIELDS = {
+    hd.HUNT_HEADERS[m.HUNT_FIELDS.index(field) + hd.MODEL_OFFSET]: field
+    for field in salary_columns.NUMERIC_FIELDS
+}
+
+# Controller methods that change reminder/progress rows for a hunt (first
+# argument is the huntId, None meaning "all hunts")
+CONTROLLER_EVENT_WRITERS = [
+    "add_reminder_for_hunt",
+    "add_progress_for_hunt",
+    "update_reminders_from_display",
+    "replace_progress_for_hunt_from_display",
+]
+
+
+def _format_number(value) -> str:
+    return f"{value:,.0f}" if abs(value) >= 100 else f"{value:g}"
 
 
 class MainWindow:
@@ -13,6 +46,27 @@ class MainWindow:
         self.root = root
         self.controller = controller
 
+        # Time controller entry points (before the ribbon binds them)
+        tracing.instrument(controller, tracing.CONTROLLER_ENTRY_POINTS, prefix="controller")
+
+        # Refresh per-hunt summaries + that hunt's sheet row after event writes
+        self._hook_event_writers()
+
+        # Hunt row indices whose derived columns need recomputing
+        self._dirty_rows = set()
+        self._flush_job = None
+
+        # Hunt row indices whose derived columns are filled in on the sheet
+        self._materialized = set()
+        self._materialize_job = None
+
+        # Pending search filter (debounced while typing)
+        self._search_job = None
+
+        # Nesting depth of hold_refresh() and whether a reload was skipped
+        self._refresh_holds = 0
+        self._refresh_pending = False
+
         # Window display settings
         root.title("JobHound - Job Application Tracking Tool")
         root.geometry("1920x1080")
@@ -41,35 +95,22 @@ class MainWindow:
         create_ribbon_button("Save",             "💾", self.controller.on_save_clicked)
         create_ribbon_button("New Hunt",         "➕", self.controller.on_new_hunt_clicked)
         create_ribbon_button("AI Job Parse",     "✨", self.controller.ai_jobParse)
+        create_ribbon_button("Batch Parse",      "📚", self._on_batch_parse_clicked)
+        create_ribbon_button("Campaign",         "📨", self._on_campaign_clicked)
+        create_ribbon_button("Batch Resumes",    "📄", self._on_batch_resume_clicked)
+        create_ribbon_button("Duplicates",       "🔁", self._on_duplicates_clicked)
+        create_ribbon_button("Salary Stats",     "📊", self._on_salary_analytics_clicked)
         create_ribbon_button("Companies",        "🏢", self.controller.on_companies_clicked)
         create_ribbon_button("Reminders",        "⏰", self.controller.on_reminder_clicked)
         create_ribbon_button("Personal Details", "👨‍💼", self.controller.on_personal_details)
 
         # Headers for main Hunt sheet
-        self.HUNT_HEADERS = [
-            "Reminder",
-            "Progress",
-            "id",
-            "Job Title",
-            "Job Description",
-            "Job Source",
-            "Salary BaseMin",
-            "Salary BaseMax",
-            "Salary IndustryAvg",
-            "Salary Expecting",
-            "Currency",
-            "Ot Rate Ratio",
-            "Work Arrangement",
-            "Has Health Insurance",
-            "companyId",
-            "Company Name",
-            "Resume",
-            "Email",
-            "Map",
-        ]
-
-        # Build display rows for the main Hunt sheet
-        hunt_display_rows = self.controller.finalize_hunt_display_columns()
+        self.HUNT_HEADERS = hd.HUNT_HEADERS
+
+        # Build display rows for the main Hunt sheet. Derived columns are
+        # left empty and filled in only for rows that scroll into view.
+        repo = repository.for_controller(self.controller)
+        hunt_display_rows = hd.build_hunt_display_rows(repo, derived=False)
 
         # Create the sheet widget
         self.sheet = tks.Sheet(
@@ -84,6 +125,47 @@ class MainWindow:
             readonly=True
         )
 
+        # Full text of the selected long-text cell (the sheet shows a preview)
+        detail_frame = tk.Frame(root)
+        detail_frame.pack(side="bottom", fill="x")
+
+        self.txt_detail = tk.Text(detail_frame, height=5, wrap="word", state="disabled")
+        self.txt_detail.pack(fill="x", padx=5, pady=(0, 5))
+
+        # Full-text search over hunts (filters the sheet's displayed rows)
+        search_frame = tk.Frame(root)
+        search_frame.pack(fill="x", padx=5, pady=(5, 0))
+
+        tk.Label(search_frame, text="Search").pack(side="left")
+        self.search_var = tk.StringVar()
+        self.search_var.trace_add("write", lambda *_: self._on_search_changed())
+        ent_search = tk.Entry(search_frame, textvariable=self.search_var, width=50)
+        ent_search.pack(side="left", padx=5)
+        ent_search.bind("<Escape>", lambda e: self.search_var.set(""))
+        tk.Button(search_frame, text="Clear", command=lambda: self.search_var.set("")).pack(side="left")
+
+        # Salary range filter (numbers come from the parsed column cache)
+        tk.Label(search_frame, text="Salary").pack(side="left", padx=(20, 5))
+        self.cb_salary_field = ttk.Combobox(
+            search_frame,
+            width=18,
+            values=list(SALARY_FILTER_FIELDS),
+            state="readonly",
+        )
+        self.cb_salary_field.set(hd.HUNT_HEADERS[m.HUNT_FIELDS.index("salaryExpecting") + hd.MODEL_OFFSET])
+        self.cb_salary_field.pack(side="left")
+        self.cb_salary_field.bind("<<ComboboxSelected>>", lambda e: self._on_search_changed())
+
+        self.salary_min_var = tk.StringVar()
+        self.salary_max_var = tk.StringVar()
+        for label, var in (("Min", self.salary_min_var), ("Max", self.salary_max_var)):
+            tk.Label(search_frame, text=label).pack(side="left", padx=(5, 2))
+            var.trace_add("write", lambda *_: self._on_search_changed())
+            tk.Entry(search_frame, textvariable=var, width=10).pack(side="left")
+
+        self.lbl_search = tk.Label(search_frame, text="", anchor="w")
+        self.lbl_search.pack(side="left", padx=10)
+
         self.sheet.pack(expand=True, fill="both")
 
         # Enable basic interactions
@@ -112,14 +194,320 @@ class MainWindow:
         ))
 
         # Bindings
-        self.sheet.extra_bindings("cell_select",   func=self._on_cell_select)
-        self.sheet.extra_bindings("end_edit_cell", func=self._on_end_edit_cell)
-        self.sheet.extra_bindings("rc_delete_row", func=self._on_rc_delete_row)
+        self.sheet.extra_bindings("cell_select",     func=self._on_cell_select)
+        self.sheet.extra_bindings("begin_edit_cell", func=self._on_begin_edit_cell)
+        self.sheet.extra_bindings("end_edit_cell",   func=self._on_end_edit_cell)
+        self.sheet.extra_bindings("rc_delete_row",   func=self._on_rc_delete_row)
+        self.sheet.bind("<<SheetRedrawn>>", self._on_sheet_redrawn)
+
+        # Hidden diagnostics window
+        root.bind_all("<Control-Shift-D>", self._on_diagnostics)
+
+        # Pop up Pending reminders when they come due
+        self.reminder_scheduler = reminder_scheduler.ReminderScheduler(root, controller)
+        self.reminder_scheduler.start()
+
+        # Resume any mail still in the outbox from a previous session
+        mail_queue.get_queue(root, controller)
+
+        # Build the search index off the Tk thread; kept current via table listeners
+        self.search_index = search_index.SearchIndex(repo)
+        self._rebuild_search_index()
+
+        # Near-duplicate fingerprints for the create-time warning
+        repo.duplicates.rebuild_async(task_runner.get_runner(root))
 
     # ------------------------------------------------------------------
-    def update_hunt_table(self, rows):
-        """Refresh the main sheet."""
-        self.sheet.set_sheet_data(rows)
+    def _hook_event_writers(self):
+        for name in CONTROLLER_EVENT_WRITERS:
+            method = getattr(self.controller, name, None)
+            if method is None or getattr(method, "__event_hook__", False):
+                continue
+            setattr(self.controller, name, self._wrap_event_writer(method))
+
+    def _wrap_event_writer(self, method):
+        @functools.wraps(method)
+        def wrapper(*args, **kwargs):
+            hunt_id = args[0] if args else kwargs.get("hunt_id")
+            try:
+                return method(*args, **kwargs)
+            finally:
+                self.on_events_changed(hunt_id)
+
+        wrapper.__event_hook__ = True
+        return wrapper
+
+    def on_events_changed(self, hunt_id=None):
+        """
+        Reminder/progress rows of hunt_id (None: any hunt) changed, possibly
+        edited in place: re-index them, drop the cached summaries and queue
+        the sheet rows.
+        """
+        # Binding picks up replaced / re-keyed rows; edits to other fields
+        # (e.g. status) only reach the table listeners through touch()
+        repo = repository.for_controller(self.controller)
+        for table in (repo.reminders, repo.progress):
+            if hunt_id is None:
+                table.reindex()
+            else:
+                for row in table.find("huntId", hunt_id):
+                    table.touch(row)
+        repo.aggregates.invalidate(hunt_id)
+        self.reminder_scheduler.refresh_hunt(hunt_id)
+        self.search_index.invalidate(hunt_id)
+
+        if hunt_id is None:
+            self.mark_rows_dirty(range(len(repo.hunts.rows)))
+        else:
+            r = repo.hunt_index(hunt_id)
+            if r is not None:
+                self.mark_rows_dirty([r])
+
+    # ------------------------------------------------------------------
+    def _on_diagnostics(self, event=None):
+        import DiagnosticsWindow as dw  # loaded on first use
+
+        dw.DiagnosticsWindow(self.root)
+
+    # ------------------------------------------------------------------
+    def _on_batch_parse_clicked(self):
+        import BatchJobAdParseWindow as bjw  # loaded on first use
+
+        bjw.BatchJobAdParseWindow(self.root, self.controller)
+
+    def _on_duplicates_clicked(self):
+        import DuplicatesWindow as dw  # loaded on first use
+
+        dw.DuplicatesWindow(self.root, self.controller)
+
+    def _on_salary_analytics_clicked(self):
+        import SalaryAnalyticsWindow as saw  # loaded on first use
+
+        saw.SalaryAnalyticsWindow(self.root, self.controller)
+
+    def selected_hunt_ids(self):
+        """Hunt ids of the selected main-sheet rows, in hunt_rows order."""
+        repo = repository.for_controller(self.controller)
+        hunt_rows = repo.hunts.rows
+        id_idx = m.HUNT_FIELDS.index("id")
+
+        rows = sorted({
+            self.sheet.displayed_row_to_data(d)
+            for d in self.sheet.get_selected_rows(get_cells_as_rows=True)
+        })
+        return [hunt_rows[r][id_idx] for r in rows if r < len(hunt_rows)]
+
+    def _selected_hunt_ids_or_warn(self, title):
+        hunt_ids = self.selected_hunt_ids()
+        if not hunt_ids:
+            messagebox.showinfo(
+                title,
+                "Select one or more hunts in the table first.",
+                parent=self.root,
+            )
+        return hunt_ids
+
+    def _on_campaign_clicked(self):
+        """Open a mail-merge campaign over the selected hunt rows."""
+        hunt_ids = self._selected_hunt_ids_or_warn("Campaign")
+        if not hunt_ids:
+            return
+
+        import CampaignWindow as cw  # loaded on first use
+
+        cw.CampaignWindow(self.root, self.controller, hunt_ids)
+
+    def _on_batch_resume_clicked(self):
+        """Generate resumes for the selected hunt rows."""
+        hunt_ids = self._selected_hunt_ids_or_warn("Batch Resumes")
+        if not hunt_ids:
+            return
+
+        import BatchResumeWindow as brw  # loaded on first use
+
+        brw.BatchResumeWindow(self.root, self.controller, hunt_ids)
+
+    def update_hunt_table(self):
+        """
+        Refresh the whole main sheet (controller entry point). The sheet is
+        always rebuilt through hunt_display, so the derived columns look the
+        same whichever path refreshed them last.
+        """
+        self.reload_hunt_table()
+
+    def reload_hunt_table(self):
+        """Rebuild the main sheet from the model; derived columns load lazily."""
+        if self._refresh_holds:
+            self._refresh_pending = True
+            return
+
+        repo = repository.for_controller(self.controller)
+        self._dirty_rows.clear()
+        self._materialized = set()
+        self.sheet.set_sheet_data(hd.build_hunt_display_rows(repo, derived=False))
+        self.apply_search()
+
+    @contextlib.contextmanager
+    def hold_refresh(self):
+        """
+        Collapse the sheet reloads inside the block (e.g. one per
+        controller.create_new_hunt call) into a single reload at the end.
+        """
+        self._refresh_holds += 1
+        try:
+            yield
+        finally:
+            self._refresh_holds -= 1
+            if not self._refresh_holds and self._refresh_pending:
+                self._refresh_pending = False
+                self.reload_hunt_table()
+
+    # ------------------------------------------------------------------
+    def _rebuild_search_index(self):
+        self.lbl_search.config(text="Indexing...")
+        self.search_index.rebuild_async(task_runner.get_runner(self.root), on_ready=self.apply_search)
+
+    def _on_search_changed(self):
+        if self._search_job is not None:
+            self.root.after_cancel(self._search_job)
+        self._search_job = self.root.after(SEARCH_DELAY_MS, self.apply_search)
+
+    def apply_search(self):
+        """
+        Show only the hunts matching the search box and the salary range
+        (all hunts when both are empty). Sheet rows are hunt_rows positions,
+        so matches map straight to data rows.
+        """
+        self._search_job = None
+        query = self.search_var.get()
+
+        # A table was replaced wholesale: re-index in the background rather
+        # than inside this keystroke
+        if self.search_index.needs_rebuild and not self.search_index.building:
+            self._rebuild_search_index()
+        if self.search_index.building:
+            return
+
+        repo = repository.for_controller(self.controller)
+        rows = None   # no filter
+
+        hunt_ids = self.search_index.search(query)
+        if hunt_ids is not None:
+            rows = {r for r in (repo.hunt_index(hunt_id) for hunt_id in hunt_ids) if r is not None}
+
+        field = SALARY_FILTER_FIELDS[self.cb_salary_field.get()]
+        low = salary_columns.parse_number(self.salary_min_var.get())
+        high = salary_columns.parse_number(self.salary_max_var.get())
+        if low is not None or high is not None:
+            rows = repo.salary.filter_range(field, low, high, positions=rows)
+
+        if rows is None:
+            if not self.sheet.all_rows:
+                self.sheet.display_rows("all", redraw=True)
+            text = f"{len(repo.hunts.rows)} hunts"
+        else:
+            total = self.sheet.get_total_rows()
+            rows = sorted(r for r in rows if r < total)
+            self.sheet.display_rows(rows=rows, all_rows_displayed=False, redraw=True)
+            text = f"{len(rows)} of {len(repo.hunts.rows)} hunts"
+
+        stats = repo.salary.stats(field, rows)
+        if stats["count"]:
+            text += (
+                f"  |  {self.cb_salary_field.get()}: median {_format_number(stats['median'])},"
+                f" {_format_number(stats['min'])} – {_format_number(stats['max'])}"
+                f" ({stats['count']} with a value)"
+            )
+        self.lbl_search.config(text=text)
+
+    # ------------------------------------------------------------------
+    def _on_sheet_redrawn(self, event=None):
+        # Coalesce: scrolling fires many redraws
+        if self._materialize_job is None:
+            self._materialize_job = self.root.after_idle(self.materialize_visible_rows)
+
+    def materialize_visible_rows(self):
+        """
+        Fill in the derived columns of the rows on screen (plus a prefetch
+        margin) that have not been filled in yet.
+        """
+        self._materialize_job = None
+
+        repo = repository.for_controller(self.controller)
+        hunt_rows = repo.hunts.rows
+
+        if self.sheet.all_rows:
+            displayed_count = self.sheet.get_total_rows()
+        else:
+            displayed_count = len(self.sheet.displayed_rows)
+
+        start, end = self.sheet.visible_rows
+        start = max(0, start - PREFETCH_ROWS)
+        end = min(displayed_count, end + PREFETCH_ROWS)
+
+        changed = 0
+        with tracing.span("main.materialize_visible_rows") as s:
+            for d in range(start, end):
+                r = self.sheet.displayed_row_to_data(d)
+                if r in self._materialized or r >= len(hunt_rows):
+                    continue
+
+                for c, value in hd.derived_cells(hunt_rows[r], repo).items():
+                    self.sheet.set_cell_data(r, c, value, redraw=False)
+                self._materialized.add(r)
+                changed += 1
+
+            s.set("rows", changed)
+            if changed:
+                self.sheet.redraw()
+
+    # ------------------------------------------------------------------
+    def mark_rows_dirty(self, rows):
+        """
+        Queue hunt row indices for recompute. Several edits in the same
+        event-loop turn are coalesced into one flush.
+        """
+        self._dirty_rows.update(rows)
+        if self._flush_job is None:
+            self._flush_job = self.root.after_idle(self.flush_dirty_rows)
+
+    def mark_company_dirty(self, company_id):
+        """Queue every hunt row that points at company_id."""
+        repo = repository.for_controller(self.controller)
+        self.mark_rows_dirty(repo.hunt_indices_for_company(company_id))
+
+    def flush_dirty_rows(self):
+        """
+        Recompute the derived columns of the dirty rows only, and push just
+        the cells that actually changed to the sheet.
+        """
+        self._flush_job = None
+        dirty, self._dirty_rows = self._dirty_rows, set()
+        if not dirty:
+            return
+
+        with tracing.span("main.flush_dirty_rows", rows=len(dirty)):
+            repo = repository.for_controller(self.controller)
+            hunt_rows = repo.hunts.rows
+
+            # Sheet and model disagree on row count -> incremental is unsafe
+            if self.sheet.get_total_rows() != len(hunt_rows):
+                self.reload_hunt_table()
+                return
+
+            for r in sorted(dirty):
+                if not 0 <= r < len(hunt_rows):
+                    continue
+
+                new_row = hd.build_hunt_display_row(hunt_rows[r], repo)
+                old_row = self.sheet.get_row_data(r)
+
+                for c, value in enumerate(new_row):
+                    if c >= len(old_row) or old_row[c] != value:
+                        self.sheet.set_cell_data(r, c, value, redraw=False)
+                self._materialized.add(r)
+
+            self.sheet.redraw()
 
     # ------------------------------------------------------------------
     def _on_cell_select(self, response):
@@ -144,8 +532,13 @@ class MainWindow:
         if row is None or col is None:
             return
 
+        # Displayed row (differs from the hunt_rows position while filtered)
+        row = self.sheet.displayed_row_to_data(row)
         header = self.HUNT_HEADERS[col]
 
+        if col in hd.PREVIEW_COLUMNS:
+            self._show_detail(row, col)
+
         hunt_id    = self.sheet.get_cell_data(row, 2)   # id column
         company_id = self.sheet.get_cell_data(row, 14)  # companyId column
 
@@ -157,6 +550,8 @@ class MainWindow:
 
         elif header == "Company Name" and company_id:
             # Open single-company editor for this hunt row
+            import SingleCompanyWindow as scw  # loaded on first use
+
             scw.SingleCompanyWindow(self.root, self.controller, row)
 
         elif header == "Resume" and hunt_id:
@@ -166,9 +561,39 @@ class MainWindow:
             self.controller.on_email_clicked_for_hunt(hunt_id, company_id)
 
         elif header == "Map" and hunt_id:
-            debug.debug("map", hunt_id, "1")
             self.controller.on_map_clicked_for_hunt(hunt_id, company_id)
 
+    def _show_detail(self, row, col):
+        """Load the full text behind a preview cell into the detail pane."""
+        model_col = hd.model_column(col)
+        hunt_rows = self.controller.hunt_rows
+        text = ""
+        if 0 <= row < len(hunt_rows) and model_col < len(hunt_rows[row]):
+            text = hunt_rows[row][model_col]
+
+        self.txt_detail.config(state="normal")
+        self.txt_detail.delete("1.0", "end")
+        self.txt_detail.insert("1.0", text)
+        self.txt_detail.config(state="disabled")
+
+    # ------------------------------------------------------------------
+    def _on_begin_edit_cell(self, response):
+        """
+        Put the full text (not the preview) into the editor of long-text
+        cells. Typing a character to start editing replaces the text.
+        """
+        value = response.get("value")
+        col = response.get("column")
+        if col not in hd.PREVIEW_COLUMNS or response.get("key") not in ("Return", "F2", "??"):
+            return value
+
+        row = self.sheet.displayed_row_to_data(int(response.get("row")))
+        hunt_rows = self.controller.hunt_rows
+        model_col = hd.model_column(col)
+        if 0 <= row < len(hunt_rows) and model_col < len(hunt_rows[row]):
+            return hunt_rows[row][model_col]
+        return value
+
     # ------------------------------------------------------------------
     def _on_end_edit_cell(self, response):
         """
@@ -181,7 +606,7 @@ class MainWindow:
         if row is None or col is None:
             return
 
-        row = int(row)
+        row = self.sheet.displayed_row_to_data(int(row))
         col = int(col)
 
         # Out of range safety
@@ -191,17 +616,17 @@ class MainWindow:
         # Map sheet column -> underlying model column
         # Sheet:  0=Reminder, 1=Progress, 2=id, 3=jobTitle, ...
         # Model:  0=id, 1=jobTitle, ...
-        model_col = col - 2
-        if model_col < 0 or model_col >= len(m.HUNT_FIELDS):
+        model_col = hd.model_column(col)
+        if model_col is None:
             return
 
         hunt_row = self.controller.hunt_rows[row]
         hunt_row[model_col] = new_value
         self.controller.hunt_rows[row] = hunt_row
+        repository.for_controller(self.controller).hunts.touch(hunt_row)
 
-        # Rebuild the display (so computed columns stay in sync)
-        new_rows = self.controller.finalize_hunt_display_columns()
-        self.update_hunt_table(new_rows)
+        # Only this row's computed columns can have changed
+        self.mark_rows_dirty([row])
 
     # ------------------------------------------------------------------
     def _on_rc_delete_row(self, response):
@@ -215,10 +640,17 @@ class MainWindow:
         # Keys of this dict are the deleted sheet row indices
         sheet_rows = sorted((int(r) for r in deleted.keys()), reverse=True)
 
+        repo = repository.for_controller(self.controller)
         for r in sheet_rows:
-            if 0 <= r < len(self.controller.hunt_rows):
-                self.controller.hunt_rows.pop(r)
+            repo.hunts.delete_at(r)
 
-        # Rebuild table after deletion
-        new_rows = self.controller.finalize_hunt_display_columns()
-        self.update_hunt_table(new_rows)
+        # tksheet already removed these rows and the remaining rows' derived
+        # columns do not depend on them, so there is nothing to recompute.
+        # Dirty indices still queued have shifted up; remap them.
+        for r in sheet_rows:
+            self._dirty_rows = {
+                d - 1 if d > r else d for d in self._dirty_rows if d != r
+            }
+            self._materialized = {
+                d - 1 if d > r else d for d in self._materialized if d != r
+            }
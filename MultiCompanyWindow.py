@@ -4,6 +4,7 @@ from tkinter import ttk, messagebox
 
 import tksheet as tks
 import model as m
+import repository
 
 
 class MultiCompanyWindow(tk.Toplevel):
@@ -111,17 +112,8 @@ class MultiCompanyWindow(tk.Toplevel):
         """
         Return True if any hunt row references this company_id.
         """
-        if not company_id:
-            return False
-
-        hunts = self.controller.hunt_rows
-        companyid_idx_in_hunt = m.HUNT_FIELDS.index("companyId")
-
-        for hrow in hunts:
-            if len(hrow) > companyid_idx_in_hunt and hrow[companyid_idx_in_hunt] == company_id:
-                return True
-
-        return False
+        repo = repository.for_controller(self.controller)
+        return repo.is_company_used(company_id)
 
     # -------------------------------------------------------------
     # Delete
@@ -173,8 +165,7 @@ class MultiCompanyWindow(tk.Toplevel):
             self.controller.company_rows = new_company_rows
 
             # Refresh main Hunt sheet (company names/email icons, etc. may change)
-            hunt_rows = self.controller.finalize_hunt_display_columns()
-            self.controller.view.update_hunt_table(hunt_rows)
+            self.controller.view.reload_hunt_table()
 
         except Exception as e:
             print("Error in MultiCompanyWindow._on_close_save:", e)
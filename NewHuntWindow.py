@@ -1,9 +1,12 @@
 # NewHuntWindow.py
 import tkinter as tk
-from tkinter import ttk
+from tkinter import ttk, messagebox
 import tksheet as tks  # still fine even if unused
 
 import model as m
+import repository
+import company_match
+from DuplicatesWindow import confirm_not_duplicate
 
 
 class NewHuntWindow(tk.Toplevel):
@@ -225,6 +228,7 @@ class NewHuntWindow(tk.Toplevel):
         cb_comp_name.grid(row=row_c, column=1, sticky="w", pady=4)
         self.company_widgets["name"] = cb_comp_name
         cb_comp_name.bind("<<ComboboxSelected>>", self._on_existing_company_selected)
+        company_match.bind_company_autocomplete(cb_comp_name, self.controller)
         row_c += 1
 
         # Industry (editable dropdown)
@@ -393,7 +397,7 @@ class NewHuntWindow(tk.Toplevel):
         if not name:
             return
 
-        row = self.controller.find_company_by_name(name)
+        row = repository.for_controller(self.controller).resolve_company(name)
         if not row:
             return
 
@@ -507,6 +511,30 @@ class NewHuntWindow(tk.Toplevel):
         data["companyEmail"]       = self.company_widgets["email"].get().strip()
         data["companyReputation"]  = str(self.company_widgets["reputation"].get())
 
+        # Link to an existing company under a slightly different name
+        # ("Acme" vs "Acme Sdn Bhd") instead of creating a second one
+        existing = repository.for_controller(self.controller).resolve_company(data["companyName"])
+        if existing is not None:
+            existing_name = existing[m.COMPANY_FIELDS.index("name")]
+            if mode == "new":
+                answer = messagebox.askyesnocancel(
+                    "Existing Company",
+                    f"\"{existing_name}\" already exists.\n\n"
+                    "Link this hunt to it instead of creating a new company?",
+                    parent=self,
+                )
+                if answer is None:
+                    return
+                if answer:
+                    data["companyMode"] = "existing"
+                    data["companyName"] = existing_name
+            else:
+                data["companyName"] = existing_name
+
+        # Same ad already tracked? (user may still go ahead)
+        if not confirm_not_duplicate(self, self.controller, data):
+            return
+
         # Delegate creation to controller
         self.controller.create_new_hunt(data)
         self.destroy()
@@ -0,0 +1,109 @@
+# ReminderAlertWindow.py
+import tkinter as tk
+
+import model as m
+import reminder_scheduler
+
+
+class ReminderAlertWindow(tk.Toplevel):
+    """
+    Pop-up listing reminders that just came due (raised by
+    reminder_scheduler). Stays on top; new due reminders are appended
+    to the same window instead of opening another one.
+    """
+
+    def __init__(self, parent, controller, scheduler):
+        super().__init__(parent)
+        self.controller = controller
+        self.scheduler = scheduler
+
+        self.reminder_ids = []   # same order as the listbox
+        self.hunt_ids = []
+
+        self.title("Reminders Due")
+        self.geometry("520x300")
+        self.iconbitmap("icon.ico")
+        self.attributes("-topmost", True)
+
+        main = tk.Frame(self)
+        main.pack(fill="both", expand=True, padx=10, pady=10)
+
+        tk.Label(main, text="⏰ These reminders are due:", anchor="w").pack(fill="x")
+
+        self.listbox = tk.Listbox(main, selectmode="extended", height=8)
+        self.listbox.pack(fill="both", expand=True, pady=(5, 10))
+
+        btn_row = tk.Frame(main)
+        btn_row.pack(fill="x")
+
+        tk.Button(btn_row, text="Mark Done", command=self._on_mark_done).pack(side="left")
+        tk.Button(
+            btn_row,
+            text=f"Snooze {reminder_scheduler.SNOOZE_MINUTES} min",
+            command=self._on_snooze,
+        ).pack(side="left", padx=(5, 0))
+        tk.Button(btn_row, text="Open Reminders", command=self._on_open).pack(side="left", padx=(5, 0))
+        tk.Button(btn_row, text="Dismiss", command=self.destroy).pack(side="right")
+
+    # =========================================================
+    # Content
+    # =========================================================
+    def add_reminders(self, rows):
+        id_idx = m.REMINDER_FIELDS.index("id")
+        hunt_idx = m.REMINDER_FIELDS.index("huntId")
+        dt_idx = m.REMINDER_FIELDS.index("dateTime")
+        desc_idx = m.REMINDER_FIELDS.index("description")
+
+        for row in rows:
+            rid = row[id_idx]
+            if rid in self.reminder_ids:
+                continue
+
+            hunt_id = row[hunt_idx]
+            try:
+                label = self.controller._build_hunt_label(hunt_id)
+            except Exception:
+                label = hunt_id
+
+            self.reminder_ids.append(rid)
+            self.hunt_ids.append(hunt_id)
+            self.listbox.insert("end", f"{row[dt_idx]}  {label}  —  {row[desc_idx]}")
+
+        self.deiconify()
+        self.lift()
+        self.bell()
+
+    def _selected(self):
+        """Selected listbox indexes (all of them when nothing is selected)."""
+        selected = list(self.listbox.curselection())
+        if not selected:
+            selected = list(range(len(self.reminder_ids)))
+        return selected
+
+    def _drop(self, indexes):
+        for i in sorted(indexes, reverse=True):
+            self.listbox.delete(i)
+            del self.reminder_ids[i]
+            del self.hunt_ids[i]
+        if not self.reminder_ids:
+            self.destroy()
+
+    # =========================================================
+    # Buttons
+    # =========================================================
+    def _on_mark_done(self):
+        indexes = self._selected()
+        for i in indexes:
+            self.scheduler.mark_done(self.reminder_ids[i])
+        self._drop(indexes)
+
+    def _on_snooze(self):
+        indexes = self._selected()
+        for i in indexes:
+            self.scheduler.snooze(self.reminder_ids[i])
+        self._drop(indexes)
+
+    def _on_open(self):
+        indexes = self._selected()
+        if indexes:
+            self.controller.open_reminder_window(self.hunt_ids[indexes[0]])
@@ -7,9 +7,45 @@ from pathlib import Path
 import os
 import re
 
+import profile_digest
 import resume_service
 from app_paths import OUTPUT_DIR
 
+
+def safe_slug(value: str, fallback: str = "resume") -> str:
+    value = (value or "").strip()
+    if not value:
+        value = fallback
+    value = re.sub(r"[^A-Za-z0-9]+", "_", value)
+    value = value.strip("_")
+    return value or fallback
+
+
+def default_target_role(context: Dict[str, Any]) -> str:
+    """Target role from the job title/company ("" when there is no title)."""
+    hunt    = context.get("hunt", {}) or {}
+    company = context.get("company", {}) or {}
+
+    job_title = (hunt.get("jobTitle") or "").strip()
+    company_name = (company.get("name") or "").strip()
+
+    if job_title and company_name:
+        return f"{job_title} – {company_name}"
+    return job_title
+
+
+def resume_filename(context: Dict[str, Any], timestamp: str = "") -> str:
+    """<job>_<company>_<timestamp>.docx"""
+    hunt = context.get("hunt", {}) or {}
+    company = context.get("company", {}) or {}
+
+    slug_job = safe_slug(hunt.get("jobTitle", "") or "", "job")
+    slug_company = safe_slug(company.get("name", "") or "", "company")
+    timestamp = timestamp or datetime.now().strftime("%Y%m%d_%H%M%S")
+
+    return f"{slug_job}_{slug_company}_{timestamp}.docx"
+
+
 class ResumeWindow(tk.Toplevel):
     def __init__(self, parent, controller, hunt_id, context):
         super().__init__(parent)
@@ -22,14 +58,21 @@ class ResumeWindow(tk.Toplevel):
         self.geometry("900x700")
         self.iconbitmap("icon.ico")
 
+        # Running AI generation (ai_stream task), if any
+        self.generate_task = None
+        # Whether that generation has replaced the previous output yet
+        self.output_started = False
+
         # ======================================================
-        # Layout: top = context (read-only), bottom = preferences
+        # Layout: top = context (read-only), middle = preferences,
+        # bottom = AI output as it streams in
         # ======================================================
         main = tk.Frame(self)
         main.pack(fill="both", expand=True, padx=10, pady=10)
 
         main.rowconfigure(0, weight=2)
         main.rowconfigure(1, weight=1)
+        main.rowconfigure(2, weight=1)
         main.columnconfigure(0, weight=1)
 
         # -----------------------------
@@ -91,8 +134,26 @@ class ResumeWindow(tk.Toplevel):
         )
         self.btn_generate.pack(side="right")
 
-        # X button just closes
-        self.protocol("WM_DELETE_WINDOW", self.destroy)
+        # Same inputs as last time are answered from ai_cache; this asks anew
+        self.btn_regenerate = tk.Button(
+            btn_row,
+            text="Regenerate",
+            command=lambda: self._on_generate_clicked(refresh=True),
+        )
+        self.btn_regenerate.pack(side="right", padx=(0, 5))
+
+        # -----------------------------
+        # Bottom: AI output (read-only, streamed)
+        # -----------------------------
+        out_frame = tk.LabelFrame(main, text="AI Output")
+        out_frame.grid(row=2, column=0, sticky="nsew", pady=(8, 0))
+
+        self.txt_output = tk.Text(out_frame, wrap="word", height=8)
+        self.txt_output.pack(fill="both", expand=True)
+        self.txt_output.config(state="disabled")
+
+        # X button closes (and stops a running generation)
+        self.protocol("WM_DELETE_WINDOW", self._on_close)
 
         # Now that widgets exist, fill context + default headline
         self._populate_summary()
@@ -150,17 +211,8 @@ class ResumeWindow(tk.Toplevel):
 
     def _prefill_target_role(self):
         """Pre-fill the target-role field from the job title/company (optional)."""
-        hunt    = self.context.get("hunt", {}) or {}
-        company = self.context.get("company", {}) or {}
-
-        job_title = (hunt.get("jobTitle") or "").strip()
-        company_name = (company.get("name") or "").strip()
-
         if not self.ent_target_role.get().strip():
-            if job_title and company_name:
-                self.ent_target_role.insert(0, f"{job_title} – {company_name}")
-            elif job_title:
-                self.ent_target_role.insert(0, job_title)
+            self.ent_target_role.insert(0, default_target_role(self.context))
 
     # -------------------------------------------
     def _collect_prefs(self) -> Dict[str, Any]:
@@ -177,68 +229,101 @@ class ResumeWindow(tk.Toplevel):
         return prefs
 
     # -------------------------------------------
-    def _safe_slug(self, value: str, fallback: str = "resume") -> str:
-        value = (value or "").strip()
-        if not value:
-            value = fallback
-        value = re.sub(r"[^A-Za-z0-9]+", "_", value)
-        value = value.strip("_")
-        return value or fallback
-
-    # -------------------------------------------
-    def _on_generate_clicked(self):
-        # Disable button while working
-        self.btn_generate.config(state="disabled")
-        self.config(cursor="watch")
-        self.update_idletasks()
+    def _on_generate_clicked(self, refresh=False):
+        """
+        Generate the resume structure with AI (streamed into the output
+        box), then write the DOCX. The button turns into Cancel meanwhile.
+        A context seen before is answered from ai_cache unless refresh=True
+        (Regenerate).
+        """
+        if self.generate_task is not None:
+            return
 
-        try:
-            prefs = self._collect_prefs()
-            context = {
-                "personal": self.context.get("personal", {}),
-                "hunt": self.context.get("hunt", {}),
-                "company": self.context.get("company", {}),
-                "prefs": prefs,
-            }
+        prefs = self._collect_prefs()
+        context = {
+            "personal": profile_digest.personal_for_prompt(),
+            "hunt": self.context.get("hunt", {}),
+            "company": self.context.get("company", {}),
+            "prefs": prefs,
+        }
 
-            # Call AI to get structured resume JSON
-            resume_json = resume_service.generate_resume_structure(context)
+        # The previous output stays until the first text arrives
+        self.output_started = False
+        self.btn_generate.config(text="Cancel", command=self._on_cancel_generate)
+        self.btn_regenerate.config(state="disabled")
 
-            # Build output path: output/resumes/<job>_<company>_<timestamp>.docx
-            output_dir = OUTPUT_DIR
+        try:
+            self.generate_task = resume_service.start_resume_structure(
+                self,
+                context,
+                on_text=self._on_generate_text,
+                on_done=self._on_structure_done,
+                on_error=self._on_generate_error,
+                refresh=refresh,
+            )
+        except Exception as e:
+            self._on_generate_error(e)
 
-            hunt = self.context.get("hunt", {}) or {}
-            company = self.context.get("company", {}) or {}
+    def _on_generate_text(self, chunk):
+        if not self.output_started:
+            self.output_started = True
+            self._set_output("")
+        self._append_output(chunk)
 
-            job_title = hunt.get("jobTitle", "") or ""
-            company_name = company.get("name", "") or ""
+    def _append_output(self, text):
+        self.txt_output.config(state="normal")
+        self.txt_output.insert("end", text)
+        self.txt_output.see("end")
+        self.txt_output.config(state="disabled")
 
-            slug_job = self._safe_slug(job_title, "job")
-            slug_company = self._safe_slug(company_name, "company")
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    def _on_structure_done(self, resume_json):
+        self._end_generate()
 
-            filename = f"{slug_job}_{slug_company}_{timestamp}.docx"
-            out_path = output_dir / filename
+        try:
+            # Build output path: output/resumes/<job>_<company>_<timestamp>.docx
+            out_path = OUTPUT_DIR / resume_filename(self.context)
 
             resume_service.build_resume_docx(resume_json, out_path)
-
-            # Try to open file directly (Windows-friendly)
-            try:
-                os.startfile(out_path)  # type: ignore[attr-defined]
-            except Exception:
-                # Non-Windows or failure to open: ignore
-                pass
-
         except Exception as e:
-            self.config(cursor="")
-            self.btn_generate.config(state="normal")
-            messagebox.showerror(
-                "Resume Error",
-                f"Failed to generate resume:\n{e}",
-                parent=self,
-            )
+            self._on_generate_error(e)
             return
 
-        # Restore cursor and re-enable button (if user wants to generate again)
-        self.config(cursor="")
-        self.btn_generate.config(state="normal")
+        self._append_output(f"\n\nSaved: {out_path}\n")
+
+        # Try to open file directly (Windows-friendly)
+        try:
+            os.startfile(out_path)  # type: ignore[attr-defined]
+        except Exception:
+            # Non-Windows or failure to open: ignore
+            pass
+
+    def _on_generate_error(self, e):
+        self._end_generate()
+        messagebox.showerror(
+            "Resume Error",
+            f"Failed to generate resume:\n{e}",
+            parent=self,
+        )
+
+    def _on_cancel_generate(self):
+        if self.generate_task is not None:
+            self.generate_task.cancel()
+        self._end_generate()
+        if self.output_started:
+            self._append_output("\n\n(cancelled)\n")
+
+    def _end_generate(self):
+        self.generate_task = None
+        self.btn_generate.config(text="Generate Resume", command=self._on_generate_clicked)
+        self.btn_regenerate.config(state="normal")
+
+    def _set_output(self, text):
+        self.txt_output.config(state="normal")
+        self.txt_output.delete("1.0", "end")
+        self.txt_output.insert("1.0", text)
+        self.txt_output.config(state="disabled")
+
+    def _on_close(self):
+        if self.generate_task is not None:
+            self.generate_task.cancel()
+        self.destroy()
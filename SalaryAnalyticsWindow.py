@@ -0,0 +1,270 @@
+# SalaryAnalyticsWindow.py
+import tkinter as tk
+from tkinter import ttk, messagebox
+
+import tksheet as tks
+
+import model as m
+import repository
+import task_runner
+import hunt_display as hd
+import salary_analytics as sa
+import salary_columns
+
+GROUP_HEADERS = ["Group", "Hunts", "P25", "Median", "P75", "Mean"]
+
+SUMMARY_ROWS = [
+    ("Hunts with a value", "count"),
+    ("Mean", "mean"),
+    ("Min", "min"),
+    ("P10", "p10"),
+    ("P25", "p25"),
+    ("Median", "p50"),
+    ("P75", "p75"),
+    ("P90", "p90"),
+    ("Max", "max"),
+]
+
+# Field choices: sheet header -> hunt field
+FIELD_CHOICES = {
+    hd.HUNT_HEADERS[m.HUNT_FIELDS.index(field) + hd.MODEL_OFFSET]: field
+    for field in salary_columns.NUMERIC_FIELDS
+    if field != "otRateRatio"
+}
+
+
+def _fmt(value) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, int):
+        return f"{value:,}"
+    return f"{value:,.0f}"
+
+
+class SalaryAnalyticsWindow(tk.Toplevel):
+    """
+    Salary distribution, percentiles and per-industry / per-work-arrangement
+    aggregates, every hunt converted to one currency.
+
+    The column snapshot is taken on the Tk thread; the statistics are
+    computed on a task_runner worker (salary_analytics.analyze).
+    """
+
+    def __init__(self, parent, controller):
+        super().__init__(parent)
+        self.controller = controller
+        self.task = None
+        self.result = None
+        self.rates = sa.load_rates()
+        self.rate_vars = {}   # currency -> StringVar
+
+        self.title("Salary Analytics")
+        self.geometry("1100x800")
+        self.iconbitmap("icon.ico")
+
+        main = tk.Frame(self)
+        main.pack(fill="both", expand=True, padx=10, pady=10)
+        main.columnconfigure(0, weight=1)
+        main.columnconfigure(1, weight=1)
+        main.rowconfigure(2, weight=1)
+        main.rowconfigure(3, weight=1)
+
+        # -----------------------------
+        # Controls
+        # -----------------------------
+        ctrl = tk.Frame(main)
+        ctrl.grid(row=0, column=0, columnspan=2, sticky="we", pady=(0, 5))
+
+        tk.Label(ctrl, text="Salary field").pack(side="left")
+        self.cb_field = ttk.Combobox(ctrl, width=20, values=list(FIELD_CHOICES), state="readonly")
+        self.cb_field.set(hd.HUNT_HEADERS[m.HUNT_FIELDS.index("salaryExpecting") + hd.MODEL_OFFSET])
+        self.cb_field.pack(side="left", padx=(5, 15))
+        self.cb_field.bind("<<ComboboxSelected>>", lambda e: self.refresh())
+
+        tk.Label(ctrl, text="Convert to").pack(side="left")
+        self.cb_target = ttk.Combobox(ctrl, width=8, values=sorted(self.rates), state="readonly")
+        self.cb_target.set(sa.BASE_CURRENCY)
+        self.cb_target.pack(side="left", padx=(5, 15))
+        self.cb_target.bind("<<ComboboxSelected>>", lambda e: self.refresh())
+
+        tk.Button(ctrl, text="Refresh", command=self.refresh).pack(side="left")
+
+        self.lbl_status = tk.Label(ctrl, text="", anchor="w")
+        self.lbl_status.pack(side="left", padx=(10, 0))
+
+        # -----------------------------
+        # Offline rate table
+        # -----------------------------
+        self.rates_frame = tk.LabelFrame(main, text=f"Exchange rates (1 unit in {sa.BASE_CURRENCY})")
+        self.rates_frame.grid(row=1, column=0, columnspan=2, sticky="we", pady=(0, 5))
+        self._build_rate_entries(sorted(self.rates))
+
+        # -----------------------------
+        # Summary + histogram
+        # -----------------------------
+        self.summary_sheet = tks.Sheet(
+            main,
+            data=[[label, ""] for label, _ in SUMMARY_ROWS],
+            headers=["Statistic", "Value"],
+        )
+        self.summary_sheet.grid(row=2, column=0, sticky="nsew", padx=(0, 5), pady=(0, 5))
+        self.summary_sheet.enable_bindings(("copy", "single_select", "column_width_resize"))
+
+        hist_frame = tk.LabelFrame(main, text="Distribution")
+        hist_frame.grid(row=2, column=1, sticky="nsew", pady=(0, 5))
+        self.canvas = tk.Canvas(hist_frame, bg="white", highlightthickness=0)
+        self.canvas.pack(fill="both", expand=True)
+        self.canvas.bind("<Configure>", lambda e: self._draw_histogram())
+
+        # -----------------------------
+        # Group aggregates
+        # -----------------------------
+        self.industry_sheet = self._group_sheet(main, "By industry", column=0)
+        self.arrangement_sheet = self._group_sheet(main, "By work arrangement", column=1)
+
+        self.protocol("WM_DELETE_WINDOW", self._on_close)
+        self.refresh()
+
+    def _group_sheet(self, parent, title, column):
+        frame = tk.LabelFrame(parent, text=title)
+        frame.grid(row=3, column=column, sticky="nsew", padx=(0, 5) if column == 0 else 0)
+        sheet = tks.Sheet(frame, data=[], headers=GROUP_HEADERS)
+        sheet.pack(fill="both", expand=True)
+        sheet.enable_bindings(("copy", "single_select", "row_select", "column_width_resize"))
+        return sheet
+
+    # =========================================================
+    # Rate table
+    # =========================================================
+    def _build_rate_entries(self, codes):
+        for child in self.rates_frame.winfo_children():
+            child.destroy()
+        old = {code: var.get() for code, var in self.rate_vars.items()}
+        self.rate_vars = {}
+
+        for code in codes:
+            tk.Label(self.rates_frame, text=code).pack(side="left", padx=(5, 2), pady=3)
+            var = tk.StringVar(value=old.get(code, self._rate_text(code)))
+            tk.Entry(self.rates_frame, textvariable=var, width=8).pack(side="left")
+            self.rate_vars[code] = var
+
+        tk.Button(self.rates_frame, text="Save Rates", command=self._on_save_rates).pack(
+            side="right", padx=5, pady=3
+        )
+
+    def _rate_text(self, code):
+        rate = self.rates.get(code)
+        return f"{rate:g}" if rate else ""
+
+    def _read_rates(self):
+        rates = {}
+        for code, var in self.rate_vars.items():
+            value = salary_columns.parse_number(var.get())
+            if value and value > 0:
+                rates[code] = value
+        return rates
+
+    def _on_save_rates(self):
+        self.rates = self._read_rates()
+        sa.save_rates(self.rates)
+        self.cb_target.config(values=sorted(self.rates))
+        self.refresh()
+
+    # =========================================================
+    # Computing
+    # =========================================================
+    def refresh(self):
+        rates = self._read_rates()
+        target = self.cb_target.get()
+        if target not in rates:
+            messagebox.showwarning("Salary Analytics", f"Enter a rate for {target} first.", parent=self)
+            return
+
+        if self.task is not None:
+            self.task.cancel()
+
+        repo = repository.for_controller(self.controller)
+        snap = sa.snapshot(repo, FIELD_CHOICES[self.cb_field.get()])
+
+        # Currencies in the data without a rate get an (empty) entry
+        codes = sorted(set(self.rate_vars) | {c for c in snap["currencies"] if c})
+        if codes != sorted(self.rate_vars):
+            self._build_rate_entries(codes)
+
+        self.lbl_status.config(text="Computing...")
+        self.task = task_runner.get_runner(self).submit(
+            sa.analyze,
+            snap,
+            target,
+            rates,
+            on_done=self._on_analyzed,
+            on_error=self._on_analyze_error,
+            name="salary.analyze",
+        )
+
+    def _on_analyzed(self, result):
+        self.task = None
+        self.result = result
+
+        overall = result["overall"]
+        for r, (_, key) in enumerate(SUMMARY_ROWS):
+            self.summary_sheet.set_cell_data(r, 1, _fmt(overall[key]), redraw=False)
+        self.summary_sheet.redraw()
+
+        self.industry_sheet.set_sheet_data(self._group_rows(result["by_industry"]))
+        self.arrangement_sheet.set_sheet_data(self._group_rows(result["by_arrangement"]))
+        self._draw_histogram()
+
+        status = f"All amounts in {result['target']}. {result['missing']} hunt(s) without a value."
+        if result["unknown_currency"]:
+            skipped = ", ".join(f"{code} ({n})" for code, n in sorted(result["unknown_currency"].items()))
+            status += f" Skipped, no rate: {skipped}."
+        self.lbl_status.config(text=status)
+
+    def _on_analyze_error(self, e):
+        self.task = None
+        self.lbl_status.config(text="")
+        messagebox.showerror("Salary Analytics", f"Could not compute statistics:\n{e}", parent=self)
+
+    def _group_rows(self, groups):
+        return [
+            [label, _fmt(s["count"]), _fmt(s["p25"]), _fmt(s["p50"]), _fmt(s["p75"]), _fmt(s["mean"])]
+            for label, s in groups
+        ]
+
+    # =========================================================
+    # Histogram
+    # =========================================================
+    def _draw_histogram(self):
+        self.canvas.delete("all")
+        if not self.result or not self.result["histogram"]:
+            return
+
+        bins = self.result["histogram"]
+        width = self.canvas.winfo_width()
+        height = self.canvas.winfo_height()
+        pad_x, pad_top, pad_bottom = 10, 10, 25
+        if width <= 2 * pad_x or height <= pad_top + pad_bottom:
+            return
+
+        peak = max(count for _, _, count in bins) or 1
+        bar_w = (width - 2 * pad_x) / len(bins)
+        plot_h = height - pad_top - pad_bottom
+
+        for i, (low, high, count) in enumerate(bins):
+            x0 = pad_x + i * bar_w
+            bar_h = plot_h * count / peak
+            self.canvas.create_rectangle(
+                x0 + 1, pad_top + plot_h - bar_h, x0 + bar_w - 1, pad_top + plot_h,
+                fill="#4a7ebb", outline="",
+            )
+            if i % 2 == 0:
+                self.canvas.create_text(
+                    x0, height - pad_bottom + 12, text=_fmt(low), anchor="w", font=("Segoe UI", 8)
+                )
+
+    def _on_close(self):
+        if self.task is not None:
+            self.task.cancel()
+            self.task = None
+        self.destroy()
@@ -3,6 +3,8 @@ import tkinter as tk
 from tkinter import ttk, messagebox
 
 import model as m
+import repository
+import company_match
 
 
 class SingleCompanyWindow(tk.Toplevel):
@@ -36,21 +38,14 @@ class SingleCompanyWindow(tk.Toplevel):
             self.current_company_id = ""
 
         # Find current company row by id
-        company_id_idx = m.COMPANY_FIELDS.index("id")
+        repo = repository.for_controller(self.controller)
         self.current_company_row = None
-        for crow in self.controller.company_rows:
-            if len(crow) > company_id_idx and crow[company_id_idx] == self.current_company_id:
-                self.current_company_row = list(crow)
-                break
+        crow = repo.get_company(self.current_company_id)
+        if crow is not None:
+            self.current_company_row = list(crow)
 
         # Build list of existing company names (for combobox)
-        name_idx = m.COMPANY_FIELDS.index("name")
-        existing_names = []
-        for row in self.controller.company_rows:
-            if len(row) > name_idx:
-                name = row[name_idx]
-                if name and name not in existing_names:
-                    existing_names.append(name)
+        existing_names = repo.company_names()
 
         # ------------------------------------------------------------------
         # Layout
@@ -97,6 +92,7 @@ class SingleCompanyWindow(tk.Toplevel):
         )
         cb_name.grid(row=row, column=1, sticky="w", pady=4)
         cb_name.bind("<<ComboboxSelected>>", self._on_company_selected)
+        company_match.bind_company_autocomplete(cb_name, self.controller)
         self.widgets["name"] = cb_name
         row += 1
 
@@ -328,7 +324,7 @@ class SingleCompanyWindow(tk.Toplevel):
         if not name:
             return
 
-        row = self.controller.find_company_by_name(name)
+        row = repository.for_controller(self.controller).find_company_by_name(name)
         if not row:
             return
 
@@ -348,8 +344,12 @@ class SingleCompanyWindow(tk.Toplevel):
         if not ok:
             return
 
-        rows = self.controller.finalize_hunt_display_columns()
-        self.controller.view.update_hunt_table(rows)
+        # Recompute only the affected main-sheet rows
+        view = self.controller.view
+        if mode == "edit":
+            # Name etc. changed for every hunt sharing this company
+            view.mark_company_dirty(self.current_company_id)
+        view.mark_rows_dirty([self.hunt_row_index])
 
         self.destroy()
 
@@ -389,19 +389,15 @@ class SingleCompanyWindow(tk.Toplevel):
         phone_idx    = company_fields.index("phone")
         email_idx    = company_fields.index("email")
 
+        repo = repository.for_controller(self.controller)
+
         # Ensure we have a company id
         if not self.current_company_id:
             self.current_company_id = m.new_id()
             companyid_idx = m.HUNT_FIELDS.index("companyId")
             if self.hunt_row and len(self.hunt_row) > companyid_idx:
                 self.hunt_row[companyid_idx] = self.current_company_id
-
-        # Find existing row with this id (if any)
-        target_index = None
-        for i, row in enumerate(self.controller.company_rows):
-            if len(row) > id_idx and row[id_idx] == self.current_company_id:
-                target_index = i
-                break
+                repo.hunts.touch(self.hunt_row)
 
         width = len(company_fields)
         full_row = [""] * width
@@ -416,10 +412,14 @@ class SingleCompanyWindow(tk.Toplevel):
         full_row[phone_idx]    = phone
         full_row[email_idx]    = email
 
-        if target_index is not None:
-            self.controller.company_rows[target_index] = full_row
+        existing = repo.get_company(self.current_company_id)
+        if existing is not None:
+            repo.companies.update(
+                self.current_company_id,
+                dict(zip(company_fields, full_row)),
+            )
         else:
-            self.controller.company_rows.append(full_row)
+            repo.companies.insert(full_row)
 
         return True
 
@@ -435,7 +435,7 @@ class SingleCompanyWindow(tk.Toplevel):
             )
             return False
 
-        row = self.controller.find_company_by_name(name)
+        row = repository.for_controller(self.controller).resolve_company(name)
         if not row:
             messagebox.showwarning(
                 "Unknown company",
@@ -465,5 +465,6 @@ class SingleCompanyWindow(tk.Toplevel):
                 )
 
             self.hunt_row[companyid_idx] = new_company_id
+            repository.for_controller(self.controller).hunts.touch(self.hunt_row)
 
         return True
@@ -0,0 +1,267 @@
+# ai_cache.py
+"""
+Persistent cache for AI responses (job-ad parse, email, resume structure).
+
+Entries are content-addressed: the key is a SHA-256 of the call kind plus
+the normalized input (dicts with sorted keys, text with normalized line
+endings and trimmed whitespace), so re-parsing the same ad or re-clicking
+Generate with the same context does not call the model again. The email
+and resume windows also have a Regenerate action, which passes
+refresh=True: the model is called and its answer replaces the cached one.
+
+    data/cache/<key>.json   {"kind": ..., "created": ..., "value": {...}}
+
+Eviction is LRU by file mtime (a hit touches the file) once the cache
+grows past MAX_ENTRIES or MAX_BYTES; entries older than TTL_SECONDS count
+as misses and are removed.
+
+    result = ai_cache.cached_call("parse_job_ad", parse_job_ad, raw)
+
+Set JOBHOUND_AI_CACHE=0 to bypass the cache entirely.
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+
+from app_paths import DATA_DIR
+import tracing
+
+CACHE_DIR = DATA_DIR / "cache"
+
+# Bump when the prompts change so old answers are not served again
+CACHE_VERSION = 1
+
+MAX_ENTRIES = 500
+MAX_BYTES = 20 * 1024 * 1024
+TTL_SECONDS = 30 * 24 * 3600
+
+ENABLED = os.environ.get("JOBHOUND_AI_CACHE", "1").strip() not in ("0", "false", "no", "")
+
+
+#----------------------------------------------------------------------
+# Key
+def _normalize(value):
+    if isinstance(value, dict):
+        return {str(k): _normalize(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_normalize(v) for v in value]
+    if isinstance(value, str):
+        lines = value.replace("\r\n", "\n").replace("\r", "\n").split("\n")
+        return "\n".join(line.rstrip() for line in lines).strip()
+    return value
+
+
+def make_key(kind: str, payload) -> str:
+    blob = json.dumps(
+        [CACHE_VERSION, kind, _normalize(payload)],
+        sort_keys=True,
+        ensure_ascii=False,
+        default=str,
+    )
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+#----------------------------------------------------------------------
+# AiCache
+class AiCache:
+    def __init__(self, cache_dir=CACHE_DIR, max_entries=MAX_ENTRIES,
+                 max_bytes=MAX_BYTES, ttl_seconds=TTL_SECONDS):
+        self.cache_dir = cache_dir
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+
+        # Workers from task_runner call in concurrently
+        self._lock = threading.Lock()
+        self._entries = None   # key -> (last_used, size), built lazily from disk
+        self._total_bytes = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.counters = {}     # kind -> {"hits": n, "misses": n}
+
+    # ------------------------------------------------------------------
+    def get(self, kind: str, key: str):
+        """Cached value or None (expired entries are dropped)."""
+        path = self.cache_dir / f"{key}.json"
+        with self._lock:
+            self._ensure_index()
+            if key not in self._entries:
+                self._count(kind, hit=False)
+                return None
+
+            try:
+                entry = json.loads(path.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                self._drop(key)
+                self._count(kind, hit=False)
+                return None
+
+            if time.time() - entry.get("created", 0) > self.ttl_seconds:
+                self._drop(key)
+                self._count(kind, hit=False)
+                return None
+
+            now = time.time()
+            try:
+                os.utime(path, (now, now))
+            except OSError:
+                pass
+            self._entries[key] = (now, self._entries[key][1])
+            self._count(kind, hit=True)
+            return entry.get("value")
+
+    def put(self, kind: str, key: str, value):
+        data = json.dumps(
+            {"kind": kind, "created": time.time(), "value": value},
+            ensure_ascii=False,
+        ).encode("utf-8")
+
+        path = self.cache_dir / f"{key}.json"
+        tmp_path = self.cache_dir / f"{key}.json.tmp"
+        with self._lock:
+            self._ensure_index()
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            tmp_path.write_bytes(data)
+            os.replace(tmp_path, path)
+
+            if key in self._entries:
+                self._total_bytes -= self._entries[key][1]
+            self._entries[key] = (time.time(), len(data))
+            self._total_bytes += len(data)
+            self._evict()
+
+    def clear(self):
+        with self._lock:
+            self._ensure_index()
+            for key in list(self._entries):
+                self._drop(key)
+
+    def stats(self) -> dict:
+        with self._lock:
+            self._ensure_index()
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "entries": len(self._entries),
+                "bytes": self._total_bytes,
+                "by_kind": {k: dict(v) for k, v in self.counters.items()},
+            }
+
+    # ------------------------------------------------------------------
+    def _ensure_index(self):
+        if self._entries is not None:
+            return
+
+        self._entries = {}
+        self._total_bytes = 0
+        if not self.cache_dir.exists():
+            return
+
+        for p in self.cache_dir.glob("*.json"):
+            try:
+                st = p.stat()
+            except OSError:
+                continue
+            self._entries[p.stem] = (st.st_mtime, st.st_size)
+            self._total_bytes += st.st_size
+
+    def _evict(self):
+        if len(self._entries) <= self.max_entries and self._total_bytes <= self.max_bytes:
+            return
+
+        # Least recently used first
+        for key in sorted(self._entries, key=lambda k: self._entries[k][0]):
+            if len(self._entries) <= self.max_entries and self._total_bytes <= self.max_bytes:
+                break
+            self._drop(key)
+
+    def _drop(self, key):
+        _, size = self._entries.pop(key, (0, 0))
+        self._total_bytes -= size
+        try:
+            (self.cache_dir / f"{key}.json").unlink()
+        except OSError:
+            pass
+
+    def _count(self, kind, hit: bool):
+        counter = self.counters.setdefault(kind, {"hits": 0, "misses": 0})
+        if hit:
+            self.hits += 1
+            counter["hits"] += 1
+        else:
+            self.misses += 1
+            counter["misses"] += 1
+
+
+#----------------------------------------------------------------------
+# cached_call
+_CACHE = None
+
+
+def get_cache() -> AiCache:
+    global _CACHE
+    if _CACHE is None:
+        _CACHE = AiCache()
+    return _CACHE
+
+
+def lookup(kind: str, payload):
+    """Cached value for payload, or None (also when the cache is off)."""
+    if not ENABLED:
+        return None
+    return get_cache().get(kind, make_key(kind, payload))
+
+
+def store(kind: str, payload, value):
+    """Cache a value produced outside cached_call (e.g. a streamed answer)."""
+    if not ENABLED or value is None:
+        return
+    try:
+        get_cache().put(kind, make_key(kind, payload), value)
+    except (OSError, TypeError, ValueError) as e:
+        print("Error writing AI cache:", e)
+
+
+def cached_call(kind: str, fn, payload, refresh: bool = False):
+    """
+    Return fn(payload), served from the cache when the same normalized
+    payload was seen before. refresh=True always calls fn (and re-caches).
+    Exceptions are not cached.
+    """
+    if not ENABLED:
+        with tracing.span(
+            f"ai.{kind}",
+            in_size=tracing.payload_size(payload),
+            in_tokens=tracing.estimate_tokens(payload),
+            cached=False,
+        ) as s:
+            value = fn(payload)
+            s.set("out_tokens", tracing.estimate_tokens(value))
+            return value
+
+    cache = get_cache()
+    key = make_key(kind, payload)
+
+    if not refresh:
+        value = cache.get(kind, key)
+        if value is not None:
+            return value
+
+    with tracing.span(
+        f"ai.{kind}",
+        in_size=tracing.payload_size(payload),
+        in_tokens=tracing.estimate_tokens(payload),
+    ) as s:
+        value = fn(payload)
+        s.set("out_size", tracing.payload_size(value))
+        s.set("out_tokens", tracing.estimate_tokens(value))
+    if value is not None:
+        try:
+            cache.put(kind, key, value)
+        except (OSError, TypeError, ValueError) as e:
+            # A cache write failure must never lose the model's answer
+            print("Error writing AI cache:", e)
+    return value
@@ -0,0 +1,149 @@
+# ai_stream.py
+"""
+Stream AI output into the UI as it is generated.
+
+    task = ai_stream.start(
+        widget, "application_email", context,
+        stream_fn=getattr(email_service, "stream_application_email", None),
+        fallback_fn=email_service.generate_application_email,
+        assemble=ai_stream.assemble_email, to_text=ai_stream.email_text,
+        on_text=append_to_body, on_done=..., on_error=...,
+        refresh=False,  # True (Regenerate): skip the cached answer
+    )
+    task.cancel()   # stop: no more callbacks, the stream is closed
+
+stream_fn(payload) is a generator run on a task_runner worker thread.
+It yields str chunks of text, and may also yield dicts of final fields
+(e.g. {"subject": ...}). Each str chunk goes through the runner's
+thread-safe event queue (TaskHandle.report) and reaches on_text(chunk)
+on the Tk thread within one poll interval, so text shows up while the
+model is still writing. At the end assemble(text, fields) builds the
+same value the non-streaming call would have returned. That value is
+passed to on_done and stored in ai_cache under the same key.
+
+A cached answer is delivered at once: on_text(whole text), then on_done.
+refresh=True skips the cache lookup (a fresh answer is generated and
+re-cached).
+Without a stream_fn (the service has no streaming API), fallback_fn runs
+through ai_cache.cached_call on the worker thread, and its text is passed
+to on_text once it arrives. Neither email_service nor ai_service has a
+stream_* function yet, so for now every generation takes that path: the
+UI stays responsive and can cancel, but the text shows up in one piece.
+Callers should keep their previous text until the first on_text call.
+"""
+import json
+import time
+
+import ai_cache
+import task_runner
+import tracing
+
+
+#----------------------------------------------------------------------
+# Assemblers: (streamed text, extra fields) -> value
+def assemble_email(text: str, fields: dict) -> dict:
+    return {
+        "subject": fields.get("subject", ""),
+        "body": fields.get("body") or text,
+    }
+
+
+def email_text(value) -> str:
+    return (value or {}).get("body", "")
+
+
+def assemble_json(text: str, fields: dict):
+    """Streamed JSON document (e.g. the resume structure)."""
+    if fields:
+        return fields
+    text = text.strip()
+    # Models sometimes wrap JSON in a ``` fence
+    if text.startswith("```"):
+        text = text.split("\n", 1)[1] if "\n" in text else ""
+        text = text.rsplit("```", 1)[0]
+    return json.loads(text)
+
+
+def json_text(value) -> str:
+    return json.dumps(value, ensure_ascii=False, indent=2)
+
+
+#----------------------------------------------------------------------
+# Worker
+def _run(kind, payload, stream_fn, fallback_fn, assemble, to_text, refresh, task):
+    cached = None if refresh else ai_cache.lookup(kind, payload)
+    if cached is not None:
+        task.report(to_text(cached))
+        return cached
+
+    if stream_fn is None:
+        value = ai_cache.cached_call(kind, fallback_fn, payload, refresh=refresh)
+        if not task.cancelled:
+            task.report(to_text(value))
+        return value
+
+    parts = []
+    fields = {}
+    with tracing.span(
+        f"ai.{kind}",
+        streamed=True,
+        in_size=tracing.payload_size(payload),
+        in_tokens=tracing.estimate_tokens(payload),
+    ) as s:
+        t0 = time.perf_counter()
+        stream = stream_fn(payload)
+        try:
+            for chunk in stream:
+                if task.cancelled:
+                    s.set("cancelled", True)
+                    return None
+                if isinstance(chunk, dict):
+                    fields.update(chunk)
+                    continue
+                if not parts:
+                    s.set("first_text_ms", round((time.perf_counter() - t0) * 1000, 1))
+                parts.append(chunk)
+                task.report(chunk)
+        finally:
+            close = getattr(stream, "close", None)
+            if close is not None:
+                close()
+
+        text = "".join(parts)
+        s.set("out_tokens", tracing.estimate_tokens(text))
+
+    value = assemble(text, fields)
+    ai_cache.store(kind, payload, value)
+    return value
+
+
+def start(
+    widget,
+    kind: str,
+    payload,
+    stream_fn,
+    fallback_fn,
+    assemble,
+    to_text,
+    on_text,
+    on_done,
+    on_error,
+    refresh: bool = False,
+) -> task_runner.TaskHandle:
+    """Start generating; callbacks run on the Tk thread. Returns the task."""
+    runner = task_runner.get_runner(widget)
+    return runner.submit(
+        _run,
+        kind,
+        payload,
+        stream_fn,
+        fallback_fn,
+        assemble,
+        to_text,
+        refresh,
+        pass_task=True,
+        on_progress=on_text,
+        on_done=on_done,
+        on_error=on_error,
+        name=f"ai_stream[{kind}]",
+    )
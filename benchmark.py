@@ -0,0 +1,261 @@
+# benchmark.py
+"""
+Benchmark model load/save and main-sheet row construction at scale.
+
+    python benchmark.py                          # 1k / 10k / 100k hunts, csv
+    python benchmark.py --sizes 1000,5000 --backend sqlite --out bench.json
+
+Synthetic data (N hunts, N/5 companies, K reminders + K progress per hunt,
+realistic description lengths) is written to a temporary data directory;
+the real DATA_DIR is never touched. Results are one JSON document so runs
+from different commits can be diffed or compared by script.
+
+Timed operations per size (best and median of --repeat runs, in ms):
+  save_all          write all four entities
+  load              load_hunt/company/reminder/progress
+  save_unchanged    save_all again with nothing changed
+  build_rows        every display row (derived columns included)
+  build_rows_lazy   every display row, derived columns left for later
+  edit_refresh      edit one hunt, touch the index, rebuild that row, save
+  delete_refresh    delete one hunt through the repository, save
+"""
+import argparse
+import json
+import platform
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+import model as m
+import repository
+import hunt_display as hd
+
+DEFAULT_SIZES = [1_000, 10_000, 100_000]
+DEFAULT_REPEAT = 3
+
+WORDS = (
+    "we are looking for an experienced engineer to join our team you will "
+    "design build and maintain services work closely with product and "
+    "customers requirements include strong communication skills python sql "
+    "cloud experience agile delivery ownership mentoring benefits include "
+    "health insurance flexible hours hybrid work annual bonus training budget"
+).split()
+
+INDUSTRIES = ["Software", "Finance", "Retail", "Logistics", "Healthcare", "Energy"]
+ARRANGEMENTS = ["On-site", "Hybrid", "Remote"]
+STATUSES = ["Applied", "Interview", "Offer", "Rejected", "Ghosted"]
+
+
+#----------------------------------------------------------------------
+# Synthetic data
+def _text(rng, chars):
+    words = []
+    length = 0
+    while length < chars:
+        w = rng.choice(WORDS)
+        words.append(w)
+        length += len(w) + 1
+    return " ".join(words)
+
+
+def generate(n_hunts, n_companies=None, per_hunt=2, desc_chars=1500, seed=1):
+    """Return (hunt_rows, company_rows, reminder_rows, progress_rows)."""
+    rng = random.Random(seed)
+    n_companies = n_companies or max(1, n_hunts // 5)
+
+    companies = []
+    for i in range(n_companies):
+        companies.append([
+            f"c{i:08d}",
+            f"Company {i}",
+            rng.choice(INDUSTRIES),
+            _text(rng, 200),
+            rng.choice(["Yes", "No"]),
+            f"{i} Example Street",
+            f"https://company{i}.example",
+            str(rng.randint(1, 5)),
+            f"+60 {rng.randint(1000000, 9999999)}",
+            f"hr@company{i}.example",
+        ])
+
+    hunts, reminders, progress = [], [], []
+    for i in range(n_hunts):
+        hunt_id = f"h{i:08d}"
+        base = rng.randint(3, 15) * 1000
+        hunts.append([
+            hunt_id,
+            f"Engineer {i}",
+            _text(rng, rng.randint(desc_chars // 2, desc_chars * 3 // 2)),
+            rng.choice(["LinkedIn", "JobStreet", "Referral"]),
+            str(base),
+            str(base + rng.randint(1, 5) * 1000),
+            str(base + 2000),
+            str(base + 3000),
+            "MYR",
+            "1.5",
+            rng.choice(ARRANGEMENTS),
+            rng.choice(["Yes", "No"]),
+            companies[rng.randrange(n_companies)][0],
+        ])
+        for k in range(per_hunt):
+            day = f"2025-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d} 09:00"
+            reminders.append([
+                f"r{i:08d}{k}", hunt_id, day,
+                rng.choice(["Pending", "Done"]), _text(rng, 60),
+            ])
+            progress.append([
+                f"p{i:08d}{k}", hunt_id, day,
+                rng.choice(STATUSES), _text(rng, 60),
+            ])
+
+    return hunts, companies, reminders, progress
+
+
+#----------------------------------------------------------------------
+# Isolated data directory
+@contextmanager
+def temp_data_dir(backend):
+    """Point model at a throwaway directory (and backend) for the duration."""
+    names = ("HUNT_CSV", "COMPANY_CSV", "REMINDER_CSV", "PROGRESS_CSV", "SQLITE_DB")
+    saved = {name: getattr(m, name) for name in names}
+    saved_backend = m.STORAGE_BACKEND
+
+    tmp = Path(tempfile.mkdtemp(prefix="jobhound-bench-"))
+    try:
+        for name in names:
+            setattr(m, name, tmp / saved[name].name)
+        m.set_storage_backend(backend)
+        yield tmp
+    finally:
+        m.set_storage_backend(saved_backend)
+        for name, value in saved.items():
+            setattr(m, name, value)
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+#----------------------------------------------------------------------
+# Timing
+def _time(fn, repeat, setup=None):
+    samples = []
+    for _ in range(repeat):
+        state = setup() if setup else None
+        start = time.perf_counter()
+        fn(state) if setup else fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return {
+        "best_ms": round(min(samples), 2),
+        "median_ms": round(statistics.median(samples), 2),
+    }
+
+
+def _load_all():
+    return m.load_hunt(), m.load_company(), m.load_reminder(), m.load_progress()
+
+
+def bench_size(n, backend, repeat, per_hunt, desc_chars):
+    data = generate(n, per_hunt=per_hunt, desc_chars=desc_chars)
+    result = {"hunts": n, "companies": len(data[1]), "reminders": len(data[2])}
+
+    with temp_data_dir(backend) as tmp:
+        # save_all on a fresh directory each time (first save)
+        def fresh_save():
+            m.set_storage_backend(backend)
+            for p in tmp.iterdir():
+                p.unlink()
+            return data
+
+        result["save_all"] = _time(lambda d: m.save_all(*d), repeat, setup=fresh_save)
+        result["bytes_on_disk"] = sum(p.stat().st_size for p in tmp.iterdir())
+
+        result["load"] = _time(_load_all, repeat)
+        result["save_unchanged"] = _time(lambda: m.save_all(*data), repeat)
+
+        rows = _load_all()
+        repo = repository.Repository(*[list(r) for r in rows])
+
+        result["build_rows"] = _time(lambda: hd.build_hunt_display_rows(repo), repeat)
+        result["build_rows_lazy"] = _time(
+            lambda: hd.build_hunt_display_rows(repo, derived=False), repeat
+        )
+
+        title_idx = m.HUNT_FIELDS.index("jobTitle")
+
+        def edit_refresh():
+            r = len(repo.hunts.rows) // 2
+            row = repo.hunts.rows[r]
+            row[title_idx] = row[title_idx] + "*"
+            repo.hunts.touch(row)
+            hd.build_hunt_display_row(row, repo)
+            m.save_all(repo.hunts.rows, repo.companies.rows,
+                       repo.reminders.rows, repo.progress.rows)
+
+        result["edit_refresh"] = _time(edit_refresh, repeat)
+
+        def delete_refresh():
+            repo.hunts.delete_at(len(repo.hunts.rows) // 2)
+            m.save_all(repo.hunts.rows, repo.companies.rows,
+                       repo.reminders.rows, repo.progress.rows)
+
+        result["delete_refresh"] = _time(delete_refresh, repeat)
+
+    return result
+
+
+#----------------------------------------------------------------------
+# main
+def _git_commit():
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, cwd=Path(__file__).parent, timeout=10,
+        )
+        return out.stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="JobHound model/display benchmark")
+    parser.add_argument("--sizes", default=",".join(str(s) for s in DEFAULT_SIZES),
+                        help="comma-separated hunt counts")
+    parser.add_argument("--backend", default="csv", choices=m.STORAGE_BACKENDS)
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT)
+    parser.add_argument("--per-hunt", type=int, default=2,
+                        help="reminders and progress rows per hunt")
+    parser.add_argument("--desc-chars", type=int, default=1500,
+                        help="average job description length")
+    parser.add_argument("--out", help="write JSON here instead of stdout")
+    args = parser.parse_args(argv)
+
+    sizes = [int(s) for s in args.sizes.split(",") if s.strip()]
+
+    report = {
+        "commit": _git_commit(),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "backend": args.backend,
+        "repeat": args.repeat,
+        "results": [],
+    }
+    for n in sizes:
+        print(f"benchmarking {n} hunts ({args.backend})...", file=sys.stderr)
+        report["results"].append(
+            bench_size(n, args.backend, args.repeat, args.per_hunt, args.desc_chars)
+        )
+
+    text = json.dumps(report, indent=2)
+    if args.out:
+        Path(args.out).write_text(text + "\n", encoding="utf-8")
+    else:
+        print(text)
+
+
+#Only run the benchmark if this file is executed directly, NOT if it is imported.
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,278 @@
+# company_match.py
+"""
+Fuzzy company-name lookup.
+
+Names are normalized (case-folded, punctuation dropped, legal suffixes
+such as "Sdn Bhd" / "Pte Ltd" / "Inc" removed), so "K3 Capital Group" and
+"K3 CAPITAL GROUP SDN. BHD." are the same key. Each normalized name is cut
+into character trigrams, padded so the first trigrams mark the start of
+the name, and kept in an inverted index:
+
+    postings[trigram] -> {company_id}
+
+A query counts shared trigrams over the postings of its own trigrams only,
+then ranks the names sharing the most by Dice similarity
+(2 * shared / (|a| + |b|)). Names that start with the query rank first,
+which is what autocomplete wants.
+
+    matcher = repo.company_matcher
+    matcher.matches("k3 cap")        # [(row, score)], best first
+    matcher.resolve("K3 Capital Group Sdn Bhd")   # row or None
+
+resolve() is the auto-link rule: an exact normalized match, else the
+highest-scoring name (by score alone, prefix or not) when it scores at
+least AUTO_LINK_SCORE and beats the runner-up by AUTO_LINK_MARGIN; an
+ambiguous name links to nothing. A name that only adds or drops whole
+words ("Axiata Digital" / "Axiata Digital Labs") is another company, not
+a misspelling, and is never auto-linked. The companies table listener marks
+changed companies stale; they are re-indexed on the next query.
+
+bind_company_autocomplete() wires matches() into a company-name Combobox
+(NewHuntWindow, SingleCompanyWindow).
+"""
+import re
+from collections import Counter
+from itertools import chain
+
+import model as m
+import tracing
+
+# Minimum Dice score for resolve() to link a name to an existing company
+AUTO_LINK_SCORE = 0.85
+
+# ... and by at least this much more than the next best company
+AUTO_LINK_MARGIN = 0.1
+
+# Minimum Dice score for matches() (prefix matches are always included)
+MIN_MATCH_SCORE = 0.3
+
+# Names (by shared trigrams) scored per query, at least
+CANDIDATES = 50
+
+# Suggestions shown in a company-name dropdown while typing
+AUTOCOMPLETE_LIMIT = 15
+
+# Keys that move around the dropdown rather than change the text
+_NAVIGATION_KEYS = {"Up", "Down", "Left", "Right", "Return", "Escape", "Tab", "Home", "End"}
+
+# Trailing words dropped by normalize_name(), longest first
+LEGAL_SUFFIXES = [
+    ("sdn", "bhd"),
+    ("pte", "ltd"),
+    ("pvt", "ltd"),
+    ("pty", "ltd"),
+    ("co", "ltd"),
+    ("berhad",),
+    ("bhd",),
+    ("ltd",),
+    ("limited",),
+    ("inc",),
+    ("incorporated",),
+    ("llc",),
+    ("llp",),
+    ("plc",),
+    ("corp",),
+    ("corporation",),
+    ("gmbh",),
+    ("ag",),
+    ("sa",),
+    ("bv",),
+    ("co",),
+]
+
+_WORD_RE = re.compile(r"\w+")
+_NAME_IDX = m.COMPANY_FIELDS.index("name")
+
+
+def normalize_name(name: str) -> str:
+    """'K3 Capital Group Sdn. Bhd.' -> 'k3 capital group'."""
+    words = _WORD_RE.findall((name or "").casefold())
+    stripped = True
+    while stripped and len(words) > 1:
+        stripped = False
+        for suffix in LEGAL_SUFFIXES:
+            n = len(suffix)
+            if len(words) > n and tuple(words[-n:]) == suffix:
+                del words[-n:]
+                stripped = True
+                break
+    return " ".join(words)
+
+
+def trigrams(normalized: str) -> set:
+    padded = f"  {normalized} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def _row_name(row):
+    return row[_NAME_IDX] if len(row) > _NAME_IDX else ""
+
+
+#----------------------------------------------------------------------
+# CompanyMatcher
+class CompanyMatcher:
+    def __init__(self, companies):
+        """companies is the repository._Table of company rows."""
+        self.companies = companies
+
+        self._norm = {}       # company_id -> normalized name
+        self._grams = {}      # company_id -> trigram set
+        self._postings = {}   # trigram -> {company_id}
+        self._by_norm = {}    # normalized name -> {company_id}
+
+        self._stale = set()
+        self._stale_all = True
+
+        companies.add_listener(self._on_companies_changed)
+
+    def _on_companies_changed(self, keys):
+        if keys is None:
+            self._stale_all = True
+        else:
+            self._stale.add(keys.get("id"))
+
+    # ------------------------------------------------------------------
+    # Index maintenance
+    # ------------------------------------------------------------------
+    def _add(self, company_id, name):
+        norm = normalize_name(name)
+        if not norm:
+            return
+        grams = trigrams(norm)
+        self._norm[company_id] = norm
+        self._grams[company_id] = grams
+        self._by_norm.setdefault(norm, set()).add(company_id)
+        for gram in grams:
+            self._postings.setdefault(gram, set()).add(company_id)
+
+    def _remove(self, company_id):
+        norm = self._norm.pop(company_id, None)
+        if norm is None:
+            return
+        for gram in self._grams.pop(company_id):
+            bucket = self._postings[gram]
+            bucket.discard(company_id)
+            if not bucket:
+                del self._postings[gram]
+        bucket = self._by_norm[norm]
+        bucket.discard(company_id)
+        if not bucket:
+            del self._by_norm[norm]
+
+    def rebuild(self):
+        with tracing.span("company_match.rebuild", companies=len(self.companies.rows)):
+            self._stale_all = False
+            self._stale.clear()
+            self._norm, self._grams, self._postings, self._by_norm = {}, {}, {}, {}
+
+            id_idx = self.companies.id_idx
+            for row in self.companies.rows:
+                if len(row) > id_idx and row[id_idx]:
+                    self._add(row[id_idx], _row_name(row))
+
+    def refresh(self):
+        if self._stale_all:
+            self.rebuild()
+            return
+
+        stale, self._stale = self._stale, set()
+        for company_id in stale:
+            if not company_id:
+                continue
+            self._remove(company_id)
+            row = self.companies.get(company_id)
+            if row is not None:
+                self._add(company_id, _row_name(row))
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+    def _scored(self, norm, limit):
+        """[(prefix, score, company_id)] for the names sharing the most trigrams."""
+        with tracing.span("company_match.query") as s:
+            self.refresh()
+
+            grams = trigrams(norm)
+            postings = self._postings
+            shared = Counter(chain.from_iterable(postings[g] for g in grams if g in postings))
+
+            # Only the names sharing the most trigrams can rank high (prefix
+            # matches share all but the query's last one); scoring just those
+            # keeps large, similar-looking company lists fast
+            scored = []
+            for company_id, count in shared.most_common(max(limit * 5, CANDIDATES)):
+                score = 2 * count / (len(grams) + len(self._grams[company_id]))
+                prefix = self._norm[company_id].startswith(norm)
+                if prefix or score >= MIN_MATCH_SCORE:
+                    scored.append((prefix, score, company_id))
+            s.set("candidates", len(shared))
+        return scored
+
+    def matches(self, name, limit=10):
+        """Companies resembling name: [(row, score)], prefix matches first, then by score."""
+        norm = normalize_name(name)
+        if not norm:
+            return []
+
+        ranked = self._scored(norm, limit)
+        ranked.sort(key=lambda item: (not item[0], -item[1]))
+
+        result = []
+        for _, score, company_id in ranked[:limit]:
+            row = self.companies.get(company_id)
+            if row is not None:
+                result.append((row, score))
+        return result
+
+    def resolve(self, name):
+        """The existing company a (typed / parsed) name most likely means, or None."""
+        norm = normalize_name(name)
+        if not norm:
+            return None
+
+        self.refresh()
+        exact = self._by_norm.get(norm)
+        if exact:
+            # Prefer the first such company in list order
+            rows = [self.companies.get(company_id) for company_id in exact]
+            rows = [row for row in rows if row is not None]
+            if rows:
+                return min(rows, key=lambda row: self.companies.index_of(row[self.companies.id_idx]) or 0)
+
+        # By score alone: matches() puts prefix hits first, which suits the
+        # dropdown but would let a longer name win over a closer one
+        ranked = sorted(self._scored(norm, 2), key=lambda item: -item[1])
+        if not ranked or ranked[0][1] < AUTO_LINK_SCORE:
+            return None
+        if len(ranked) > 1 and ranked[0][1] - ranked[1][1] < AUTO_LINK_MARGIN:
+            # Two companies fit about equally well: let the user pick
+            return None
+
+        company_id = ranked[0][2]
+        words, other = set(norm.split()), set(self._norm[company_id].split())
+        if words != other and (words <= other or other <= words):
+            return None
+        return self.companies.get(company_id)
+
+
+#----------------------------------------------------------------------
+# Combobox autocomplete
+def bind_company_autocomplete(combobox, controller):
+    """
+    Narrow a company-name Combobox's dropdown to the existing companies
+    that best match what has been typed (fuzzy, via repo.match_companies).
+    """
+    import repository  # imports this module; resolved at call time
+
+    def on_key(event):
+        if event.keysym in _NAVIGATION_KEYS:
+            return
+        repo = repository.for_controller(controller)
+        text = combobox.get().strip()
+        if text:
+            names = [_row_name(row) for row, _ in repo.match_companies(text, AUTOCOMPLETE_LIMIT)]
+        else:
+            names = repo.company_names()
+        combobox["values"] = names
+
+    combobox.bind("<KeyRelease>", on_key, add="+")
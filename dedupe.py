@@ -0,0 +1,378 @@
+# dedupe.py
+"""
+Near-duplicate detection for hunts (the same ad reposted on job boards).
+
+Each hunt's job title + description is cut into word shingles (runs of
+SHINGLE_WORDS words) and summarised by a MinHash signature of NUM_BINS
+values. The signature is split into BANDS bands; hunts sharing any band
+land in the same LSH bucket and become candidates, so checking a new hunt
+costs a few dict lookups instead of a comparison with every row.
+Candidates are then confirmed with the exact Jaccard similarity of their
+shingle sets (>= DUPLICATE_THRESHOLD). Hunts linked to two different
+companies are never duplicates.
+
+Signatures use one-permutation hashing: every shingle is hashed once, the
+low bits pick a bin and each bin keeps its smallest value. Empty bins
+(short texts) borrow the next non-empty bin's value, tagged with the
+distance, so two texts still only agree on a bin when their shingles do.
+This is about as accurate as NUM_BINS separate permutations for this
+purpose, at the cost of one hash per shingle.
+
+    index = repo.duplicates
+    index.rebuild_async(runner)              # once at startup
+    index.check(title, description, company_id)   # [(hunt_id, similarity)]
+    index.duplicate_groups()                 # [[hunt_id, ...], ...]
+
+Like search_index, the hunts table listener only marks hunts stale; they
+are re-fingerprinted on the next query.
+"""
+import model as m
+import tracing
+from search_index import tokenize
+
+SHINGLE_WORDS = 3
+
+# Signature size (power of two) and its split into LSH bands
+NUM_BINS = 64
+BANDS = 16
+ROWS_PER_BAND = NUM_BINS // BANDS
+
+# Exact shingle Jaccard at or above which two hunts count as duplicates
+DUPLICATE_THRESHOLD = 0.7
+
+_BIN_BITS = NUM_BINS.bit_length() - 1
+_HASH_MASK = (1 << 64) - 1
+_VALUE_BITS = 64 - _BIN_BITS
+
+_TITLE_IDX = m.HUNT_FIELDS.index("jobTitle")
+_DESC_IDX = m.HUNT_FIELDS.index("jobDescription")
+_COMPANY_IDX = m.HUNT_FIELDS.index("companyId")
+
+
+#----------------------------------------------------------------------
+# Fingerprints
+def shingles(title: str, description: str) -> set:
+    """Hashed word shingles of a hunt's text (the whole text if shorter)."""
+    words = tokenize(f"{title or ''}\n{description or ''}")
+    if not words:
+        return set()
+    if len(words) < SHINGLE_WORDS:
+        return {hash(tuple(words)) & _HASH_MASK}
+    n = SHINGLE_WORDS
+    return {hash(tuple(words[i:i + n])) & _HASH_MASK for i in range(len(words) - n + 1)}
+
+
+def signature(shingle_set) -> tuple:
+    """One-permutation MinHash of a shingle set (None when it is empty)."""
+    if not shingle_set:
+        return None
+
+    mask = NUM_BINS - 1
+    bins = [None] * NUM_BINS
+    for h in shingle_set:
+        b = h & mask
+        v = h >> _BIN_BITS
+        current = bins[b]
+        if current is None or v < current:
+            bins[b] = v
+
+    # Densify: an empty bin takes the next filled bin's value (circularly)
+    if None in bins:
+        filled = [b for b in range(NUM_BINS) if bins[b] is not None]
+        dense = list(bins)
+        for b in range(NUM_BINS):
+            if bins[b] is None:
+                nxt = next((f for f in filled if f > b), filled[0])
+                distance = (nxt - b) % NUM_BINS
+                dense[b] = bins[nxt] | (distance << _VALUE_BITS)
+        bins = dense
+
+    return tuple(bins)
+
+
+def band_keys(sig):
+    """LSH bucket keys of a signature: (band number, band values)."""
+    r = ROWS_PER_BAND
+    return [(i, sig[i * r:(i + 1) * r]) for i in range(BANDS)]
+
+
+def jaccard(a: set, b: set) -> float:
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+def _row_text(row):
+    title = row[_TITLE_IDX] if len(row) > _TITLE_IDX else ""
+    desc = row[_DESC_IDX] if len(row) > _DESC_IDX else ""
+    return title, desc
+
+
+def _row_company(row):
+    return row[_COMPANY_IDX] if len(row) > _COMPANY_IDX else ""
+
+
+def build_signatures(docs):
+    """[(hunt_id, title, description)] -> {hunt_id: signature}. Thread-safe."""
+    sigs = {}
+    for hunt_id, title, desc in docs:
+        sig = signature(shingles(title, desc))
+        if sig is not None:
+            sigs[hunt_id] = sig
+    return sigs
+
+
+#----------------------------------------------------------------------
+# DuplicateIndex
+class DuplicateIndex:
+    def __init__(self, hunts):
+        """hunts is the repository._Table of hunt rows."""
+        self.hunts = hunts
+
+        self._sigs = {}      # hunt_id -> signature
+        self._buckets = {}   # band key -> {hunt_id}
+
+        self._stale = set()
+        self._stale_all = True
+        self.building = False
+
+        hunts.add_listener(self._on_hunts_changed)
+
+    def _on_hunts_changed(self, keys):
+        if keys is None:
+            self._stale_all = True
+        else:
+            self._stale.add(keys.get("id"))
+
+    @property
+    def needs_rebuild(self) -> bool:
+        return self._stale_all
+
+    # ------------------------------------------------------------------
+    # Building
+    # ------------------------------------------------------------------
+    def _collect_docs(self):
+        id_idx = self.hunts.id_idx
+        docs = []
+        for row in self.hunts.rows:
+            if len(row) > id_idx and row[id_idx]:
+                docs.append((row[id_idx],) + _row_text(row))
+        return docs
+
+    def _install(self, sigs):
+        self._sigs = {}
+        self._buckets = {}
+        for hunt_id, sig in sigs.items():
+            self._add(hunt_id, sig)
+
+    def _add(self, hunt_id, sig):
+        self._sigs[hunt_id] = sig
+        for key in band_keys(sig):
+            self._buckets.setdefault(key, set()).add(hunt_id)
+
+    def _remove(self, hunt_id):
+        sig = self._sigs.pop(hunt_id, None)
+        if sig is None:
+            return
+        for key in band_keys(sig):
+            bucket = self._buckets.get(key)
+            if bucket is not None:
+                bucket.discard(hunt_id)
+                if not bucket:
+                    del self._buckets[key]
+
+    def rebuild(self):
+        """Fingerprint every hunt now (on the calling thread)."""
+        with tracing.span("dedupe.rebuild", hunts=len(self.hunts.rows)):
+            self._stale_all = False
+            self._stale.clear()
+            self._install(build_signatures(self._collect_docs()))
+
+    def rebuild_async(self, runner, on_ready=None):
+        """Fingerprint on a task_runner worker; edits meanwhile are marked stale."""
+        self._stale_all = False
+        self._stale.clear()
+        docs = self._collect_docs()
+        self.building = True
+
+        def done(sigs):
+            self.building = False
+            self._install(sigs)
+            if on_ready is not None:
+                on_ready()
+
+        def failed(e):
+            self.building = False
+            self._stale_all = True
+            print("Error building duplicate index:", e)
+
+        runner.submit(
+            tracing.traced("dedupe.rebuild")(build_signatures),
+            docs,
+            on_done=done,
+            on_error=failed,
+            name="dedupe.rebuild",
+        )
+
+    def refresh(self):
+        """Apply pending changes (called before every query)."""
+        if self.building:
+            return
+        if self._stale_all:
+            self.rebuild()
+            return
+
+        stale, self._stale = self._stale, set()
+        for hunt_id in stale:
+            if not hunt_id:
+                continue
+            self._remove(hunt_id)
+            row = self.hunts.get(hunt_id)
+            if row is not None:
+                sig = signature(shingles(*_row_text(row)))
+                if sig is not None:
+                    self._add(hunt_id, sig)
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+    def _candidates(self, sig):
+        found = set()
+        for key in band_keys(sig):
+            bucket = self._buckets.get(key)
+            if bucket:
+                found |= bucket
+        return found
+
+    def check(self, title, description, company_id="", exclude=None):
+        """
+        Existing hunts that look like a duplicate of this text:
+        [(hunt_id, similarity)], most similar first. Empty while the index
+        is still being built.
+        """
+        shingle_set = shingles(title, description)
+        sig = signature(shingle_set)
+        if sig is None:
+            return []
+
+        with tracing.span("dedupe.check") as s:
+            self.refresh()
+            candidates = self._candidates(sig)
+            candidates.discard(exclude)
+            s.set("candidates", len(candidates))
+
+            matches = []
+            for hunt_id in candidates:
+                row = self.hunts.get(hunt_id)
+                if row is None:
+                    continue
+                other_company = _row_company(row)
+                if company_id and other_company and company_id != other_company:
+                    continue
+                similarity = jaccard(shingle_set, shingles(*_row_text(row)))
+                if similarity >= DUPLICATE_THRESHOLD:
+                    matches.append((hunt_id, similarity))
+
+        matches.sort(key=lambda item: -item[1])
+        return matches
+
+    def duplicate_groups(self):
+        """
+        Groups of existing hunts that are duplicates of each other, each in
+        hunt list order (so the first is the oldest); singletons left out.
+        """
+        with tracing.span("dedupe.groups") as s:
+            self.refresh()
+
+            parent = {}
+
+            def find(x):
+                while parent.get(x, x) != x:
+                    x = parent[x]
+                return x
+
+            shingle_cache = {}
+
+            def shingles_of(hunt_id):
+                cached = shingle_cache.get(hunt_id)
+                if cached is None:
+                    cached = shingles(*_row_text(self.hunts.get(hunt_id)))
+                    shingle_cache[hunt_id] = cached
+                return cached
+
+            compared = 0
+            for bucket in self._buckets.values():
+                if len(bucket) < 2:
+                    continue
+                members = [h for h in bucket if self.hunts.get(h) is not None]
+                for i, a in enumerate(members):
+                    for b in members[i + 1:]:
+                        ra, rb = find(a), find(b)
+                        if ra == rb:
+                            continue
+                        ca, cb = _row_company(self.hunts.get(a)), _row_company(self.hunts.get(b))
+                        if ca and cb and ca != cb:
+                            continue
+                        compared += 1
+                        if jaccard(shingles_of(a), shingles_of(b)) >= DUPLICATE_THRESHOLD:
+                            parent.setdefault(ra, ra)
+                            parent[rb] = ra
+
+            groups = {}
+            for hunt_id in parent:
+                groups.setdefault(find(hunt_id), []).append(hunt_id)
+
+            result = []
+            for members in groups.values():
+                if len(members) > 1:
+                    members.sort(key=lambda h: self.hunts.index_of(h) or 0)
+                    result.append(members)
+            result.sort(key=lambda g: self.hunts.index_of(g[0]) or 0)
+
+            s.set("compared", compared)
+            s.set("groups", len(result))
+        return result
+
+
+#----------------------------------------------------------------------
+# Merging
+def merge_hunts(repo, keep_id, duplicate_ids):
+    """
+    Fold duplicate hunts into keep_id: their reminders and progress move to
+    the kept hunt, fields the kept hunt left empty are filled in from them,
+    then they are deleted. Returns the number of hunts removed.
+    """
+    keep = repo.get_hunt(keep_id)
+    if keep is None:
+        return 0
+
+    fill = {}
+    removed = 0
+    for dup_id in duplicate_ids:
+        if dup_id == keep_id:
+            continue
+        dup = repo.get_hunt(dup_id)
+        if dup is None:
+            continue
+
+        for i, field in enumerate(m.HUNT_FIELDS):
+            if field == "id" or field in fill:
+                continue
+            current = keep[i] if len(keep) > i else ""
+            value = dup[i] if len(dup) > i else ""
+            if not current and value:
+                fill[field] = value
+
+        id_idx = repo.reminders.id_idx
+        for row in repo.reminders_for_hunt(dup_id):
+            repo.reminders.update(row[id_idx], {"huntId": keep_id})
+        id_idx = repo.progress.id_idx
+        for row in repo.progress_for_hunt(dup_id):
+            repo.progress.update(row[id_idx], {"huntId": keep_id})
+
+        repo.hunts.delete(dup_id)
+        removed += 1
+
+    if fill:
+        repo.hunts.update(keep_id, fill)
+    return removed
@@ -0,0 +1,122 @@
+# hunt_aggregates.py
+"""
+Per-hunt summaries of the reminder and progress rows.
+
+    reminder(hunt_id) -> {"count", "pending", "pending_due", "next_due"}
+    progress(hunt_id) -> {"count", "latest_status", "latest_date"}
+
+Each summary is computed from that hunt's index bucket the first time it is
+asked for and cached. The repository tables report which huntId buckets a
+change touched (insert / touch / delete / sync), so only those summaries are
+dropped; a full table rebuild drops them all. The main sheet therefore costs
+O(hunts) to build instead of a scan of every event per hunt.
+
+Dates are the model's "%Y-%m-%d %H:%M:%S" strings, which sort correctly as
+text, so no parsing is needed.
+"""
+import bisect
+from datetime import datetime
+
+import model as m
+
+DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+def now_str() -> str:
+    return datetime.now().strftime(DATE_FORMAT)
+
+
+class HuntAggregates:
+    def __init__(self, reminders, progress):
+        """reminders / progress are repository._Table objects indexed by huntId."""
+        self._reminder_table = reminders
+        self._progress_table = progress
+        self._reminders = {}   # hunt_id -> reminder summary
+        self._progress = {}    # hunt_id -> progress summary
+
+        reminders.add_listener(self._on_reminders_changed)
+        progress.add_listener(self._on_progress_changed)
+
+    # ------------------------------------------------------------------
+    # Invalidation
+    # ------------------------------------------------------------------
+    def _on_reminders_changed(self, keys):
+        if keys is None:
+            self._reminders.clear()
+        else:
+            self._reminders.pop(keys.get("huntId"), None)
+
+    def _on_progress_changed(self, keys):
+        if keys is None:
+            self._progress.clear()
+        else:
+            self._progress.pop(keys.get("huntId"), None)
+
+    def invalidate(self, hunt_id=None):
+        """Drop cached summaries for one hunt (or all, when hunt_id is None)."""
+        if hunt_id is None:
+            self._reminders.clear()
+            self._progress.clear()
+        else:
+            self._reminders.pop(hunt_id, None)
+            self._progress.pop(hunt_id, None)
+
+    # ------------------------------------------------------------------
+    # Reminders
+    # ------------------------------------------------------------------
+    def reminder(self, hunt_id) -> dict:
+        summary = self._reminders.get(hunt_id)
+        if summary is None:
+            summary = self._build_reminder(hunt_id)
+            self._reminders[hunt_id] = summary
+        return summary
+
+    def _build_reminder(self, hunt_id) -> dict:
+        dt_idx = m.REMINDER_FIELDS.index("dateTime")
+        status_idx = m.REMINDER_FIELDS.index("status")
+
+        rows = self._reminder_table.find("huntId", hunt_id)
+        pending_due = sorted(
+            row[dt_idx]
+            for row in rows
+            if len(row) > status_idx and row[status_idx] != "Done"
+        )
+        return {
+            "count": len(rows),
+            "pending": len(pending_due),
+            "pending_due": pending_due,
+            "next_due": pending_due[0] if pending_due else "",
+        }
+
+    def overdue_count(self, hunt_id, now: str = None) -> int:
+        """Pending reminders whose dateTime is already past."""
+        pending_due = self.reminder(hunt_id)["pending_due"]
+        return bisect.bisect_left(pending_due, now or now_str())
+
+    # ------------------------------------------------------------------
+    # Progress
+    # ------------------------------------------------------------------
+    def progress(self, hunt_id) -> dict:
+        summary = self._progress.get(hunt_id)
+        if summary is None:
+            summary = self._build_progress(hunt_id)
+            self._progress[hunt_id] = summary
+        return summary
+
+    def _build_progress(self, hunt_id) -> dict:
+        dt_idx = m.PROGRESS_FIELDS.index("dateTime")
+        status_idx = m.PROGRESS_FIELDS.index("status")
+
+        rows = self._progress_table.find("huntId", hunt_id)
+        latest = None
+        for row in rows:
+            if len(row) <= status_idx:
+                continue
+            if latest is None or row[dt_idx] >= latest[dt_idx]:
+                latest = row
+
+        return {
+            "count": len(rows),
+            "latest_status": latest[status_idx] if latest is not None else "",
+            "latest_date": latest[dt_idx] if latest is not None else "",
+        }
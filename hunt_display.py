@@ -0,0 +1,163 @@
+# hunt_display.py
+"""
+Per-row construction of the main Hunt sheet.
+
+A display row is the model hunt row wrapped with derived columns:
+
+    [Reminder, Progress, <HUNT_FIELDS...>, Company Name, Resume, Email, Map]
+
+Building ONE row only needs index lookups on the repository (reminder and
+progress columns come from the cached per-hunt summaries in
+repo.aggregates), so the main window can recompute just the rows an edit
+touched instead of the table.
+
+Long text columns (PREVIEW_FIELDS) are shown as a one-line preview; the
+full text stays on the hunt row and is loaded only for editing/detail view.
+Rows built with derived=False leave the derived columns empty so the main
+window can fill them in only for the rows that are actually on screen.
+"""
+import model as m
+
+#----------------------------------------------------------------------
+# Column layout
+HUNT_HEADERS = [
+    "Reminder",
+    "Progress",
+    "id",
+    "Job Title",
+    "Job Description",
+    "Job Source",
+    "Salary BaseMin",
+    "Salary BaseMax",
+    "Salary IndustryAvg",
+    "Salary Expecting",
+    "Currency",
+    "Ot Rate Ratio",
+    "Work Arrangement",
+    "Has Health Insurance",
+    "companyId",
+    "Company Name",
+    "Resume",
+    "Email",
+    "Map",
+]
+
+# Sheet column of HUNT_FIELDS[0]
+MODEL_OFFSET = 2
+
+COL_REMINDER = HUNT_HEADERS.index("Reminder")
+COL_PROGRESS = HUNT_HEADERS.index("Progress")
+COL_COMPANY_NAME = HUNT_HEADERS.index("Company Name")
+COL_RESUME = HUNT_HEADERS.index("Resume")
+COL_EMAIL = HUNT_HEADERS.index("Email")
+COL_MAP = HUNT_HEADERS.index("Map")
+
+# Sheet columns whose value is computed rather than stored on the hunt row
+DERIVED_COLUMNS = [
+    COL_REMINDER,
+    COL_PROGRESS,
+    COL_COMPANY_NAME,
+    COL_RESUME,
+    COL_EMAIL,
+    COL_MAP,
+]
+
+# Long text shown truncated in the sheet (full text lives on the hunt row)
+PREVIEW_FIELDS = ["jobDescription"]
+PREVIEW_CHARS = 80
+PREVIEW_COLUMNS = [MODEL_OFFSET + m.HUNT_FIELDS.index(f) for f in PREVIEW_FIELDS]
+
+ICON_REMINDER = "⏰"
+ICON_PROGRESS = "📈"
+ICON_RESUME = "📄"
+ICON_EMAIL = "✉️"
+ICON_MAP = "📍"
+
+
+def model_column(sheet_col: int):
+    """Sheet column -> index into HUNT_FIELDS (None for derived columns)."""
+    model_col = sheet_col - MODEL_OFFSET
+    if 0 <= model_col < len(m.HUNT_FIELDS):
+        return model_col
+    return None
+
+
+#----------------------------------------------------------------------
+# Previews
+def preview_text(text) -> str:
+    """First line of text, cut to PREVIEW_CHARS (with an ellipsis if cut)."""
+    text = "" if text is None else str(text)
+    lines = text.strip().splitlines()
+    first = lines[0].strip() if lines else ""
+    if len(first) > PREVIEW_CHARS or len(lines) > 1:
+        return first[:PREVIEW_CHARS].rstrip() + "…"
+    return first
+
+
+#----------------------------------------------------------------------
+# Derived values
+def reminder_cell(summary) -> str:
+    """Icon plus the number of Pending reminders (if any)."""
+    if summary["pending"]:
+        return f"{ICON_REMINDER} {summary['pending']}"
+    return ICON_REMINDER
+
+
+def progress_cell(summary) -> str:
+    """Latest progress status (by dateTime), or just the icon."""
+    if summary["latest_status"]:
+        return f"{ICON_PROGRESS} {summary['latest_status']}"
+    return ICON_PROGRESS
+
+
+def company_name_cell(company_row) -> str:
+    name_idx = m.COMPANY_FIELDS.index("name")
+    if company_row is None or len(company_row) <= name_idx:
+        return ""
+    return company_row[name_idx]
+
+
+def derived_cells(hunt_row, repo) -> dict:
+    """{sheet column: value} for the derived columns of one hunt row."""
+    id_idx = m.HUNT_FIELDS.index("id")
+    company_idx = m.HUNT_FIELDS.index("companyId")
+    hunt_id = hunt_row[id_idx] if len(hunt_row) > id_idx else ""
+    company_id = hunt_row[company_idx] if len(hunt_row) > company_idx else ""
+
+    return {
+        COL_REMINDER: reminder_cell(repo.aggregates.reminder(hunt_id)),
+        COL_PROGRESS: progress_cell(repo.aggregates.progress(hunt_id)),
+        COL_COMPANY_NAME: company_name_cell(repo.get_company(company_id)),
+        COL_RESUME: ICON_RESUME,
+        COL_EMAIL: ICON_EMAIL,
+        COL_MAP: ICON_MAP,
+    }
+
+
+#----------------------------------------------------------------------
+# build_hunt_display_row
+def build_hunt_display_row(hunt_row, repo, derived: bool = True):
+    """
+    Display row for one hunt row; repo is a repository.Repository.
+    derived=False leaves the derived columns empty (filled in lazily).
+    """
+    width = len(m.HUNT_FIELDS)
+    hunt = list(hunt_row)
+    if len(hunt) < width:
+        hunt = hunt + [""] * (width - len(hunt))
+    elif len(hunt) > width:
+        hunt = hunt[:width]
+
+    row = [""] * MODEL_OFFSET + hunt + [""] * (len(HUNT_HEADERS) - MODEL_OFFSET - width)
+    for c in PREVIEW_COLUMNS:
+        row[c] = preview_text(row[c])
+
+    if derived:
+        for c, value in derived_cells(hunt, repo).items():
+            row[c] = value
+    return row
+
+
+def build_hunt_display_rows(repo, derived: bool = True):
+    """Display rows for every hunt, in hunt_rows order."""
+    return [build_hunt_display_row(row, repo, derived) for row in repo.hunts.rows]
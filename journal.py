@@ -0,0 +1,241 @@
+# journal.py
+"""
+Append-only change journal for one entity CSV.
+
+Layout next to each snapshot:
+
+    data/hunt.csv        <- snapshot (same format as always)
+    data/hunt.journal    <- one JSON record per line since the snapshot
+
+Records:
+    {"op": "put", "row": [...]}   insert or replace the row with row[id]
+    {"op": "del", "id": "..."}    remove the row with that id
+
+load() = snapshot + replay; save(rows) appends only the rows that differ
+from what is already on disk, and folds the journal back into the snapshot
+(compaction) once it grows past the snapshot size.
+"""
+import json
+import os
+from pathlib import Path
+
+JOURNAL_SUFFIX = ".journal"
+
+# Never compact below this many records, even for tiny tables
+COMPACT_MIN_RECORDS = 500
+
+
+def journal_path(csv_path: Path) -> Path:
+    return csv_path.with_suffix(JOURNAL_SUFFIX)
+
+
+class EntityJournal:
+    def __init__(self, csv_path: Path, fields, read_snapshot, write_snapshot):
+        """
+        read_snapshot(path) -> rows is the model's plain CSV reader, so the
+        snapshot format is unchanged. write_snapshot(path, rows) must replace
+        path durably (the model's fsynced temp-file + rename save): the
+        journal is deleted right after it returns.
+        """
+        self.csv_path = Path(csv_path)
+        self.path = journal_path(self.csv_path)
+        self.width = len(fields)
+        self.id_idx = fields.index("id")
+        self._read_snapshot = read_snapshot
+        self._write_snapshot = write_snapshot
+
+        # What is on disk right now (snapshot + journal)
+        self._known = {}   # id -> tuple(row)
+        self._order = []   # ids in row order
+        self._loaded = False
+        self._torn = False
+        self.record_count = 0
+
+    # ------------------------------------------------------------------
+    # Load
+    # ------------------------------------------------------------------
+    def load(self):
+        """
+        Snapshot rows in file order with the journal replayed on top.
+        Records only address rows by id, so snapshot rows with a blank or
+        repeated id stay where they are (a put replaces the last row with
+        its id, a del removes every row with it).
+        """
+        rows = list(self._read_snapshot(self.csv_path))
+        positions = {}   # id -> indexes in rows of the rows with that id
+        for i, row in enumerate(rows):
+            row_id = row[self.id_idx]
+            if row_id:
+                positions.setdefault(row_id, []).append(i)
+
+        self.record_count = 0
+        self._torn = False
+        for record in self._read_records():
+            self.record_count += 1
+            op = record.get("op")
+            if op == "put":
+                row = self._normalize(record.get("row") or [])
+                row_id = row[self.id_idx]
+                if not row_id:
+                    continue
+                found = positions.get(row_id)
+                if found is None:
+                    positions[row_id] = [len(rows)]
+                    rows.append(row)
+                else:
+                    rows[found[-1]] = row
+            elif op == "del":
+                for i in positions.pop(record.get("id"), ()):
+                    rows[i] = None
+
+        rows = [row for row in rows if row is not None]
+
+        self._remember(rows)
+
+        if self._torn:
+            # Anything appended after a torn line would be glued onto it
+            self.compact(rows)
+        return rows
+
+    def _read_records(self):
+        if not self.path.exists():
+            return
+
+        with self.path.open("r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    # Torn last write (process died mid-append): stop here
+                    self._torn = True
+                    return
+
+    # ------------------------------------------------------------------
+    # Save
+    # ------------------------------------------------------------------
+    def save(self, rows):
+        """
+        Persist rows. Appends only changed rows; falls back to a full
+        compaction when the change cannot be expressed as put/del records
+        (rows reordered, missing or duplicate ids, here or on disk).
+        """
+        if not self._loaded:
+            # Diff against what is actually on disk, not an empty state
+            self.load()
+
+        rows = [self._normalize(row) for row in rows]
+
+        ids = [row[self.id_idx] for row in rows]
+        id_set = set(ids)
+        if "" in id_set or len(id_set) != len(ids):
+            self.compact(rows)
+            return
+
+        # Id-less or repeated-id rows on disk cannot be addressed by a del
+        # record; only a new snapshot removes them
+        if "" in self._known or len(self._known) != len(self._order):
+            self.compact(rows)
+            return
+
+        # Replay appends new ids at the end, so the order must match that
+        survivors = [row_id for row_id in self._order if row_id in id_set]
+        added = [row_id for row_id in ids if row_id not in self._known]
+        if ids != survivors + added:
+            self.compact(rows)
+            return
+
+        records = []
+        for row_id in self._order:
+            if row_id not in id_set:
+                records.append({"op": "del", "id": row_id})
+        for row in rows:
+            if self._known.get(row[self.id_idx]) != tuple(row):
+                records.append({"op": "put", "row": row})
+
+        if not records:
+            return
+
+        if self.record_count + len(records) > max(COMPACT_MIN_RECORDS, len(rows)):
+            self.compact(rows)
+            return
+
+        self._append(records)
+        self._remember(rows)
+
+    def apply(self, puts=(), deleted_ids=()):
+        """Row-level change without handing over the whole table."""
+        if not self._loaded:
+            self.load()
+
+        records = []
+        for row_id in deleted_ids:
+            if row_id in self._known:
+                records.append({"op": "del", "id": row_id})
+                del self._known[row_id]
+        for row in puts:
+            row = self._normalize(row)
+            row_id = row[self.id_idx]
+            if not row_id or self._known.get(row_id) == tuple(row):
+                continue
+            records.append({"op": "put", "row": row})
+            self._known[row_id] = tuple(row)
+
+        if not records:
+            return
+
+        self._order = [row_id for row_id in self._order if row_id in self._known]
+        seen = set(self._order)
+        for record in records:
+            if record["op"] == "put" and record["row"][self.id_idx] not in seen:
+                self._order.append(record["row"][self.id_idx])
+                seen.add(record["row"][self.id_idx])
+
+        self._append(records)
+
+    def _append(self, records):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self.path.open("a", encoding="utf-8", newline="\n") as f:
+            for record in records:
+                f.write(json.dumps(record, ensure_ascii=False))
+                f.write("\n")
+            f.flush()
+            os.fsync(f.fileno())
+        self.record_count += len(records)
+
+    # ------------------------------------------------------------------
+    # Compaction
+    # ------------------------------------------------------------------
+    def compact(self, rows=None):
+        """Rewrite the snapshot from rows (or the replayed state) and drop the journal."""
+        if rows is None:
+            rows = self.load()
+        else:
+            rows = [self._normalize(row) for row in rows]
+
+        self._write_snapshot(self.csv_path, rows)
+
+        # The snapshot is on disk now; only then forget the journal
+        if self.path.exists():
+            self.path.unlink()
+
+        self.record_count = 0
+        self._remember(rows)
+
+    # ------------------------------------------------------------------
+    # Helpers
+    # ------------------------------------------------------------------
+    def _normalize(self, row):
+        row = ["" if v is None else str(v) for v in row]
+        if len(row) < self.width:
+            row = row + [""] * (self.width - len(row))
+        elif len(row) > self.width:
+            row = row[:self.width]
+        return row
+
+    def _remember(self, rows):
+        self._loaded = True
+        self._known = {row[self.id_idx]: tuple(row) for row in rows}
+        self._order = [row[self.id_idx] for row in rows]
@@ -0,0 +1,393 @@
+# mail_queue.py
+"""
+Outbound mail queue: durable outbox + worker pool + retry with backoff.
+
+    queue = mail_queue.get_queue(widget, controller)
+    msg_id = queue.enqueue(hunt_id, to, subject, body, attachments)
+
+Every message is a JSON file in DATA_DIR/outbox until it has been sent, so
+queued (and retrying) mail survives a restart: start() re-submits whatever
+is still queued. A message found in "sending" was interrupted mid-send and
+may already have gone out, so it is not resent; it is marked "failed"
+(INTERRUPTED_ERROR) and waits for a manual Retry. Sends run on a small task_runner pool; results come
+back on the Tk thread, where the outcome is written to the hunt's progress
+log through controller.add_progress_for_hunt.
+
+Transient failures (network errors, HTTP 429/5xx) are retried with
+exponential backoff; anything else, or running out of attempts, marks the
+message "failed" (it stays in the outbox and can be retried).
+
+Sends are paced to at most SEND_RATE_PER_MIN per minute, so a campaign of
+many messages drains steadily instead of tripping Gmail's rate limits.
+
+Transports:
+    GmailTransport  email_service.send_direct_email; one Gmail API client
+                    per worker thread, reused across sends
+    FakeTransport   records messages in memory (JOBHOUND_MAIL_TRANSPORT=fake)
+"""
+import json
+import os
+import random
+import threading
+import time
+from datetime import datetime
+
+from app_paths import DATA_DIR
+import task_runner
+import tracing
+
+OUTBOX_DIR = DATA_DIR / "outbox"
+
+MAIL_WORKERS = 2
+SEND_RATE_PER_MIN = 20
+MAX_ATTEMPTS = 6
+BACKOFF_BASE_S = 2.0
+BACKOFF_MAX_S = 300.0
+
+TRANSIENT_HTTP_STATUS = {408, 429, 500, 502, 503, 504}
+
+PROGRESS_STATUS = "Other"
+
+# last_error of a message the app quit (or crashed) while sending
+INTERRUPTED_ERROR = "interrupted; check Sent folder"
+
+
+#----------------------------------------------------------------------
+# Transports
+class GmailTransport:
+    """
+    Sends via email_service.send_direct_email. When email_service exposes
+    get_gmail_service(), each worker thread builds its API client once and
+    passes it as service=...; the client is not thread-safe, so it is not
+    shared between threads.
+    """
+
+    def __init__(self):
+        self._local = threading.local()
+
+    def send(self, to, subject, body, attachments):
+        import email_service  # Gmail client loads on first use
+
+        get_service = getattr(email_service, "get_gmail_service", None)
+        if get_service is None:
+            return email_service.send_direct_email(
+                to=to, subject=subject, body=body, attachments=attachments,
+            )
+
+        service = getattr(self._local, "service", None)
+        if service is None:
+            service = self._local.service = get_service()
+        try:
+            return email_service.send_direct_email(
+                to=to, subject=subject, body=body, attachments=attachments,
+                service=service,
+            )
+        except Exception:
+            # Rebuild the client on the next attempt (expired auth, dead socket)
+            self._local.service = None
+            raise
+
+
+class FakeTransport:
+    """In-memory transport for local testing; fail_first=N fails N sends."""
+
+    def __init__(self, fail_first: int = 0, error=None, delay_s: float = 0.0):
+        self.sent = []
+        self.fail_first = fail_first
+        self.error = error or ConnectionError("fake transient failure")
+        self.delay_s = delay_s
+        self._lock = threading.Lock()
+
+    def send(self, to, subject, body, attachments):
+        if self.delay_s:
+            time.sleep(self.delay_s)
+        with self._lock:
+            if self.fail_first > 0:
+                self.fail_first -= 1
+                raise self.error
+            msg_id = f"fake-{len(self.sent) + 1}"
+            self.sent.append({
+                "id": msg_id,
+                "to": to,
+                "subject": subject,
+                "body": body,
+                "attachments": list(attachments or []),
+            })
+        return {"id": msg_id}
+
+
+def default_transport():
+    if os.environ.get("JOBHOUND_MAIL_TRANSPORT", "").strip().lower() == "fake":
+        return FakeTransport()
+    return GmailTransport()
+
+
+def is_transient(exc) -> bool:
+    if isinstance(exc, (ConnectionError, TimeoutError)):
+        return True
+    # googleapiclient.errors.HttpError carries the response on .resp
+    status = getattr(getattr(exc, "resp", None), "status", None)
+    try:
+        return int(status) in TRANSIENT_HTTP_STATUS
+    except (TypeError, ValueError):
+        return isinstance(exc, OSError)
+
+
+def backoff_seconds(attempts: int) -> float:
+    """Exponential backoff with +-10% jitter."""
+    delay = min(BACKOFF_MAX_S, BACKOFF_BASE_S * (2 ** max(0, attempts - 1)))
+    return delay * random.uniform(0.9, 1.1)
+
+
+#----------------------------------------------------------------------
+# MailQueue
+class MailQueue:
+    def __init__(self, root, controller, transport=None, outbox_dir=OUTBOX_DIR,
+                 max_workers: int = MAIL_WORKERS, rate_per_min: float = SEND_RATE_PER_MIN):
+        self.root = root
+        self.controller = controller
+        self.transport = transport or default_transport()
+        self.outbox_dir = outbox_dir
+        self.runner = task_runner.TaskRunner(root, max_workers=max_workers)
+
+        # Pacing: the next send may start no earlier than _next_slot
+        self.min_interval_s = 60.0 / rate_per_min if rate_per_min else 0.0
+        self._next_slot = 0.0
+
+        self._messages = {}    # msg_id -> message dict (mirrors the outbox file)
+        self._retry_jobs = {}  # msg_id -> after() job
+        self._listeners = []   # fn(message) on every status change
+        self._started = False
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+    def start(self):
+        """Load the outbox and resume anything not yet sent."""
+        if self._started:
+            return
+        self._started = True
+
+        if not self.outbox_dir.exists():
+            return
+        for path in sorted(self.outbox_dir.glob("*.json")):
+            try:
+                msg = json.loads(path.read_text(encoding="utf-8"))
+            except (OSError, ValueError) as e:
+                print(f"Skipping unreadable outbox file {path.name}:", e)
+                continue
+            self._messages[msg["id"]] = msg
+            if msg.get("status") == "sending":
+                # May have been delivered already: never resend on our own
+                msg["status"] = "failed"
+                msg["last_error"] = INTERRUPTED_ERROR
+                self._persist(msg)
+            elif msg.get("status") == "queued":
+                self._schedule(msg)
+
+    def enqueue(self, hunt_id, to, subject, body, attachments=()) -> str:
+        msg = {
+            "id": f"{time.time_ns():x}{random.getrandbits(16):04x}",
+            "hunt_id": hunt_id or "",
+            "to": to,
+            "subject": subject,
+            "body": body,
+            "attachments": [str(p) for p in attachments or ()],
+            "status": "queued",
+            "attempts": 0,
+            "next_attempt": 0.0,
+            "last_error": "",
+            "created": time.time(),
+        }
+        self._messages[msg["id"]] = msg
+        self._persist(msg)
+        self._submit(msg)
+        return msg["id"]
+
+    def retry(self, msg_id):
+        """Re-queue a failed message immediately."""
+        msg = self._messages.get(msg_id)
+        if msg is None or msg["status"] == "sending":
+            return
+        job = self._retry_jobs.pop(msg_id, None)
+        if job is not None:
+            self.root.after_cancel(job)
+        msg["status"] = "queued"
+        msg["attempts"] = 0
+        msg["next_attempt"] = 0.0
+        self._persist(msg)
+        self._submit(msg)
+
+    def messages(self):
+        """Messages still in the outbox (queued, sending or failed)."""
+        return list(self._messages.values())
+
+    def add_listener(self, fn):
+        self._listeners.append(fn)
+
+    def remove_listener(self, fn):
+        if fn in self._listeners:
+            self._listeners.remove(fn)
+
+    def shutdown(self):
+        for job in self._retry_jobs.values():
+            self.root.after_cancel(job)
+        self._retry_jobs.clear()
+        self.runner.shutdown()
+
+    # ------------------------------------------------------------------
+    # Sending
+    # ------------------------------------------------------------------
+    def _schedule(self, msg):
+        delay_s = max(0.0, msg.get("next_attempt", 0.0) - time.time())
+        if delay_s <= 0:
+            self._submit(msg)
+            return
+        self._retry_jobs[msg["id"]] = self.root.after(
+            int(delay_s * 1000), lambda: self._on_retry_due(msg["id"])
+        )
+
+    def _on_retry_due(self, msg_id):
+        self._retry_jobs.pop(msg_id, None)
+        msg = self._messages.get(msg_id)
+        if msg is not None and msg["status"] == "queued":
+            self._submit(msg)
+
+    def _submit(self, msg):
+        """Send now, or wait for the next free send slot."""
+        now = time.time()
+        slot = max(now, self._next_slot)
+        self._next_slot = slot + self.min_interval_s
+
+        if slot > now:
+            msg["status"] = "queued"
+            msg["next_attempt"] = slot
+            self._persist(msg)
+            self._notify(msg)
+            self._retry_jobs[msg["id"]] = self.root.after(
+                int((slot - now) * 1000), lambda: self._on_slot_due(msg["id"])
+            )
+            return
+        self._send_now(msg)
+
+    def _on_slot_due(self, msg_id):
+        self._retry_jobs.pop(msg_id, None)
+        msg = self._messages.get(msg_id)
+        if msg is not None and msg["status"] == "queued":
+            self._send_now(msg)
+
+    def _send_now(self, msg):
+        msg["status"] = "sending"
+        self._persist(msg)
+        self._notify(msg)
+
+        self.runner.submit(
+            self._send,
+            dict(msg),
+            on_done=lambda info: self._on_sent(msg["id"], info),
+            on_error=lambda e: self._on_failed(msg["id"], e),
+            name=f"mail[{msg['id']}]",
+        )
+
+    def _send(self, msg):
+        with tracing.span(
+            "gmail.send",
+            in_size=len(msg["body"]),
+            attachments=len(msg["attachments"]),
+            attempt=msg["attempts"] + 1,
+        ):
+            return self.transport.send(
+                msg["to"], msg["subject"], msg["body"], msg["attachments"]
+            )
+
+    def _on_sent(self, msg_id, info):
+        msg = self._messages.pop(msg_id, None)
+        if msg is None:
+            return
+
+        msg["status"] = "sent"
+        msg["attempts"] += 1
+        msg["sent_id"] = (info or {}).get("id", "") if isinstance(info, dict) else ""
+        self._remove_file(msg)
+        self._log_progress(
+            msg,
+            f"✉️ Email sent to {msg['to']}: {msg['subject']}",
+        )
+        self._notify(msg)
+
+    def _on_failed(self, msg_id, exc):
+        msg = self._messages.get(msg_id)
+        if msg is None:
+            return
+
+        msg["attempts"] += 1
+        msg["last_error"] = f"{type(exc).__name__}: {exc}"
+
+        if is_transient(exc) and msg["attempts"] < MAX_ATTEMPTS:
+            msg["status"] = "queued"
+            msg["next_attempt"] = time.time() + backoff_seconds(msg["attempts"])
+            self._persist(msg)
+            self._schedule(msg)
+        else:
+            msg["status"] = "failed"
+            self._persist(msg)
+            self._log_progress(
+                msg,
+                f"✉️ Email to {msg['to']} failed after {msg['attempts']} attempt(s): {msg['last_error']}",
+            )
+        self._notify(msg)
+
+    # ------------------------------------------------------------------
+    # Outbox files / progress log / listeners
+    # ------------------------------------------------------------------
+    def _path(self, msg):
+        return self.outbox_dir / f"{msg['id']}.json"
+
+    def _persist(self, msg):
+        self.outbox_dir.mkdir(parents=True, exist_ok=True)
+        path = self._path(msg)
+        tmp_path = path.with_name(path.name + ".tmp")
+        tmp_path.write_text(json.dumps(msg, ensure_ascii=False, indent=2), encoding="utf-8")
+        os.replace(tmp_path, path)
+
+    def _remove_file(self, msg):
+        try:
+            self._path(msg).unlink()
+        except FileNotFoundError:
+            pass
+
+    def _log_progress(self, msg, description):
+        if not msg.get("hunt_id"):
+            return
+        try:
+            self.controller.add_progress_for_hunt(
+                msg["hunt_id"],
+                PROGRESS_STATUS,
+                description,
+                dt_str=datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            )
+        except Exception as e:
+            print("Error writing mail status to progress log:", e)
+
+    def _notify(self, msg):
+        for fn in list(self._listeners):
+            try:
+                fn(dict(msg))
+            except Exception as e:
+                print("Error in mail queue listener:", e)
+
+
+#----------------------------------------------------------------------
+# get_queue
+_QUEUES = {}
+
+
+def get_queue(widget, controller=None) -> MailQueue:
+    """Shared queue for the Tk application that owns widget (started on creation)."""
+    root = widget.nametowidget(".")
+    queue = _QUEUES.get(root)
+    if queue is None:
+        queue = MailQueue(root, controller)
+        _QUEUES[root] = queue
+        queue.start()
+    return queue
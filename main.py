@@ -1,14 +1,36 @@
 # main.py
+import multiprocessing
+import sys
 import tkinter as tk
-import controller as c
 
-def main():
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+
+    profiler = None
+    if "--profile-startup" in argv:
+        import startup_profile
+        profiler = startup_profile.StartupProfiler()
+        profiler.start()
+
+    # The controller pulls in the main window (and tksheet); secondary
+    # windows and the AI/Gmail/docx clients load on first use.
+    import controller as c
+    if profiler:
+        profiler.mark("import controller")
+
     root = tk.Tk()
     app = c.AppController(root)
+    if profiler:
+        profiler.mark("controller ready")
+        profiler.report_after_paint(root, exit_after="--exit-after-paint" in argv)
+
     root.mainloop()
 
 #Only run main() if this file is executed directly, NOT if it is imported by another file.”
 if __name__ == "__main__":
+    # resume_service.render_resumes uses a process pool; in a frozen
+    # (PyInstaller) build each worker re-runs this exe and must stop here
+    multiprocessing.freeze_support()
     main()
 
 
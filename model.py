@@ -1,11 +1,15 @@
 # model.py
 import csv
+import hashlib
+import io
 import uuid
 from pathlib import Path
 import json
 import os
 
 from app_paths import DATA_DIR
+import journal
+import sqlite_store
 
 #----------------------------------------------------------------------
 # Directory and file paths
@@ -14,6 +18,290 @@ COMPANY_CSV = DATA_DIR / "company.csv"
 REMINDER_CSV = DATA_DIR / "reminder.csv"
 PROGRESS_CSV = DATA_DIR / "progress.csv"
 PERSONAL_FILE = DATA_DIR / "personalDetails.json"
+SQLITE_DB = DATA_DIR / "jobhound.sqlite3"
+
+#----------------------------------------------------------------------
+# Storage backend
+#   "csv"     - rewrite the whole CSV on every save (default)
+#   "journal" - append changed rows to <entity>.journal, compact periodically
+#   "sqlite"  - row-level upserts/deletes in SQLITE_DB (migrated from CSV once)
+STORAGE_BACKENDS = ("csv", "journal", "sqlite")
+STORAGE_BACKEND = os.environ.get("JOBHOUND_STORAGE", "csv").strip().lower()
+if STORAGE_BACKEND not in STORAGE_BACKENDS:
+    STORAGE_BACKEND = "csv"
+
+
+def set_storage_backend(name: str):
+    """Switch backend at runtime (call before the first load_*)."""
+    global STORAGE_BACKEND
+    name = (name or "").strip().lower()
+    if name not in STORAGE_BACKENDS:
+        raise ValueError(f"Unknown storage backend: {name!r}")
+    STORAGE_BACKEND = name
+    _JOURNALS.clear()
+    _SAVED_HASHES.clear()
+    _close_sqlite()
+
+#----------------------------------------------------------------------
+# Plain CSV read / write (shared by every entity and backend)
+def _normalize_row(row, width):
+    # add missing columns
+    if len(row) < width:
+        row = row + [""] * (width - len(row))
+
+    # trim excess columns
+    elif len(row) > width:
+        row = row[:width]
+
+    return row
+
+
+def _read_csv(path, fields):
+    if not path.exists():
+        return []
+
+    data = path.read_bytes()
+    _SAVED_HASHES[str(path)] = hashlib.sha256(data).hexdigest()
+
+    reader = csv.reader(io.StringIO(data.decode("utf-8"), newline=""))
+
+    width = len(fields)
+    return [_normalize_row(row, width) for row in reader]
+
+#----------------------------------------------------------------------
+# Atomic CSV saves
+#   Every entity is serialized in memory and hashed first; files whose bytes
+#   are unchanged since the last load/save are skipped. The rest are written
+#   to <name>.tmp, fsynced as one batch, and only then renamed over the real
+#   files, so a crash never leaves a half-written CSV behind.
+_SAVED_HASHES = {}  # str(path) -> sha256 of the bytes last read/written
+
+
+def _serialize_csv(fields, rows) -> bytes:
+    buf = io.StringIO(newline="")
+    writer = csv.writer(buf)
+
+    width = len(fields)
+    for row in rows:
+        writer.writerow(_normalize_row(row, width))
+
+    return buf.getvalue().encode("utf-8")
+
+
+def _fsync_dir(path):
+    # Persist the renames themselves (not supported on Windows)
+    if os.name == "nt":
+        return
+    fd = os.open(str(path), os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _save_csv_atomic(items):
+    """
+    items: [(path, fields, rows), ...]
+    Returns the list of paths actually written.
+    """
+    pending = []
+    for path, fields, rows in items:
+        data = _serialize_csv(fields, rows)
+        digest = hashlib.sha256(data).hexdigest()
+        if path.exists() and _SAVED_HASHES.get(str(path)) == digest:
+            continue
+        pending.append((path, data, digest))
+
+    if not pending:
+        return []
+
+    written = []  # (open file, tmp path, final path, digest)
+    try:
+        for path, data, digest in pending:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_name(path.name + ".tmp")
+            f = tmp_path.open("wb")
+            written.append((f, tmp_path, path, digest))
+            f.write(data)
+            f.flush()
+
+        # One durability barrier for the whole batch, before any rename
+        for f, _, _, _ in written:
+            os.fsync(f.fileno())
+            f.close()
+
+        for _, tmp_path, path, digest in written:
+            os.replace(tmp_path, path)
+            _SAVED_HASHES[str(path)] = digest
+
+    except Exception:
+        for f, tmp_path, _, _ in written:
+            f.close()
+            if tmp_path.exists():
+                tmp_path.unlink()
+        raise
+
+    for parent in {path.parent for _, _, path, _ in written}:
+        _fsync_dir(parent)
+
+    return [path for _, _, path, _ in written]
+
+#----------------------------------------------------------------------
+# Journals (only used when STORAGE_BACKEND == "journal")
+_JOURNALS = {}
+
+
+def _journal(path, fields):
+    key = str(path)
+    j = _JOURNALS.get(key)
+    if j is None:
+        j = journal.EntityJournal(
+            path,
+            fields,
+            read_snapshot=lambda p: _read_csv(p, fields),
+            write_snapshot=lambda p, rows: _save_csv_atomic([(p, fields, rows)]),
+        )
+        _JOURNALS[key] = j
+    return j
+
+#----------------------------------------------------------------------
+# SQLite (only used when STORAGE_BACKEND == "sqlite")
+_SQLITE = None
+
+
+def _sqlite():
+    global _SQLITE
+    if _SQLITE is None:
+        is_new = not SQLITE_DB.exists()
+        _SQLITE = sqlite_store.SqliteStore(SQLITE_DB)
+        if is_new:
+            migrate_csv_to_sqlite()
+    return _SQLITE
+
+
+def _close_sqlite():
+    global _SQLITE
+    if _SQLITE is not None:
+        _SQLITE.close()
+        _SQLITE = None
+
+
+def migrate_csv_to_sqlite():
+    """
+    One-shot copy of the four CSV files (plus any journal) into SQLITE_DB.
+    Existing table contents are replaced. Safe to re-run.
+    """
+    global _SQLITE
+    if _SQLITE is None:
+        _SQLITE = sqlite_store.SqliteStore(SQLITE_DB)
+
+    for path, fields in _entity_files():
+        if journal.journal_path(path).exists():
+            rows = _journal(path, fields).load()
+        else:
+            rows = _read_csv(path, fields)
+        _SQLITE.replace_all(path.stem, fields, rows)
+
+#----------------------------------------------------------------------
+# Backend dispatch
+def _entity_files():
+    return (
+        (HUNT_CSV, HUNT_FIELDS),
+        (COMPANY_CSV, COMPANY_FIELDS),
+        (REMINDER_CSV, REMINDER_FIELDS),
+        (PROGRESS_CSV, PROGRESS_FIELDS),
+    )
+
+
+def _entity(name):
+    for path, fields in _entity_files():
+        if path.stem == name:
+            return path, fields
+    raise ValueError(f"Unknown entity: {name!r}")
+
+
+def _load_rows(path, fields):
+    if STORAGE_BACKEND == "journal":
+        return _journal(path, fields).load()
+    if STORAGE_BACKEND == "sqlite":
+        return _sqlite().load(path.stem, fields)
+    return _read_csv(path, fields)
+
+
+def _save_rows(path, fields, rows):
+    if STORAGE_BACKEND == "journal":
+        _journal(path, fields).save(rows)
+        return
+    if STORAGE_BACKEND == "sqlite":
+        _sqlite().save(path.stem, fields, rows)
+        return
+    _save_csv_atomic([(path, fields, rows)])
+
+
+def save_all(hunt_rows, company_rows, reminder_rows, progress_rows):
+    """
+    Save all four entities as one batch (what the Save button should call).
+    - "csv" backend: unchanged files are skipped; changed ones are written
+      to temp files, fsynced together and atomically renamed.
+    - other backends: each entity is saved incrementally as usual.
+    """
+    tables = (hunt_rows, company_rows, reminder_rows, progress_rows)
+    items = [
+        (path, fields, rows)
+        for (path, fields), rows in zip(_entity_files(), tables)
+    ]
+
+    if STORAGE_BACKEND == "csv":
+        return _save_csv_atomic(items)
+
+    for path, fields, rows in items:
+        _save_rows(path, fields, rows)
+    return [path for path, _, _ in items]
+
+
+def upsert_rows(entity: str, rows):
+    """
+    Insert or replace rows by id in one entity ("hunt", "company",
+    "reminder", "progress") without passing the whole table.
+    """
+    path, fields = _entity(entity)
+    if STORAGE_BACKEND == "sqlite":
+        _sqlite().upsert(entity, fields, rows)
+    elif STORAGE_BACKEND == "journal":
+        _journal(path, fields).apply(puts=rows)
+    else:
+        id_idx = fields.index("id")
+        current = _read_csv(path, fields)
+        by_id = {row[id_idx]: i for i, row in enumerate(current)}
+        for row in rows:
+            i = by_id.get(row[id_idx])
+            if i is None:
+                by_id[row[id_idx]] = len(current)
+                current.append(row)
+            else:
+                current[i] = row
+        _save_csv_atomic([(path, fields, current)])
+
+
+def delete_rows(entity: str, ids):
+    """Delete rows by id from one entity."""
+    path, fields = _entity(entity)
+    if STORAGE_BACKEND == "sqlite":
+        _sqlite().delete(entity, fields, ids)
+    elif STORAGE_BACKEND == "journal":
+        _journal(path, fields).apply(deleted_ids=ids)
+    else:
+        id_idx = fields.index("id")
+        ids = set(ids)
+        current = _read_csv(path, fields)
+        kept = [row for row in current if row[id_idx] not in ids]
+        _save_csv_atomic([(path, fields, kept)])
+
+
+def compact_journals():
+    """Fold every entity journal back into its CSV snapshot."""
+    for path, fields in _entity_files():
+        _journal(path, fields).compact()
 
 #----------------------------------------------------------------------
 # load_hunt
@@ -35,27 +323,7 @@ HUNT_FIELDS = [
 
 
 def load_hunt():
-    if not HUNT_CSV.exists():
-        return []
-
-    with HUNT_CSV.open(newline="", encoding="utf-8") as f:
-        reader = csv.reader(f)
-
-        width = len(HUNT_FIELDS)
-        rows = []
-
-        for row in reader:
-            # add missing columns
-            if len(row) < width:
-                row = row + [""] * (width - len(row))
-
-            # trim excess columns
-            elif len(row) > width:
-                row = row[:width]
-
-            rows.append(row)
-
-    return rows
+    return _load_rows(HUNT_CSV, HUNT_FIELDS)
 
 #----------------------------------------------------------------------
 # load_company
@@ -74,27 +342,7 @@ COMPANY_FIELDS = [
 
 
 def load_company():
-    if not COMPANY_CSV.exists():
-        return []
-
-    with COMPANY_CSV.open(newline="", encoding="utf-8") as f:
-        reader = csv.reader(f)
-
-        width = len(COMPANY_FIELDS)
-        rows = []
-
-        for row in reader:
-            # add missing columns
-            if len(row) < width:
-                row = row + [""] * (width - len(row))
-
-            # trim excess columns
-            elif len(row) > width:
-                row = row[:width]
-
-            rows.append(row)
-
-    return rows
+    return _load_rows(COMPANY_CSV, COMPANY_FIELDS)
 
 #----------------------------------------------------------------------
 # load_reminder
@@ -108,27 +356,7 @@ REMINDER_FIELDS = [
 
 
 def load_reminder():
-    if not REMINDER_CSV.exists():
-        return []
-
-    with REMINDER_CSV.open(newline="", encoding="utf-8") as f:
-        reader = csv.reader(f)
-
-        width = len(REMINDER_FIELDS)
-        rows = []
-
-        for row in reader:
-            # add missing columns
-            if len(row) < width:
-                row = row + [""] * (width - len(row))
-
-            # trim excess columns
-            elif len(row) > width:
-                row = row[:width]
-
-            rows.append(row)
-
-    return rows
+    return _load_rows(REMINDER_CSV, REMINDER_FIELDS)
 
 #----------------------------------------------------------------------
 # load_progress
@@ -142,27 +370,7 @@ PROGRESS_FIELDS = [
 
 
 def load_progress():
-    if not PROGRESS_CSV.exists():
-        return []
-
-    with PROGRESS_CSV.open(newline="", encoding="utf-8") as f:
-        reader = csv.reader(f)
-
-        width = len(PROGRESS_FIELDS)
-        rows = []
-
-        for row in reader:
-            # add missing columns
-            if len(row) < width:
-                row = row + [""] * (width - len(row))
-
-            # trim excess columns
-            elif len(row) > width:
-                row = row[:width]
-
-            rows.append(row)
-
-    return rows
+    return _load_rows(PROGRESS_CSV, PROGRESS_FIELDS)
 
 #----------------------------------------------------------------------
 # new_id
@@ -174,93 +382,45 @@ def new_id() -> str:
 # save_hunt
 def save_hunt(rows):
     """
-    Overwrite hunt.csv with the given rows (list-of-lists).
+    Write the given rows (list-of-lists) to hunt.csv.
     - Does NOT write a header row; CSV is data-only.
+    - "journal" backend: appends only the changed rows to the journal.
     - Normalizes each row length to match HUNT_FIELDS width.
     """
-    DATA_DIR.mkdir(exist_ok=True)
-
-    width = len(HUNT_FIELDS)
-
-    with HUNT_CSV.open("w", newline="", encoding="utf-8") as f:
-        writer = csv.writer(f)
-
-        for row in rows:
-            if len(row) < width:
-                row = row + [""] * (width - len(row))
-            elif len(row) > width:
-                row = row[:width]
-
-            writer.writerow(row)
+    _save_rows(HUNT_CSV, HUNT_FIELDS, rows)
 
 #----------------------------------------------------------------------
 # save_company
 def save_company(rows):
     """
-    Overwrite company.csv with the given rows (list-of-lists).
+    Write the given rows (list-of-lists) to company.csv.
     - Does NOT write a header row; CSV is data-only.
+    - "journal" backend: appends only the changed rows to the journal.
     - Normalizes each row length to match COMPANY_FIELDS width.
     """
-    DATA_DIR.mkdir(exist_ok=True)
-
-    width = len(COMPANY_FIELDS)
-
-    with COMPANY_CSV.open("w", newline="", encoding="utf-8") as f:
-        writer = csv.writer(f)
-
-        for row in rows:
-            if len(row) < width:
-                row = row + [""] * (width - len(row))
-            elif len(row) > width:
-                row = row[:width]
-
-            writer.writerow(row)
+    _save_rows(COMPANY_CSV, COMPANY_FIELDS, rows)
 
 #----------------------------------------------------------------------
 # save_reminder
 def save_reminder(rows):
     """
-    Overwrite reminder.csv with the given rows (list-of-lists).
+    Write the given rows (list-of-lists) to reminder.csv.
     - Does NOT write a header row; CSV is data-only.
+    - "journal" backend: appends only the changed rows to the journal.
     - Normalizes each row length to match REMINDER_FIELDS width.
     """
-    DATA_DIR.mkdir(exist_ok=True)
-
-    width = len(REMINDER_FIELDS)
-
-    with REMINDER_CSV.open("w", newline="", encoding="utf-8") as f:
-        writer = csv.writer(f)
-
-        for row in rows:
-            if len(row) < width:
-                row = row + [""] * (width - len(row))
-            elif len(row) > width:
-                row = row[:width]
-
-            writer.writerow(row)
+    _save_rows(REMINDER_CSV, REMINDER_FIELDS, rows)
 
 #----------------------------------------------------------------------
 # save_progress
 def save_progress(rows):
     """
-    Overwrite progress.csv with the given rows (list-of-lists).
+    Write the given rows (list-of-lists) to progress.csv.
     - Does NOT write a header row; CSV is data-only.
+    - "journal" backend: appends only the changed rows to the journal.
     - Normalizes each row length to match PROGRESS_FIELDS width.
     """
-    DATA_DIR.mkdir(exist_ok=True)
-
-    width = len(PROGRESS_FIELDS)
-
-    with PROGRESS_CSV.open("w", newline="", encoding="utf-8") as f:
-        writer = csv.writer(f)
-
-        for row in rows:
-            if len(row) < width:
-                row = row + [""] * (width - len(row))
-            elif len(row) > width:
-                row = row[:width]
-
-            writer.writerow(row)
+    _save_rows(PROGRESS_CSV, PROGRESS_FIELDS, rows)
 
 #----------------------------------------------------------------------
 # personal details JSON
@@ -309,6 +469,17 @@ def load_personal_details():
 
 
 def save_personal_details(data: dict):
+    """
+    Write personalDetails.json, unless it already holds exactly this data
+    (an unchanged file keeps its mtime, so profile_digest is not rebuilt).
+    """
+    try:
+        with open(PERSONAL_FILE, "r", encoding="utf-8") as f:
+            if json.load(f) == data:
+                return
+    except Exception:
+        pass
+
     os.makedirs(os.path.dirname(PERSONAL_FILE), exist_ok=True)
     with open(PERSONAL_FILE, "w", encoding="utf-8") as f:
         json.dump(data, f, indent=2, ensure_ascii=False)
@@ -0,0 +1,187 @@
+# profile_digest.py
+"""
+Compact, versioned form of the personal details for AI prompts.
+
+Every email / resume generation sends the user's personal details as
+context["personal"]. personal_for_prompt() returns a digest of them
+instead: same keys, but whitespace collapsed, empty education / work /
+skill entries and duplicates dropped, and long free-form text (e.g. the
+"about" field) trimmed to MAX_TEXT_CHARS. Education / work / skill
+entries are never trimmed: they are the resume's content. Contact fields
+are kept as-is (the resume header and the email "To" fallback use them).
+
+The digest is built once per version of personalDetails.json and reused:
+
+  - in memory, until the file's mtime/size changes (save_personal_details
+    only rewrites the file when the data actually changed)
+  - on disk in DIGEST_FILE, keyed by DIGEST_VERSION + a hash of the source
+    data, so a restart does not rebuild it either
+
+digest()["version"] identifies the content; because the digest is stable,
+ai_cache keys for unchanged profiles stay stable too. Token estimates for
+the full and compacted forms are kept on the digest and recorded as a
+"profile.digest" tracing span whenever it is rebuilt.
+"""
+import hashlib
+import json
+import os
+import re
+import threading
+
+from app_paths import DATA_DIR
+import model as m
+import tracing
+
+DIGEST_FILE = DATA_DIR / "personalDigest.json"
+
+# Bump when build_digest() changes so stored digests are rebuilt
+DIGEST_VERSION = 2
+
+# Free-text fields outside LIST_KEYS / CONTACT_KEYS (e.g. about) are cut to
+# this many characters
+MAX_TEXT_CHARS = 600
+
+CONTACT_KEYS = ["name", "email", "linkedinId", "githubAcc", "phone", "address"]
+LIST_KEYS = ["education", "work", "skills"]
+
+_WS = re.compile(r"\s+")
+
+
+#----------------------------------------------------------------------
+# Building
+def _compact_text(value, limit: int = None) -> str:
+    text = _WS.sub(" ", str(value or "")).strip()
+    if limit and len(text) > limit:
+        cut = text[:limit]
+        # Prefer ending on a word boundary
+        space = cut.rfind(" ")
+        if space > limit * 0.8:
+            cut = cut[:space]
+        text = cut.rstrip(" ,;:-") + "…"
+    return text
+
+
+def _compact_entries(entries):
+    """
+    List of dicts -> non-empty, de-duplicated entries with whitespace
+    collapsed (not trimmed).
+    """
+    out = []
+    seen = set()
+    for entry in entries or []:
+        if not isinstance(entry, dict):
+            continue
+        compact = {k: _compact_text(v) for k, v in entry.items()}
+        if not any(compact.values()):
+            continue
+        key = json.dumps(compact, sort_keys=True, ensure_ascii=False)
+        if key in seen:
+            continue
+        seen.add(key)
+        out.append(compact)
+    return out
+
+
+def build_digest(personal: dict) -> dict:
+    """Personal details -> compacted personal details (same keys)."""
+    digest = {}
+    for key, value in personal.items():
+        if key in LIST_KEYS:
+            digest[key] = _compact_entries(value)
+        elif key in CONTACT_KEYS:
+            digest[key] = _compact_text(value)
+        else:
+            digest[key] = _compact_text(value, MAX_TEXT_CHARS)
+    return digest
+
+
+def source_hash(personal: dict) -> str:
+    data = json.dumps(personal, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+
+#----------------------------------------------------------------------
+# Cached access
+_lock = threading.Lock()
+_cached = None        # digest record
+_cached_stat = None   # (mtime_ns, size) of PERSONAL_FILE it was built from
+
+
+def _file_stat():
+    try:
+        st = os.stat(m.PERSONAL_FILE)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+def _load_stored(expected_version: str):
+    try:
+        with open(DIGEST_FILE, "r", encoding="utf-8") as f:
+            record = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if record.get("version") != expected_version:
+        return None
+    return record
+
+
+def _store(record):
+    try:
+        DIGEST_FILE.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = DIGEST_FILE.with_name(DIGEST_FILE.name + ".tmp")
+        tmp_path.write_text(json.dumps(record, ensure_ascii=False, indent=2), encoding="utf-8")
+        os.replace(tmp_path, DIGEST_FILE)
+    except OSError as e:
+        print("Error writing profile digest:", e)
+
+
+def _build_record(personal: dict) -> dict:
+    version = f"{DIGEST_VERSION}-{source_hash(personal)[:16]}"
+
+    record = _load_stored(version)
+    if record is not None:
+        return record
+
+    with tracing.span("profile.digest") as s:
+        compact = build_digest(personal)
+        record = {
+            "version": version,
+            "personal": compact,
+            "tokens_full": tracing.estimate_tokens(personal),
+            "tokens_digest": tracing.estimate_tokens(compact),
+        }
+        s.set("in_tokens", record["tokens_full"])
+        s.set("out_tokens", record["tokens_digest"])
+
+    _store(record)
+    return record
+
+
+def digest() -> dict:
+    """
+    {"version", "personal", "tokens_full", "tokens_digest"} for the current
+    personal details; rebuilt only when personalDetails.json changed.
+    """
+    global _cached, _cached_stat
+
+    stat = _file_stat()
+    with _lock:
+        if _cached is not None and stat == _cached_stat:
+            return _cached
+
+        record = _build_record(m.load_personal_details())
+        _cached, _cached_stat = record, stat
+        return record
+
+
+def personal_for_prompt() -> dict:
+    """The compacted personal details to put in context["personal"]."""
+    return dict(digest()["personal"])
+
+
+def invalidate():
+    global _cached, _cached_stat
+    with _lock:
+        _cached = None
+        _cached_stat = None
@@ -0,0 +1,278 @@
+# reminder_scheduler.py
+"""
+Fire Pending reminders when they come due.
+
+Pending reminders sit in a min-heap keyed by their parsed dateTime. The
+scheduler sleeps (root.after) until the earliest one is due, pops every
+due entry, and hands them to ReminderAlertWindow; nothing scans the
+reminder list on a timer.
+
+Updates are incremental per hunt: the repository's reminder table tells
+the scheduler which huntId buckets changed (add / edit / delete), and
+refresh_hunt() re-reads only that hunt's reminders. Entries that are
+removed or re-dated are not dug out of the heap; they are skipped when
+they surface (lazy deletion) and the heap is rebuilt if it fills up with
+such leftovers.
+
+Mark Done / Snooze from the alert window are written to disk right away
+(model.upsert_rows), not left for the next Save. Which reminders were
+already shown is kept in memory only. A reminder that was shown but
+neither marked done nor snoozed is still Pending, so it pops up again
+after a restart (it is overdue by then).
+"""
+import heapq
+from datetime import datetime, timedelta
+
+import model as m
+import repository
+
+DATE_FORMATS = ("%Y-%m-%d %H:%M:%S", "%Y-%m-%d %H:%M", "%Y-%m-%d")
+
+# Re-check at least this often (clock changes, sleep/resume)
+MAX_SLEEP_MS = 10 * 60 * 1000
+
+SNOOZE_MINUTES = 15
+
+
+def parse_due(value):
+    value = (value or "").strip()
+    for fmt in DATE_FORMATS:
+        try:
+            return datetime.strptime(value, fmt)
+        except ValueError:
+            continue
+    return None
+
+
+class ReminderScheduler:
+    def __init__(self, root, controller, on_due=None):
+        """
+        on_due(rows) is called on the Tk thread with the reminder rows that
+        just came due (default: show them in ReminderAlertWindow).
+        """
+        self.root = root
+        self.controller = controller
+        self.on_due = on_due or self._show_alert
+
+        self._heap = []         # (due, reminder_id)
+        self._due = {}          # reminder_id -> due (live entries only)
+        self._hunt_of = {}      # reminder_id -> huntId
+        self._by_hunt = {}      # huntId -> {reminder_id}
+        self._fired = {}        # reminder_id -> due it was already shown for (this session)
+
+        self._after_job = None
+        self._stale_hunts = set()
+        self._stale_all = False
+        self._refresh_job = None
+        self._alert = None
+
+        repo = repository.for_controller(controller)
+        repo.reminders.add_listener(self._on_reminders_changed)
+
+    # ------------------------------------------------------------------
+    # Building / updating the heap
+    # ------------------------------------------------------------------
+    def start(self):
+        self.rebuild()
+
+    def stop(self):
+        if self._after_job is not None:
+            self.root.after_cancel(self._after_job)
+            self._after_job = None
+
+    def rebuild(self):
+        """Load every Pending reminder (start-up, or after a full reload)."""
+        repo = repository.for_controller(self.controller)
+        self._heap = []
+        self._due = {}
+        self._hunt_of = {}
+        self._by_hunt = {}
+
+        for row in repo.reminders.rows:
+            self._put_row(row, push=False)
+        self._heap = [(due, rid) for rid, due in self._due.items()]
+        heapq.heapify(self._heap)
+
+        # Forget notifications for reminders that no longer exist
+        self._fired = {rid: due for rid, due in self._fired.items() if rid in repo.reminders.by_id}
+        self._reschedule()
+
+    def refresh_hunt(self, hunt_id=None):
+        """Re-read the reminders of one hunt (None: all of them)."""
+        if hunt_id is None:
+            self.rebuild()
+            return
+
+        repo = repository.for_controller(self.controller)
+        id_idx = m.REMINDER_FIELDS.index("id")
+
+        rows = repo.reminders.find("huntId", hunt_id)
+        current = {row[id_idx] for row in rows}
+        for rid in list(self._by_hunt.get(hunt_id, ())):
+            if rid not in current:
+                self._remove(rid)
+        for row in rows:
+            self._put_row(row)
+
+        self._compact_if_needed()
+        self._reschedule()
+
+    def _put_row(self, row, push=True):
+        id_idx = m.REMINDER_FIELDS.index("id")
+        hunt_idx = m.REMINDER_FIELDS.index("huntId")
+        dt_idx = m.REMINDER_FIELDS.index("dateTime")
+        status_idx = m.REMINDER_FIELDS.index("status")
+
+        rid = row[id_idx] if len(row) > id_idx else ""
+        if not rid:
+            return
+
+        status = row[status_idx] if len(row) > status_idx else ""
+        due = parse_due(row[dt_idx] if len(row) > dt_idx else "")
+        if status == "Done" or due is None:
+            self._remove(rid)
+            return
+
+        # Already shown for this exact due time -> do not show again
+        if self._fired.get(rid) == due:
+            self._remove(rid)
+            return
+
+        hunt_id = row[hunt_idx] if len(row) > hunt_idx else ""
+        if self._hunt_of.get(rid) != hunt_id:
+            self._remove(rid)
+            self._hunt_of[rid] = hunt_id
+            self._by_hunt.setdefault(hunt_id, set()).add(rid)
+
+        if self._due.get(rid) == due:
+            return
+        self._due[rid] = due
+        if push:
+            heapq.heappush(self._heap, (due, rid))
+
+    def _remove(self, rid):
+        self._due.pop(rid, None)
+        hunt_id = self._hunt_of.pop(rid, None)
+        if hunt_id is not None:
+            ids = self._by_hunt.get(hunt_id)
+            if ids is not None:
+                ids.discard(rid)
+                if not ids:
+                    del self._by_hunt[hunt_id]
+
+    def _compact_if_needed(self):
+        if len(self._heap) > 2 * len(self._due) + 64:
+            self._heap = [(due, rid) for rid, due in self._due.items()]
+            heapq.heapify(self._heap)
+
+    # ------------------------------------------------------------------
+    # Change notifications from the repository
+    # ------------------------------------------------------------------
+    def _on_reminders_changed(self, keys):
+        if keys is None:
+            self._stale_all = True
+        else:
+            self._stale_hunts.add(keys.get("huntId"))
+
+        # Coalesce: a save touches many rows at once
+        if self._refresh_job is None:
+            self._refresh_job = self.root.after_idle(self._refresh_stale)
+
+    def _refresh_stale(self):
+        self._refresh_job = None
+        if self._stale_all:
+            self._stale_all = False
+            self._stale_hunts.clear()
+            self.rebuild()
+            return
+
+        stale, self._stale_hunts = self._stale_hunts, set()
+        for hunt_id in stale:
+            self.refresh_hunt(hunt_id)
+
+    # ------------------------------------------------------------------
+    # Timer
+    # ------------------------------------------------------------------
+    def next_due(self):
+        """(due, reminder_id) of the earliest live entry, or None."""
+        while self._heap:
+            due, rid = self._heap[0]
+            if self._due.get(rid) == due:
+                return due, rid
+            heapq.heappop(self._heap)
+        return None
+
+    def _reschedule(self):
+        if self._after_job is not None:
+            self.root.after_cancel(self._after_job)
+            self._after_job = None
+
+        head = self.next_due()
+        if head is None:
+            return
+
+        delay = (head[0] - datetime.now()).total_seconds() * 1000
+        delay = int(min(max(delay, 0), MAX_SLEEP_MS))
+        self._after_job = self.root.after(delay, self._on_timer)
+
+    def _on_timer(self):
+        self._after_job = None
+
+        repo = repository.for_controller(self.controller)
+        now = datetime.now()
+        due_rows = []
+        while True:
+            head = self.next_due()
+            if head is None or head[0] > now:
+                break
+            due, rid = heapq.heappop(self._heap)
+            self._remove(rid)
+            self._fired[rid] = due
+
+            row = repo.reminders.get(rid)
+            if row is not None:
+                due_rows.append(row)
+
+        if due_rows:
+            try:
+                self.on_due(due_rows)
+            except Exception as e:
+                print("Error showing due reminders:", e)
+
+        self._reschedule()
+
+    # ------------------------------------------------------------------
+    # Actions (used by ReminderAlertWindow)
+    # ------------------------------------------------------------------
+    def mark_done(self, reminder_id):
+        self._update_reminder(reminder_id, {"status": "Done"})
+
+    def snooze(self, reminder_id, minutes: int = SNOOZE_MINUTES):
+        due = datetime.now() + timedelta(minutes=minutes)
+        self._update_reminder(reminder_id, {"dateTime": due.strftime(DATE_FORMATS[0])})
+
+    def _update_reminder(self, reminder_id, values):
+        """Change one reminder in memory and on disk, then refresh its hunt."""
+        repo = repository.for_controller(self.controller)
+        row = repo.reminders.update(reminder_id, values)
+        if row is None:
+            return
+
+        try:
+            m.upsert_rows("reminder", [row])
+        except Exception as e:
+            print("Error saving reminder:", e)
+
+        hunt_id = row[m.REMINDER_FIELDS.index("huntId")]
+        view = getattr(self.controller, "view", None)
+        if view is not None and hasattr(view, "on_events_changed"):
+            view.on_events_changed(hunt_id)
+        else:
+            self.refresh_hunt(hunt_id)
+
+    def _show_alert(self, rows):
+        import ReminderAlertWindow as raw  # loaded on first use
+
+        if self._alert is None or not self._alert.winfo_exists():
+            self._alert = raw.ReminderAlertWindow(self.root, self.controller, self)
+        self._alert.add_reminders(rows)
@@ -0,0 +1,534 @@
+# repository.py
+"""
+Indexed in-memory view over the hunt / company / reminder / progress rows.
+
+The controller keeps plain list-of-lists (exactly what model.load_* returns).
+Repository wraps those SAME list objects and keeps dictionaries next to them:
+
+    - primary key:   id -> row
+    - hunts:         companyId -> {id: row}
+    - companies:     lower-cased name -> {id: row}
+    - reminders:     huntId -> {id: row}
+    - progress:      huntId -> {id: row}
+
+so lookups are O(1) instead of a walk over every row.
+
+Rows appended to the controller lists are picked up incrementally by sync(),
+and so are rows replaced in the list or whose id / indexed fields were
+edited in place; other in-place edits must be reported with touch() (or
+made via update()) so the table listeners hear about them. When several
+rows share an id, the first one is indexed and the others are held back
+until it is deleted (duplicate_ids() lists them).
+
+Per-hunt reminder/progress summaries live in repo.aggregates
+(hunt_aggregates.HuntAggregates) and are kept fresh through table listeners;
+so are the near-duplicate fingerprints in repo.duplicates (dedupe.DuplicateIndex)
+and the fuzzy company-name index in repo.company_matcher (company_match).
+Parsed numeric salary columns live in repo.salary (salary_columns).
+"""
+from operator import is_not, itemgetter, ne
+
+import model as m
+import company_match
+import dedupe
+import hunt_aggregates
+import salary_columns
+
+
+def _normalize_name(value) -> str:
+    return (value or "").strip().lower()
+
+
+def _normalize_key(value) -> str:
+    return (value or "").strip()
+
+
+#----------------------------------------------------------------------
+# _Table
+class _Table:
+    """
+    One entity table: the shared row list plus its id / secondary indexes.
+
+    indexes: {index_name: (field_name, normalize_fn)}
+    """
+
+    def __init__(self, fields, rows, indexes=None):
+        self.fields = fields
+        self.width = len(fields)
+        self.id_idx = fields.index("id")
+
+        self._index_specs = {}
+        for index_name, (field, normalize) in (indexes or {}).items():
+            self._index_specs[index_name] = (fields.index(field), normalize)
+
+        # Columns sync() compares to notice rows edited behind its back
+        self._watched = [self.id_idx] + [
+            col for col, _ in self._index_specs.values() if col != self.id_idx
+        ]
+
+        # fn(keys) after a row enters/leaves the indexes; keys is the row's
+        # {index_name: key} plus its "id", or None when the whole table was
+        # rebuilt
+        self._listeners = []
+        self._resetting = False
+
+        self.rows = rows
+        self._reset()
+
+    def add_listener(self, fn):
+        self._listeners.append(fn)
+
+    def _notify(self, keys):
+        for fn in self._listeners:
+            fn(keys)
+
+    # ------------------------------------------------------------------
+    # Internal bookkeeping
+    # ------------------------------------------------------------------
+    def _reset(self):
+        self.by_id = {}
+        self._extra = {}       # id -> later rows repeating an id (not indexed)
+        self._keys = {}        # id -> {index_name: key} (to un-index on change)
+        self._positions = {}   # id -> index in self.rows
+        self._positions_valid = True
+        self._indexes = {name: {} for name in self._index_specs}
+
+        self._resetting = True
+        try:
+            for i, row in enumerate(self.rows):
+                self._index_row(row, i)
+        finally:
+            self._resetting = False
+        self._capture()
+        self._notify(None)
+
+    def _cell(self, row, idx) -> str:
+        return row[idx] if len(row) > idx else ""
+
+    def _index_row(self, row, position):
+        row_id = self._cell(row, self.id_idx)
+        if not row_id:
+            # Still occupies a slot in the list; positions shift from here on
+            self._positions_valid = False
+            return
+
+        primary = self.by_id.get(row_id)
+        if primary is not None and primary is not row:
+            # Repeated id: the first row keeps it; this one is indexed once
+            # that row is gone (see _promote)
+            self._extra.setdefault(row_id, []).append(row)
+            self._positions_valid = False
+            return
+
+        self.by_id[row_id] = row
+        self._positions[row_id] = position
+
+        keys = {}
+        for index_name, (col, normalize) in self._index_specs.items():
+            key = normalize(self._cell(row, col))
+            keys[index_name] = key
+            self._indexes[index_name].setdefault(key, {})[row_id] = row
+        self._keys[row_id] = keys
+
+        if not self._resetting:
+            self._notify(dict(keys, id=row_id))
+
+    def _unindex_id(self, row_id, promote=True):
+        keys = self._keys.pop(row_id, {})
+        for index_name, key in keys.items():
+            bucket = self._indexes[index_name].get(key)
+            if bucket is not None:
+                bucket.pop(row_id, None)
+                if not bucket:
+                    del self._indexes[index_name][key]
+        self.by_id.pop(row_id, None)
+        self._positions.pop(row_id, None)
+        self._notify(dict(keys, id=row_id))
+        if promote:
+            self._promote(row_id)
+
+    def _promote(self, row_id):
+        """Index the next row repeating row_id, now that the id is free."""
+        extra = self._extra.get(row_id)
+        if not extra or row_id in self.by_id:
+            return
+        row = extra.pop(0)
+        if not extra:
+            del self._extra[row_id]
+        self._index_row(row, 0)
+        self._positions_valid = False
+
+    def _unindex_row(self, row, row_id, promote=True):
+        """Drop one row object that was indexed (or held back) under row_id."""
+        if not row_id:
+            return
+        if self.by_id.get(row_id) is row:
+            self._unindex_id(row_id, promote)
+            return
+        extra = self._extra.get(row_id)
+        if extra:
+            self._extra[row_id] = [r for r in extra if r is not row]
+            if not self._extra[row_id]:
+                del self._extra[row_id]
+
+    def _rebuild_positions(self):
+        self._positions = {}
+        for i, row in enumerate(self.rows):
+            row_id = self._cell(row, self.id_idx)
+            if row_id and self.by_id.get(row_id) is row:
+                self._positions[row_id] = i
+        self._positions_valid = True
+
+    # ------------------------------------------------------------------
+    # Change detection (what the indexes were built from)
+    # ------------------------------------------------------------------
+    def _column(self, col):
+        try:
+            return list(map(itemgetter(col), self.rows))
+        except IndexError:
+            return [self._cell(row, col) for row in self.rows]
+
+    def _capture(self):
+        """
+        Remember the row objects and their id / indexed cells, so sync()
+        can spot rows replaced or re-keyed behind the table's back.
+        """
+        self._seen_rows = list(self.rows)
+        self._seen_cols = [self._column(col) for col in self._watched]
+
+    def _capture_append(self, row):
+        self._seen_rows.append(row)
+        for col, values in zip(self._watched, self._seen_cols):
+            values.append(self._cell(row, col))
+
+    def _changed_positions(self, n):
+        """Positions below n whose row object or id / indexed cells changed."""
+        rows, seen_rows = self.rows, self._seen_rows
+        cols = [self._column(col) for col in self._watched]
+        if not any(map(is_not, rows[:n], seen_rows)) and not any(
+            any(map(ne, current[:n], seen)) for current, seen in zip(cols, self._seen_cols)
+        ):
+            return []
+        return [
+            i for i in range(n)
+            if rows[i] is not seen_rows[i]
+            or any(current[i] != seen[i] for current, seen in zip(cols, self._seen_cols))
+        ]
+
+    # ------------------------------------------------------------------
+    # Keeping up with the shared list
+    # ------------------------------------------------------------------
+    def sync(self, rows=None):
+        """
+        Bring the indexes up to date with the shared row list.
+
+        - a different list object (e.g. company_rows reassigned) -> rebuild
+        - the same list, shorter than last time -> rebuild
+        - rows replaced, or their id / indexed fields edited in place
+          (same length) -> re-index just those rows
+        - the same list, longer -> index only the appended tail
+        """
+        if rows is not None and rows is not self.rows:
+            self.rows = rows
+            self._reset()
+            return
+
+        n = len(self.rows)
+        seen = len(self._seen_rows)
+        if n < seen:
+            self._reset()
+            return
+
+        changed = self._changed_positions(seen)
+        old_ids = [self._seen_cols[0][i] for i in changed]
+        # Out first, then in, so a row keeps its id when it was only re-keyed
+        for i, old_id in zip(changed, old_ids):
+            self._unindex_row(self._seen_rows[i], old_id, promote=False)
+        for i in changed:
+            self._index_row(self.rows[i], i)
+        for old_id in old_ids:
+            self._promote(old_id)
+        if changed:
+            self._positions_valid = False
+
+        for i in range(seen, n):
+            self._index_row(self.rows[i], i)
+
+        if changed or n != seen:
+            self._capture()
+
+    def touch(self, row):
+        """Re-index a row that was edited in place."""
+        self.sync()
+        row_id = self._cell(row, self.id_idx)
+        if not row_id or self.by_id.get(row_id) is not row:
+            # Id-less, or repeating another row's id: nothing indexed to refresh
+            return
+
+        position = self._positions.get(row_id)
+        self._unindex_id(row_id, promote=False)
+        self._index_row(row, position if position is not None else 0)
+        if position is None:
+            self._positions_valid = False
+
+    def reindex(self):
+        """Rebuild every index from the shared list (after bulk in-place edits)."""
+        self._reset()
+
+    def duplicate_ids(self):
+        """Ids used by more than one row (only the first such row is indexed)."""
+        return list(self._extra)
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+    def get(self, row_id):
+        return self.by_id.get(row_id)
+
+    def index_of(self, row_id):
+        """List position of a row (== sheet row for hunts), or None."""
+        if row_id not in self.by_id:
+            return None
+        if not self._positions_valid:
+            self._rebuild_positions()
+        return self._positions.get(row_id)
+
+    def find(self, index_name, key):
+        """Rows whose indexed field matches key (normalized like the index)."""
+        _, normalize = self._index_specs[index_name]
+        bucket = self._indexes[index_name].get(normalize(key))
+        return list(bucket.values()) if bucket else []
+
+    def has(self, index_name, key) -> bool:
+        _, normalize = self._index_specs[index_name]
+        return bool(self._indexes[index_name].get(normalize(key)))
+
+    def keys(self, index_name):
+        return self._indexes[index_name].keys()
+
+    # ------------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------------
+    def normalize_row(self, row):
+        row = list(row)
+        if len(row) < self.width:
+            row = row + [""] * (self.width - len(row))
+        elif len(row) > self.width:
+            row = row[:self.width]
+        return row
+
+    def insert(self, row):
+        """Append a row (an id is generated if missing); returns the row."""
+        self.sync()
+        row = self.normalize_row(row)
+        if not row[self.id_idx]:
+            row[self.id_idx] = m.new_id()
+
+        self.rows.append(row)
+        self._index_row(row, len(self.rows) - 1)
+        self._capture_append(row)
+        return row
+
+    def update(self, row_id, values: dict):
+        """Set fields (by name) on an existing row; returns the row or None."""
+        self.sync()
+        row = self.by_id.get(row_id)
+        if row is None:
+            return None
+
+        if len(row) < self.width:
+            row.extend([""] * (self.width - len(row)))
+
+        for field, value in values.items():
+            row[self.fields.index(field)] = value
+
+        self.touch(row)
+        return row
+
+    def delete(self, row_id):
+        """Remove a row by id; returns the removed row or None."""
+        self.sync()
+        if row_id not in self.by_id:
+            return None
+
+        position = self.index_of(row_id)
+        row = self.rows.pop(position)
+        # Another row repeating the id (if any) takes over the id
+        self._unindex_id(row_id)
+        self._capture()
+
+        # Everything after the removed row moved up by one
+        if position != len(self.rows):
+            self._positions_valid = False
+        return row
+
+    def delete_at(self, position):
+        """Remove a row by list position (e.g. a sheet row index)."""
+        self.sync()
+        if not 0 <= position < len(self.rows):
+            return None
+
+        row = self.rows.pop(position)
+        self._unindex_row(row, self._seen_cols[0][position])
+        self._capture()
+        if position != len(self.rows):
+            self._positions_valid = False
+        return row
+
+    def replace_all(self, rows):
+        """Swap the contents of the shared list in place and re-index."""
+        self.rows[:] = rows
+        self._reset()
+
+
+#----------------------------------------------------------------------
+# Repository
+class Repository:
+    def __init__(self, hunt_rows, company_rows, reminder_rows, progress_rows):
+        self.hunts = _Table(
+            m.HUNT_FIELDS,
+            hunt_rows,
+            {"companyId": ("companyId", _normalize_key)},
+        )
+        self.companies = _Table(
+            m.COMPANY_FIELDS,
+            company_rows,
+            {"name": ("name", _normalize_name)},
+        )
+        self.reminders = _Table(
+            m.REMINDER_FIELDS,
+            reminder_rows,
+            {"huntId": ("huntId", _normalize_key)},
+        )
+        self.progress = _Table(
+            m.PROGRESS_FIELDS,
+            progress_rows,
+            {"huntId": ("huntId", _normalize_key)},
+        )
+        self.aggregates = hunt_aggregates.HuntAggregates(self.reminders, self.progress)
+        self.duplicates = dedupe.DuplicateIndex(self.hunts)
+        self.company_matcher = company_match.CompanyMatcher(self.companies)
+        self.salary = salary_columns.SalaryColumns(self.hunts)
+
+    @classmethod
+    def load(cls):
+        """Build a repository straight from the model files."""
+        return cls(
+            m.load_hunt(),
+            m.load_company(),
+            m.load_reminder(),
+            m.load_progress(),
+        )
+
+    def bind(self, controller):
+        """
+        Re-point every table at the controller's current lists (the controller
+        may have reassigned one) and index any rows appended since last time.
+        """
+        self.hunts.sync(controller.hunt_rows)
+        self.companies.sync(controller.company_rows)
+        self.reminders.sync(controller.reminder_rows)
+        self.progress.sync(controller.progress_rows)
+
+    # ------------------------------------------------------------------
+    # Hunts
+    # ------------------------------------------------------------------
+    def get_hunt(self, hunt_id):
+        return self.hunts.get(hunt_id)
+
+    def hunt_index(self, hunt_id):
+        return self.hunts.index_of(hunt_id)
+
+    def hunts_for_company(self, company_id):
+        return self.hunts.find("companyId", company_id)
+
+    def hunt_indices_for_company(self, company_id):
+        """hunt_rows positions (== main sheet rows) of hunts using company_id."""
+        id_idx = self.hunts.id_idx
+        indices = []
+        for row in self.hunts_for_company(company_id):
+            position = self.hunts.index_of(row[id_idx])
+            if position is not None:
+                indices.append(position)
+        return sorted(indices)
+
+    def hunt_context(self, hunt_id) -> dict:
+        """
+        {"hunt": {...}, "company": {...}} field dicts for a hunt, the shape
+        the AI services take as context (empty dicts when not found).
+        """
+        hunt = dict(zip(m.HUNT_FIELDS, self.get_hunt(hunt_id) or []))
+        company = dict(zip(m.COMPANY_FIELDS, self.get_company(hunt.get("companyId", "")) or []))
+        return {"hunt": hunt, "company": company}
+
+    def is_company_used(self, company_id) -> bool:
+        if not company_id:
+            return False
+        return self.hunts.has("companyId", company_id)
+
+    # ------------------------------------------------------------------
+    # Companies
+    # ------------------------------------------------------------------
+    def get_company(self, company_id):
+        return self.companies.get(company_id)
+
+    def find_company_by_name(self, name):
+        """First company whose name matches (case/whitespace-insensitive)."""
+        if not _normalize_name(name):
+            return None
+        matches = self.companies.find("name", name)
+        return matches[0] if matches else None
+
+    def resolve_company(self, name):
+        """
+        Existing company a typed / parsed name refers to: an exact match, else
+        a fuzzy one ("K3 Capital Group" for "K3 Capital Group Sdn Bhd").
+        """
+        return self.find_company_by_name(name) or self.company_matcher.resolve(name)
+
+    def match_companies(self, name, limit=10):
+        """Companies whose names resemble name: [(row, score)], best first."""
+        return self.company_matcher.matches(name, limit)
+
+    def company_names(self):
+        """Distinct, non-empty company names in list order."""
+        name_idx = m.COMPANY_FIELDS.index("name")
+        names = []
+        seen = set()
+        for row in self.companies.rows:
+            name = row[name_idx] if len(row) > name_idx else ""
+            if name and name not in seen:
+                seen.add(name)
+                names.append(name)
+        return names
+
+    # ------------------------------------------------------------------
+    # Reminders / Progress
+    # ------------------------------------------------------------------
+    def reminders_for_hunt(self, hunt_id):
+        return self.reminders.find("huntId", hunt_id)
+
+    def progress_for_hunt(self, hunt_id):
+        return self.progress.find("huntId", hunt_id)
+
+
+#----------------------------------------------------------------------
+# for_controller
+def for_controller(controller) -> Repository:
+    """
+    Return the repository attached to the controller, creating it on first use.
+
+    Windows call this instead of scanning controller.*_rows themselves.
+    """
+    repo = getattr(controller, "repo", None)
+    if repo is None:
+        repo = Repository(
+            controller.hunt_rows,
+            controller.company_rows,
+            controller.reminder_rows,
+            controller.progress_rows,
+        )
+        controller.repo = repo
+    else:
+        repo.bind(controller)
+    return repo
@@ -1,33 +1,200 @@
 # resume_service.py
-from typing import Dict, Any
+"""
+Resume generation: AI structure (generate_resume_structure) and DOCX output.
+
+DOCX output is template based. The base document (TEMPLATE_PATH if the
+user has put one there, otherwise python-docx's default) is "compiled" once:
+the paragraph styles the resume uses are added if missing (a template
+without "List Bullet" gets "Normal" paragraphs with a "• " prefix), one
+prototype paragraph is built per style, and the result is kept in memory. Each render
+clones the base document and fills the sections from the resume JSON with
+copies of the prototypes, so no fonts are set and no styles are looked up
+per paragraph.
+
+render_resumes() renders many resumes in a process pool; each worker
+compiles the template once and reuses it for every job it gets. Frozen
+builds rely on main.py calling multiprocessing.freeze_support().
+"""
+import copy
+import io
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, Any, Callable, Iterable, List, Optional, Tuple
 from pathlib import Path
 
-from docx import Document
-from docx.shared import Pt
+from app_paths import DATA_DIR
+import ai_cache
+import ai_stream
 
-from ai_service import generate_resume_structure as _ai_generate_resume_structure
+# docx and ai_service are imported on first use: both are slow to load and
+# only needed once the user actually generates a resume.
 
+# Optional user template (page setup, fonts, letterhead); styles below are
+# added to it when missing, and anything already in its body is kept on top
+TEMPLATE_PATH = DATA_DIR / "templates" / "resume_template.docx"
 
-def generate_resume_structure(context: Dict[str, Any]) -> Dict[str, Any]:
+RENDER_WORKERS = 4
+
+# Paragraph styles used by the renderer: name -> (base style, size pt, bold)
+RESUME_STYLES = {
+    "Resume Name":    ("Normal", 18, True),
+    "Resume Heading": ("Normal", 12, True),
+    "Resume Project": ("Normal", None, True),
+}
+
+
+def generate_resume_structure(context: Dict[str, Any], refresh: bool = False) -> Dict[str, Any]:
     """
     Thin wrapper so the rest of the app can call
     resume_service.generate_resume_structure(...)
     but the actual model call lives in ai_service.
+    Identical contexts are answered from ai_cache unless refresh=True.
     """
-    return _ai_generate_resume_structure(context)
+    from ai_service import generate_resume_structure as _ai_generate_resume_structure
+
+    return ai_cache.cached_call(
+        "resume_structure", _ai_generate_resume_structure, context, refresh=refresh
+    )
+
+
+def start_resume_structure(widget, context: Dict[str, Any], on_text, on_done, on_error,
+                           refresh: bool = False):
+    """
+    generate_resume_structure in the background: the JSON text is passed to
+    on_text as the model writes it (when ai_service has
+    stream_resume_structure), then the parsed structure to on_done.
+    Returns the task (task.cancel() stops it).
+    """
+    import ai_service
+
+    return ai_stream.start(
+        widget,
+        "resume_structure",
+        context,
+        stream_fn=getattr(ai_service, "stream_resume_structure", None),
+        fallback_fn=ai_service.generate_resume_structure,
+        assemble=ai_stream.assemble_json,
+        to_text=ai_stream.json_text,
+        on_text=on_text,
+        on_done=on_done,
+        on_error=on_error,
+        refresh=refresh,
+    )
 
 
 def _set_paragraph_font(paragraph, size: int = 11, bold: bool = False):
     # Currently unused, but kept in case you want to style later.
+    from docx.shared import Pt
+
     for run in paragraph.runs:
         font = run.font
         font.size = Pt(size)
         font.bold = bold
 
 
-def build_resume_docx(resume: Dict[str, Any], out_path: Path | str) -> None:
+class CompiledTemplate:
+    """
+    Base document as .docx bytes, plus one prototype paragraph (<w:p> with
+    its style already resolved) per style the renderer uses. Rendering
+    clones the bytes and deep-copies prototypes instead of looking styles
+    up by name for every paragraph. prefixes: text put in front of the
+    paragraphs of a style the template lacks (rendered as "Normal").
     """
-    Build a simple resume from the structured JSON:
+
+    def __init__(self, data: bytes, protos: Dict[str, Any], prefixes: Optional[Dict[str, str]] = None):
+        self.data = data
+        self.protos = protos
+        self.prefixes = prefixes or {}
+
+    def new_document(self):
+        from docx import Document
+
+        return Document(io.BytesIO(self.data))
+
+    def paragraph_writer(self, doc):
+        """add(text="", style="Normal") appending to doc's body."""
+        body = doc.element.body
+        sect_pr = body.sectPr
+        protos = self.protos
+        prefixes = self.prefixes
+
+        def add(text: str = "", style: str = "Normal"):
+            p = copy.deepcopy(protos[style])
+            if text and style in prefixes:
+                text = prefixes[style] + text
+            if text:
+                p.add_r().text = text
+            if sect_pr is not None:
+                sect_pr.addprevious(p)
+            else:
+                body.append(p)
+
+        return add
+
+
+def _compile_template(template_path: Path | str | None) -> CompiledTemplate:
+    """Load the base document, add missing resume styles, build prototypes."""
+    from docx import Document
+    from docx.enum.style import WD_STYLE_TYPE
+    from docx.shared import Pt
+
+    path = Path(template_path) if template_path else None
+    doc = Document(str(path)) if path is not None and path.exists() else Document()
+
+    existing = {style.name for style in doc.styles}
+    for name, (base, size, bold) in RESUME_STYLES.items():
+        if name in existing:
+            continue
+        style = doc.styles.add_style(name, WD_STYLE_TYPE.PARAGRAPH)
+        style.base_style = doc.styles[base]
+        if size:
+            style.font.size = Pt(size)
+        style.font.bold = bold
+
+    # "List Bullet" needs numbering definitions a bare template may not have
+    prefixes = {}
+    if "List Bullet" not in existing:
+        prefixes["List Bullet"] = "• "
+
+    protos = {}
+    for name in ["Normal", "List Bullet", *RESUME_STYLES]:
+        style = "Normal" if name in prefixes else name
+        p = doc.add_paragraph(style=style)._p
+        p.getparent().remove(p)
+        protos[name] = p
+
+    buf = io.BytesIO()
+    doc.save(buf)
+    return CompiledTemplate(buf.getvalue(), protos, prefixes)
+
+
+# (path, mtime) -> CompiledTemplate; recompiled when the file changes
+_TEMPLATES: Dict[Tuple[str, float], CompiledTemplate] = {}
+
+
+def compiled_template(template_path: Path | str | None = None) -> CompiledTemplate:
+    path = Path(template_path) if template_path else TEMPLATE_PATH
+    try:
+        mtime = path.stat().st_mtime
+    except OSError:
+        mtime = 0.0
+    key = (str(path), mtime)
+
+    template = _TEMPLATES.get(key)
+    if template is None:
+        _TEMPLATES.clear()
+        template = _TEMPLATES[key] = _compile_template(path)
+    return template
+
+
+def clear_template_cache():
+    _TEMPLATES.clear()
+
+
+def _fill_resume(add, resume: Dict[str, Any]) -> None:
+    """
+    Write the resume sections through add(text, style) from the structured
+    JSON:
 
     {
       "meta": {...},
@@ -40,13 +207,6 @@ def build_resume_docx(resume: Dict[str, Any], out_path: Path | str) -> None:
       "extras": [...]
     }
     """
-    # Normalise path & ensure folder exists
-    if isinstance(out_path, str):
-        out_path = Path(out_path)
-    out_path.parent.mkdir(parents=True, exist_ok=True)
-
-    doc = Document()
-
     meta = resume.get("meta", {}) or {}
     header = resume.get("header", {}) or {}
     summary = resume.get("summary", "") or ""
@@ -56,6 +216,12 @@ def build_resume_docx(resume: Dict[str, Any], out_path: Path | str) -> None:
     projects = resume.get("projects", []) or []
     extras = resume.get("extras", []) or []
 
+    def add_bullets(items):
+        for b in items:
+            b = (b or "").strip()
+            if b:
+                add(b, style="List Bullet")
+
     # --------------------------------------------------
     # Header (Name + Contact)
     # --------------------------------------------------
@@ -66,11 +232,7 @@ def build_resume_docx(resume: Dict[str, Any], out_path: Path | str) -> None:
     github = header.get("github", "").strip()
     location = header.get("location", "").strip()
 
-    # Name big & bold
-    p_name = doc.add_paragraph()
-    run_name = p_name.add_run(name)
-    run_name.bold = True
-    run_name.font.size = Pt(18)
+    add(name, style="Resume Name")
 
     contact_parts = []
     if email:
@@ -85,145 +247,192 @@ def build_resume_docx(resume: Dict[str, Any], out_path: Path | str) -> None:
         contact_parts.append(location)
 
     if contact_parts:
-        p_contact = doc.add_paragraph(" | ".join(contact_parts))
-        p_contact.style = doc.styles["Normal"]
+        add(" | ".join(contact_parts))
 
     # Target role / headline line (optional)
     target_role = meta.get("targetRole", "").strip()
     if target_role:
-        p_role = doc.add_paragraph(target_role)
-        p_role.style = doc.styles["Normal"]
+        add(target_role)
 
     # Small spacer
-    doc.add_paragraph()
-
-    # Helper for section heading
-    def add_section_title(title: str):
-        if not title:
-            return
-        p = doc.add_paragraph()
-        r = p.add_run(title)
-        r.bold = True
-        r.font.size = Pt(12)
+    add()
 
     # --------------------------------------------------
     # Summary
     # --------------------------------------------------
     if summary.strip():
-        add_section_title("Summary")
-        doc.add_paragraph(summary.strip())
-        doc.add_paragraph()  # spacer
+        add("Summary", style="Resume Heading")
+        add(summary.strip())
+        add()  # spacer
 
     # --------------------------------------------------
     # Skills
     # --------------------------------------------------
     skills_clean = [s.strip() for s in skills if isinstance(s, str) and s.strip()]
     if skills_clean:
-        add_section_title("Skills")
-        for s in skills_clean:
-            para = doc.add_paragraph(style="List Bullet")
-            para.add_run(s)
-        doc.add_paragraph()
+        add("Skills", style="Resume Heading")
+        add_bullets(skills_clean)
+        add()
 
     # --------------------------------------------------
     # Experience
     # --------------------------------------------------
     if experience:
-        add_section_title("Experience")
+        add("Experience", style="Resume Heading")
         for exp in experience:
             title = (exp.get("title") or "").strip()
             company = (exp.get("company") or "").strip()
             loc = (exp.get("location") or "").strip()
             start = (exp.get("start") or "").strip()
             end = (exp.get("end") or "").strip()
-            bullets = exp.get("bullets", []) or []
 
-            header_parts = []
-            if title:
-                header_parts.append(title)
-            if company:
-                header_parts.append(company)
-            header_line = " – ".join(header_parts) if header_parts else ""
+            header_line = " – ".join(p for p in [title, company] if p)
 
             sub_parts = []
             if loc:
                 sub_parts.append(loc)
             if start or end:
                 sub_parts.append(f"{start} – {end}".strip(" –"))
-            sub_line = " | ".join(sub_parts) if sub_parts else ""
+            sub_line = " | ".join(sub_parts)
 
             if header_line:
-                doc.add_paragraph(header_line)
+                add(header_line)
             if sub_line:
-                p = doc.add_paragraph(sub_line)
-                p.style = doc.styles["Normal"]
-
-            for b in bullets:
-                b = (b or "").strip()
-                if not b:
-                    continue
-                para = doc.add_paragraph(style="List Bullet")
-                para.add_run(b)
+                add(sub_line)
 
-            doc.add_paragraph()  # spacer between jobs
+            add_bullets(exp.get("bullets", []) or [])
+            add()  # spacer between jobs
 
     # --------------------------------------------------
     # Education
     # --------------------------------------------------
     if education:
-        add_section_title("Education")
+        add("Education", style="Resume Heading")
         for edu in education:
             degree = (edu.get("degree") or "").strip()
             inst = (edu.get("institution") or "").strip()
-            bullets = edu.get("bullets", []) or []
 
             line = " – ".join(p for p in [degree, inst] if p)
             if line:
-                doc.add_paragraph(line)
+                add(line)
 
-            for b in bullets:
-                b = (b or "").strip()
-                if not b:
-                    continue
-                para = doc.add_paragraph(style="List Bullet")
-                para.add_run(b)
-
-            doc.add_paragraph()
+            add_bullets(edu.get("bullets", []) or [])
+            add()
 
     # --------------------------------------------------
     # Projects
     # --------------------------------------------------
     if projects:
-        add_section_title("Projects")
+        add("Projects", style="Resume Heading")
         for proj in projects:
             name_p = (proj.get("name") or "").strip()
-            bullets = proj.get("bullets", []) or []
-
             if name_p:
-                p = doc.add_paragraph()
-                r = p.add_run(name_p)
-                r.bold = True
-
-            for b in bullets:
-                b = (b or "").strip()
-                if not b:
-                    continue
-                para = doc.add_paragraph(style="List Bullet")
-                para.add_run(b)
+                add(name_p, style="Resume Project")
 
-            doc.add_paragraph()
+            add_bullets(proj.get("bullets", []) or [])
+            add()
 
     # --------------------------------------------------
     # Extras
     # --------------------------------------------------
     extras_clean = [e.strip() for e in extras if isinstance(e, str) and e.strip()]
     if extras_clean:
-        add_section_title("Additional")
-        for e in extras_clean:
-            para = doc.add_paragraph(style="List Bullet")
-            para.add_run(e)
+        add("Additional", style="Resume Heading")
+        add_bullets(extras_clean)
 
-    # --------------------------------------------------
-    # Save
-    # --------------------------------------------------
+
+def build_resume_docx(
+    resume: Dict[str, Any],
+    out_path: Path | str,
+    template_path: Path | str | None = None,
+) -> None:
+    """Render one resume (see _fill_resume for the JSON shape) to out_path."""
+    # Normalise path & ensure folder exists
+    if isinstance(out_path, str):
+        out_path = Path(out_path)
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+
+    template = compiled_template(template_path)
+    doc = template.new_document()
+    _fill_resume(template.paragraph_writer(doc), resume)
     doc.save(str(out_path))
+
+
+#----------------------------------------------------------------------
+# Batch rendering (process pool)
+def _init_render_worker(template_path):
+    # Compile the template once per worker process, before the first job
+    compiled_template(template_path)
+
+
+def _render_job(resume, out_path, template_path):
+    build_resume_docx(resume, out_path, template_path)
+    return str(out_path)
+
+
+def render_resumes(
+    jobs: Iterable[Tuple[Dict[str, Any], Path | str]],
+    template_path: Path | str | None = None,
+    max_workers: Optional[int] = None,
+    on_result: Optional[Callable[[int, str, Optional[BaseException]], None]] = None,
+    cancelled: Optional[Callable[[], bool]] = None,
+) -> List[Tuple[str, Optional[BaseException]]]:
+    """
+    Render (resume, out_path) jobs to DOCX in worker processes.
+
+    Returns [(out_path, error or None)] in job order. on_result(index,
+    out_path, error) is called, in the calling thread, as each job finishes;
+    when cancelled() turns true, jobs not yet started are dropped (their
+    error is None and out_path is "").
+    """
+    jobs = [(resume, str(out_path)) for resume, out_path in jobs]
+    results: List[Tuple[str, Optional[BaseException]]] = [("", None)] * len(jobs)
+    if not jobs:
+        return results
+
+    template_path = str(template_path) if template_path else str(TEMPLATE_PATH)
+    workers = max_workers or min(RENDER_WORKERS, os.cpu_count() or 1)
+    workers = max(1, min(workers, len(jobs)))
+
+    def record(i, error):
+        results[i] = (jobs[i][1], error)
+        if on_result is not None:
+            on_result(i, jobs[i][1], error)
+
+    # One job (or one worker): not worth starting processes
+    if workers == 1:
+        for i, (resume, out_path) in enumerate(jobs):
+            if cancelled is not None and cancelled():
+                break
+            try:
+                _render_job(resume, out_path, template_path)
+            except Exception as e:
+                record(i, e)
+            else:
+                record(i, None)
+        return results
+
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_render_worker,
+        initargs=(template_path,),
+    ) as pool:
+        futures = {
+            pool.submit(_render_job, resume, out_path, template_path): i
+            for i, (resume, out_path) in enumerate(jobs)
+        }
+        for future in as_completed(futures):
+            i = futures[future]
+            try:
+                future.result()
+            except Exception as e:
+                record(i, e)
+            else:
+                record(i, None)
+
+            if cancelled is not None and cancelled():
+                for f in futures:
+                    f.cancel()
+                break
+
+    return results
@@ -0,0 +1,243 @@
+# salary_analytics.py
+"""
+Salary statistics across currencies.
+
+Hunts quote salaries in their own currency (hunt "currency": MYR / USD /
+SGD ...). Everything here is converted to one target currency with an
+offline rate table, RATES_FILE (falling back to DEFAULT_RATES), holding
+the value of one unit of each currency in BASE_CURRENCY:
+
+    {"MYR": 1.0, "USD": 4.7, "SGD": 3.5}
+
+The work runs over repo.salary (salary_columns) rather than the rows:
+
+  - conversion: one factor per distinct currency code, mapped over the
+    currency code array and multiplied into the value array
+  - industry join: one company -> industry lookup per distinct companyId,
+    then mapped over the companyId code array
+  - grouping: values bucketed by category code, each bucket sorted once
+    for its percentiles
+
+    snap = salary_analytics.snapshot(repo, "salaryExpecting")   # Tk thread
+    result = salary_analytics.analyze(snap, "MYR", rates)       # any thread
+
+snapshot() copies the arrays (a memcpy each), so analyze() can run on a
+worker thread while the user keeps editing.
+"""
+import bisect
+import json
+import math
+import operator
+import os
+import statistics
+from array import array
+from itertools import compress
+
+from app_paths import DATA_DIR
+import model as m
+import tracing
+
+RATES_FILE = DATA_DIR / "currencyRates.json"
+
+BASE_CURRENCY = "MYR"
+
+# Value of one unit in BASE_CURRENCY (edit RATES_FILE to update)
+DEFAULT_RATES = {
+    "MYR": 1.0,
+    "USD": 4.70,
+    "SGD": 3.50,
+}
+
+# Currency assumed for hunts that leave it blank (NewHuntWindow's default)
+DEFAULT_CURRENCY = "MYR"
+
+PERCENTILES = [10, 25, 50, 75, 90]
+HISTOGRAM_BINS = 12
+
+NO_GROUP = "(not set)"
+
+
+#----------------------------------------------------------------------
+# Rate table
+def load_rates() -> dict:
+    rates = dict(DEFAULT_RATES)
+    try:
+        with open(RATES_FILE, "r", encoding="utf-8") as f:
+            stored = json.load(f)
+    except (OSError, ValueError):
+        return rates
+
+    for code, value in (stored or {}).items():
+        try:
+            value = float(value)
+        except (TypeError, ValueError):
+            continue
+        if value > 0:
+            rates[str(code).strip().upper()] = value
+    return rates
+
+
+def save_rates(rates: dict):
+    try:
+        RATES_FILE.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = RATES_FILE.with_name(RATES_FILE.name + ".tmp")
+        tmp_path.write_text(json.dumps(rates, indent=2), encoding="utf-8")
+        os.replace(tmp_path, RATES_FILE)
+    except OSError as e:
+        print("Error writing currency rates:", e)
+
+
+#----------------------------------------------------------------------
+# Snapshot (Tk thread)
+def snapshot(repo, field) -> dict:
+    """Copies of the column data analyze() needs for field."""
+    cols = repo.salary
+    values, mask = cols.column(field)
+    currency_codes, currencies = cols.categories("currency")
+    arrangement_codes, arrangements = cols.categories("workArrangement")
+    company_codes, company_ids = cols.categories("companyId")
+
+    # Join: industry per distinct company, not per hunt
+    industry_idx = m.COMPANY_FIELDS.index("industry")
+    industries = []
+    industry_code_of = {}
+    company_industry = array("l")
+    for company_id in company_ids:
+        row = repo.get_company(company_id) if company_id else None
+        industry = (row[industry_idx] if row is not None and len(row) > industry_idx else "").strip()
+        code = industry_code_of.get(industry)
+        if code is None:
+            code = industry_code_of[industry] = len(industries)
+            industries.append(industry)
+        company_industry.append(code)
+
+    return {
+        "field": field,
+        "values": array("d", values),
+        "mask": bytes(mask),
+        "currency_codes": array("l", currency_codes),
+        "currencies": list(currencies),
+        "arrangement_codes": array("l", arrangement_codes),
+        "arrangements": list(arrangements),
+        "company_codes": array("l", company_codes),
+        "company_industry": company_industry,
+        "industries": industries,
+    }
+
+
+#----------------------------------------------------------------------
+# Analysis (any thread)
+def percentile(sorted_values, p):
+    """Linear-interpolated percentile (0-100) of an ascending sequence."""
+    n = len(sorted_values)
+    if not n:
+        return None
+    k = (n - 1) * p / 100
+    lo = math.floor(k)
+    hi = min(lo + 1, n - 1)
+    return sorted_values[lo] + (sorted_values[hi] - sorted_values[lo]) * (k - lo)
+
+
+def summarize(sorted_values) -> dict:
+    n = len(sorted_values)
+    result = {"count": n}
+    if n:
+        result["mean"] = statistics.fmean(sorted_values)
+        result["min"] = sorted_values[0]
+        result["max"] = sorted_values[-1]
+    else:
+        result["mean"] = result["min"] = result["max"] = None
+    for p in PERCENTILES:
+        result[f"p{p}"] = percentile(sorted_values, p)
+    return result
+
+
+def histogram(sorted_values, bins=HISTOGRAM_BINS):
+    """[(low, high, count)] over equal-width bins between the 1st and 99th percentile."""
+    if not sorted_values:
+        return []
+    low = percentile(sorted_values, 1)
+    high = percentile(sorted_values, 99)
+    if high <= low:
+        return [(low, high, len(sorted_values))]
+
+    width = (high - low) / bins
+    edges = [low + i * width for i in range(bins + 1)]
+    counts = []
+    start = 0
+    for i in range(bins):
+        # Outliers are folded into the first / last bin
+        end = len(sorted_values) if i == bins - 1 else bisect.bisect_left(sorted_values, edges[i + 1])
+        counts.append((edges[i], edges[i + 1], end - start))
+        start = end
+    return counts
+
+
+def _group(values, codes, labels):
+    """[(label, summary)] of the non-NaN values grouped by category code, biggest first."""
+    buckets = {}
+    for code, value in zip(codes, values):
+        if value == value:  # not NaN
+            bucket = buckets.get(code)
+            if bucket is None:
+                buckets[code] = [value]
+            else:
+                bucket.append(value)
+
+    merged = {}
+    for code, bucket in buckets.items():
+        label = labels[code] or NO_GROUP
+        merged.setdefault(label, []).extend(bucket)
+
+    groups = []
+    for label, bucket in merged.items():
+        bucket.sort()
+        groups.append((label, summarize(bucket)))
+    groups.sort(key=lambda item: (-item[1]["count"], item[0]))
+    return groups
+
+
+def analyze(snap, target, rates) -> dict:
+    """
+    Salary statistics for snap["field"], converted to target:
+    {"overall", "histogram", "by_industry", "by_arrangement",
+     "missing", "unknown_currency": {code: hunts}}
+    """
+    with tracing.span("salary.analyze", hunts=len(snap["values"]), target=target):
+        target_rate = rates.get(target)
+        if not target_rate:
+            raise ValueError(f"No exchange rate for {target}")
+
+        # Factor per distinct currency; NaN for currencies without a rate
+        factors = array("d")
+        for code in snap["currencies"]:
+            rate = rates.get(code or DEFAULT_CURRENCY)
+            factors.append(rate / target_rate if rate else math.nan)
+
+        converted = array(
+            "d",
+            map(operator.mul, snap["values"], map(factors.__getitem__, snap["currency_codes"])),
+        )
+
+        unknown = {}
+        for code, label in enumerate(snap["currencies"]):
+            if math.isnan(factors[code]):
+                unknown[label] = 0
+        if unknown:
+            for code, present in zip(snap["currency_codes"], snap["mask"]):
+                if present and math.isnan(factors[code]):
+                    unknown[snap["currencies"][code]] += 1
+
+        present = sorted(compress(converted, map(operator.not_, map(math.isnan, converted))))
+        industry_codes = array("l", map(snap["company_industry"].__getitem__, snap["company_codes"]))
+
+        return {
+            "field": snap["field"],
+            "target": target,
+            "overall": summarize(present),
+            "missing": len(converted) - sum(snap["mask"]),
+            "unknown_currency": {k: v for k, v in unknown.items() if v},
+            "histogram": histogram(present),
+            "by_industry": _group(converted, industry_codes, snap["industries"]),
+            "by_arrangement": _group(converted, snap["arrangement_codes"], snap["arrangements"]),
+        }
@@ -0,0 +1,269 @@
+# salary_columns.py
+"""
+Columnar cache of the numeric hunt fields.
+
+Salary / OT fields are stored as text in the hunt rows. SalaryColumns
+keeps each NUMERIC_FIELDS column parsed once into an array('d') aligned
+with hunts.rows (position == main sheet data row), plus a bytearray null
+mask (1 = has a value). Missing / unparseable cells hold NaN as well, so
+a plain comparison already excludes them.
+
+The CATEGORY_FIELDS are kept as integer codes (array('l')) into a label
+list, so group-bys and per-currency conversion work per distinct value
+and then map over the codes, instead of per row:
+
+    codes, labels = cols.categories("currency")   # labels[codes[p]] == "USD"
+
+    cols = repo.salary
+    cols.filter_range("salaryBaseMin", 5000, None)   # positions
+    cols.order("salaryExpecting", descending=True)   # positions, nulls last
+    cols.stats("salaryBaseMax", positions)           # count/min/max/mean/median
+    cols.values("salaryBaseMax", positions)          # present values only
+    cols.categories("workArrangement")               # (codes, labels)
+
+Each column also gets a sort index on first use: its present values in
+ascending order next to their positions. A range filter is then two
+bisects and a slice, and ordering is a walk over that index, instead of
+re-parsing strings per row. Statistics pick the present values out with
+itertools.compress over the null mask.
+
+The hunts table listener marks edited / inserted hunts stale (edits in
+MainWindow._on_end_edit_cell arrive through hunts.touch); only those
+positions are re-parsed on the next read. Appended rows extend the
+arrays; a deletion or table rebuild re-parses everything (one pass). Any
+change drops the sort indexes; they are rebuilt when next needed.
+"""
+import bisect
+import re
+import statistics
+from array import array
+from itertools import compress
+
+import model as m
+import tracing
+
+NUMERIC_FIELDS = [
+    "salaryBaseMin",
+    "salaryBaseMax",
+    "salaryIndustryAvg",
+    "salaryExpecting",
+    "otRateRatio",
+]
+
+# Text fields kept as category codes (currency case-folded to upper)
+CATEGORY_FIELDS = ["currency", "workArrangement", "companyId"]
+
+NAN = float("nan")
+
+# "RM 5,500", "5500.00", "5.5k" -> 5500.0
+_NUMBER_RE = re.compile(r"[-+]?\d+(?:\.\d+)?")
+
+
+def parse_number(text):
+    """Cell text -> float, or None when it holds no number."""
+    if text is None:
+        return None
+    s = str(text).replace(",", "").strip().lower()
+    if not s:
+        return None
+    match = _NUMBER_RE.search(s)
+    if match is None:
+        return None
+    value = float(match.group())
+    if s[match.end():match.end() + 1] == "k":
+        value *= 1000
+    return value
+
+
+class SalaryColumns:
+    def __init__(self, hunts):
+        """hunts is the repository._Table of hunt rows."""
+        self.hunts = hunts
+        self._field_idx = {f: m.HUNT_FIELDS.index(f) for f in NUMERIC_FIELDS + CATEGORY_FIELDS}
+        self._clear()
+
+        self._stale = set()
+        self._stale_all = True
+
+        hunts.add_listener(self._on_hunts_changed)
+
+    def _on_hunts_changed(self, keys):
+        if keys is None:
+            self._stale_all = True
+        else:
+            self._stale.add(keys.get("id"))
+
+    # ------------------------------------------------------------------
+    # Keeping the columns in step with the rows
+    # ------------------------------------------------------------------
+    def _clear(self):
+        self._values = {f: array("d") for f in NUMERIC_FIELDS}
+        self._mask = {f: bytearray() for f in NUMERIC_FIELDS}
+        self._sorted = {}   # field -> (sorted present values, their positions)
+
+        self._codes = {f: array("l") for f in CATEGORY_FIELDS}
+        self._labels = {f: [] for f in CATEGORY_FIELDS}    # code -> label
+        self._code_of = {f: {} for f in CATEGORY_FIELDS}   # label -> code
+
+    def _code(self, field, text):
+        label = (text or "").strip()
+        if field == "currency":
+            label = label.upper()
+        code = self._code_of[field].get(label)
+        if code is None:
+            code = len(self._labels[field])
+            self._labels[field].append(label)
+            self._code_of[field][label] = code
+        return code
+
+    def _parse_row(self, row, position=None):
+        """Parse one hunt row into every column (append, or overwrite position)."""
+        width = len(row)
+        for field in NUMERIC_FIELDS:
+            idx = self._field_idx[field]
+            value = parse_number(row[idx]) if width > idx else None
+            present = value is not None
+            if position is None:
+                self._values[field].append(value if present else NAN)
+                self._mask[field].append(present)
+            else:
+                self._values[field][position] = value if present else NAN
+                self._mask[field][position] = present
+
+        for field in CATEGORY_FIELDS:
+            idx = self._field_idx[field]
+            code = self._code(field, row[idx] if width > idx else "")
+            if position is None:
+                self._codes[field].append(code)
+            else:
+                self._codes[field][position] = code
+
+    def rebuild(self):
+        with tracing.span("salary_columns.rebuild", hunts=len(self.hunts.rows)):
+            self._stale_all = False
+            self._stale.clear()
+            self._clear()
+            for row in self.hunts.rows:
+                self._parse_row(row)
+
+    def refresh(self):
+        """Apply pending changes (every read calls this)."""
+        rows = self.hunts.rows
+        length = len(self._mask[NUMERIC_FIELDS[0]])
+
+        if self._stale_all or len(rows) < length:
+            self.rebuild()
+            return
+        if not self._stale and len(rows) == length:
+            return
+
+        stale, self._stale = self._stale, set()
+        self._sorted.clear()
+        positions = []
+        for hunt_id in stale:
+            if not hunt_id:
+                continue
+            if self.hunts.get(hunt_id) is None:
+                # Deleted: every later position moved up
+                self.rebuild()
+                return
+            positions.append(self.hunts.index_of(hunt_id))
+
+        # Appended rows (with or without an id)
+        for row in rows[length:]:
+            self._parse_row(row)
+
+        for position in positions:
+            if position is not None and position < length:
+                self._parse_row(rows[position], position)
+
+    def column(self, field):
+        """(values array('d'), null mask bytearray) for field, up to date."""
+        self.refresh()
+        return self._values[field], self._mask[field]
+
+    def categories(self, field):
+        """(codes array('l'), labels list) for a CATEGORY_FIELDS field, up to date."""
+        self.refresh()
+        return self._codes[field], self._labels[field]
+
+    # ------------------------------------------------------------------
+    # Queries (positions are hunts.rows indexes)
+    # ------------------------------------------------------------------
+    def values(self, field, positions=None):
+        """Present values of field (all rows, or just positions)."""
+        values, mask = self.column(field)
+        if positions is None:
+            return list(compress(values, mask))
+        return [values[p] for p in positions if mask[p]]
+
+    def _sort_index(self, field):
+        """(ascending present values, their positions) for field."""
+        values, mask = self.column(field)
+        index = self._sorted.get(field)
+        if index is None:
+            with tracing.span("salary_columns.sort_index", field=field):
+                order = sorted(compress(range(len(values)), mask), key=values.__getitem__)
+                index = (array("d", map(values.__getitem__, order)), array("q", order))
+            self._sorted[field] = index
+        return index
+
+    def filter_range(self, field, low=None, high=None, positions=None):
+        """
+        Positions (ascending) whose value lies in [low, high], None meaning
+        unbounded; rows without a value never match. positions restricts
+        the search to those rows.
+        """
+        with tracing.span("salary_columns.filter", field=field) as s:
+            keys, order = self._sort_index(field)
+            i = 0 if low is None else bisect.bisect_left(keys, float(low))
+            j = len(keys) if high is None else bisect.bisect_right(keys, float(high))
+
+            hits = order[i:j]
+            if positions is None:
+                result = sorted(hits)
+            else:
+                if not isinstance(positions, (set, frozenset)):
+                    positions = set(positions)
+                result = sorted(filter(positions.__contains__, hits))
+            s.set("hits", len(result))
+        return result
+
+    def order(self, field, positions=None, descending=False):
+        """Positions sorted by field; rows without a value come last."""
+        _, order = self._sort_index(field)
+        _, mask = self.column(field)
+
+        if positions is None:
+            present = list(order)
+            missing = [p for p in range(len(mask)) if not mask[p]]
+        else:
+            if not isinstance(positions, (set, frozenset)):
+                positions = set(positions)
+            present = list(filter(positions.__contains__, order))
+            missing = sorted(p for p in positions if not mask[p])
+
+        if descending:
+            present.reverse()
+        return present + missing
+
+    def stats(self, field, positions=None) -> dict:
+        """{"count", "missing", "min", "max", "mean", "median"} (None when no values)."""
+        if positions is None:
+            # The sort index already holds the present values in order
+            present, _ = self._sort_index(field)
+        else:
+            present = sorted(self.values(field, positions))
+        total = len(self.hunts.rows) if positions is None else len(positions)
+        result = {"count": len(present), "missing": total - len(present)}
+        if present:
+            n = len(present)
+            result.update(
+                min=present[0],
+                max=present[-1],
+                mean=statistics.fmean(present),
+                median=present[n // 2] if n % 2 else (present[n // 2 - 1] + present[n // 2]) / 2,
+            )
+        else:
+            result.update(min=None, max=None, mean=None, median=None)
+        return result
@@ -0,0 +1,317 @@
+# search_index.py
+"""
+Full-text search over hunts.
+
+A hunt's searchable text is its own text fields, its company's name,
+industry and description, and the status / description of its reminders
+and progress entries. Text is tokenized into case-folded words and kept
+in an inverted index:
+
+    postings[term] -> {doc}     doc: small int per hunt
+    terms[doc]     -> frozenset of the hunt's terms (to update it later)
+    vocab          -> every term, sorted (prefix lookups by bisect)
+
+    index = search_index.SearchIndex(repo)
+    index.rebuild()                      # or rebuild_async(runner, on_ready)
+    hunt_ids = index.search("pyth remote")
+
+Every query word must match (AND). A word matches terms that start with it
+("pyth" finds "python"). Words shorter than MIN_PREFIX only match whole
+words, because a one-letter prefix would match most of the vocabulary.
+
+The repository tables report which rows changed (insert / touch / delete).
+The affected hunts are re-tokenized the next time a search runs, and only
+their terms that actually changed are moved in the postings. A table
+rebuild (e.g. a list reassigned after save) re-indexes everything.
+"""
+import bisect
+import re
+
+import model as m
+import tracing
+
+TOKEN_RE = re.compile(r"\w+")
+
+# Query words shorter than this match whole words only
+MIN_PREFIX = 2
+
+HUNT_TEXT_FIELDS = ["jobTitle", "jobDescription", "jobSource", "workArrangement", "currency"]
+COMPANY_TEXT_FIELDS = ["name", "industry", "description", "address"]
+EVENT_TEXT_FIELDS = ["status", "description"]
+
+
+def tokenize(text: str):
+    """Case-folded words of text, in order (duplicates kept)."""
+    return TOKEN_RE.findall((text or "").casefold())
+
+
+def _fields_text(row, fields, names) -> str:
+    parts = []
+    for name in names:
+        idx = fields.index(name)
+        if len(row) > idx and row[idx]:
+            parts.append(row[idx])
+    return "\n".join(parts)
+
+
+def build_postings(docs):
+    """
+    [(hunt_id, text)] -> (doc_of, hunt_of, terms, postings, vocab).
+    Pure function of its input, so it can run on a worker thread.
+    """
+    doc_of = {}
+    hunt_of = []
+    terms = []
+    postings = {}
+
+    for hunt_id, text in docs:
+        doc = len(hunt_of)
+        doc_of[hunt_id] = doc
+        hunt_of.append(hunt_id)
+
+        words = frozenset(tokenize(text))
+        terms.append(words)
+        for term in words:
+            bucket = postings.get(term)
+            if bucket is None:
+                postings[term] = {doc}
+            else:
+                bucket.add(doc)
+
+    return doc_of, hunt_of, terms, postings, sorted(postings)
+
+
+class SearchIndex:
+    def __init__(self, repo):
+        self.repo = repo
+
+        self._doc_of = {}      # hunt_id -> doc
+        self._hunt_of = []     # doc -> hunt_id (None once removed)
+        self._terms = []       # doc -> frozenset of terms
+        self._postings = {}    # term -> {doc}
+        self._vocab = []       # sorted terms
+
+        self._stale_hunts = set()
+        self._stale_companies = set()
+        self._stale_all = True
+        self.building = False
+
+        repo.hunts.add_listener(self._on_hunts_changed)
+        repo.companies.add_listener(self._on_companies_changed)
+        repo.reminders.add_listener(self._on_events_changed)
+        repo.progress.add_listener(self._on_events_changed)
+
+    # ------------------------------------------------------------------
+    # Change notifications (just mark things stale; cheap)
+    # ------------------------------------------------------------------
+    def _on_hunts_changed(self, keys):
+        if keys is None:
+            self._stale_all = True
+        else:
+            self._stale_hunts.add(keys.get("id"))
+
+    def _on_companies_changed(self, keys):
+        if keys is None:
+            self._stale_all = True
+        else:
+            self._stale_companies.add(keys.get("id"))
+
+    def _on_events_changed(self, keys):
+        if keys is None:
+            self._stale_all = True
+        else:
+            self._stale_hunts.add(keys.get("huntId"))
+
+    def invalidate(self, hunt_id=None):
+        """Mark one hunt (None: everything) for re-indexing."""
+        if hunt_id is None:
+            self._stale_all = True
+        else:
+            self._stale_hunts.add(hunt_id)
+
+    # ------------------------------------------------------------------
+    # Document text
+    # ------------------------------------------------------------------
+    def hunt_text(self, hunt_row, company_texts=None) -> str:
+        repo = self.repo
+        hunt_id = hunt_row[repo.hunts.id_idx]
+        company_idx = m.HUNT_FIELDS.index("companyId")
+        company_id = hunt_row[company_idx] if len(hunt_row) > company_idx else ""
+
+        if company_texts is not None and company_id in company_texts:
+            company_text = company_texts[company_id]
+        else:
+            company_row = repo.get_company(company_id) if company_id else None
+            company_text = _fields_text(company_row, m.COMPANY_FIELDS, COMPANY_TEXT_FIELDS) if company_row else ""
+            if company_texts is not None:
+                company_texts[company_id] = company_text
+
+        parts = [_fields_text(hunt_row, m.HUNT_FIELDS, HUNT_TEXT_FIELDS), company_text]
+        for row in repo.reminders_for_hunt(hunt_id):
+            parts.append(_fields_text(row, m.REMINDER_FIELDS, EVENT_TEXT_FIELDS))
+        for row in repo.progress_for_hunt(hunt_id):
+            parts.append(_fields_text(row, m.PROGRESS_FIELDS, EVENT_TEXT_FIELDS))
+        return "\n".join(p for p in parts if p)
+
+    def _collect_docs(self):
+        id_idx = self.repo.hunts.id_idx
+        company_texts = {}
+        docs = []
+        for row in self.repo.hunts.rows:
+            if len(row) > id_idx and row[id_idx]:
+                docs.append((row[id_idx], self.hunt_text(row, company_texts)))
+        return docs
+
+    # ------------------------------------------------------------------
+    # Building
+    # ------------------------------------------------------------------
+    @property
+    def needs_rebuild(self) -> bool:
+        """True when a table was replaced and the next search would re-index everything."""
+        return self._stale_all
+
+    def _install(self, built):
+        self._doc_of, self._hunt_of, self._terms, self._postings, self._vocab = built
+
+    def rebuild(self):
+        """Index every hunt now (on the calling thread)."""
+        with tracing.span("search.rebuild", hunts=len(self.repo.hunts.rows)):
+            self._stale_all = False
+            self._stale_hunts.clear()
+            self._stale_companies.clear()
+            self._install(build_postings(self._collect_docs()))
+
+    def rebuild_async(self, runner, on_ready=None):
+        """
+        Tokenize on a task_runner worker; the text is collected here first,
+        so edits made meanwhile are simply marked stale and applied on the
+        next search.
+        """
+        self._stale_all = False
+        self._stale_hunts.clear()
+        self._stale_companies.clear()
+        docs = self._collect_docs()
+        self.building = True
+
+        def done(built):
+            self.building = False
+            self._install(built)
+            if on_ready is not None:
+                on_ready()
+
+        def failed(e):
+            self.building = False
+            self._stale_all = True
+            print("Error building search index:", e)
+
+        runner.submit(
+            tracing.traced("search.rebuild")(build_postings),
+            docs,
+            on_done=done,
+            on_error=failed,
+            name="search_index.rebuild",
+        )
+
+    def refresh(self):
+        """Apply pending changes (called by search())."""
+        if self.building:
+            return
+        if self._stale_all:
+            self.rebuild()
+            return
+        if not (self._stale_hunts or self._stale_companies):
+            return
+
+        id_idx = self.repo.hunts.id_idx
+        stale = set(self._stale_hunts)
+        for company_id in self._stale_companies:
+            stale.update(row[id_idx] for row in self.repo.hunts_for_company(company_id))
+        self._stale_hunts.clear()
+        self._stale_companies.clear()
+
+        for hunt_id in stale:
+            if not hunt_id:
+                continue
+            row = self.repo.get_hunt(hunt_id)
+            self._set_doc(hunt_id, frozenset(tokenize(self.hunt_text(row))) if row is not None else None)
+
+    def _set_doc(self, hunt_id, words):
+        """Replace a hunt's terms (words=None removes the hunt)."""
+        doc = self._doc_of.get(hunt_id)
+        old = self._terms[doc] if doc is not None else frozenset()
+        new = words or frozenset()
+
+        if doc is None:
+            if words is None:
+                return
+            doc = len(self._hunt_of)
+            self._doc_of[hunt_id] = doc
+            self._hunt_of.append(hunt_id)
+            self._terms.append(new)
+
+        for term in old - new:
+            bucket = self._postings[term]
+            bucket.discard(doc)
+            if not bucket:
+                del self._postings[term]
+                i = bisect.bisect_left(self._vocab, term)
+                del self._vocab[i]
+        for term in new - old:
+            bucket = self._postings.get(term)
+            if bucket is None:
+                self._postings[term] = {doc}
+                bisect.insort(self._vocab, term)
+            else:
+                bucket.add(doc)
+
+        if words is None:
+            # Doc numbers are not reused; the slot just stays empty
+            del self._doc_of[hunt_id]
+            self._hunt_of[doc] = None
+            self._terms[doc] = frozenset()
+        else:
+            self._terms[doc] = new
+
+    # ------------------------------------------------------------------
+    # Querying
+    # ------------------------------------------------------------------
+    def _match(self, word):
+        """Docs containing word (or, for long enough words, a term starting with it)."""
+        if len(word) < MIN_PREFIX:
+            return self._postings.get(word, set())
+
+        vocab = self._vocab
+        i = bisect.bisect_left(vocab, word)
+        buckets = []
+        while i < len(vocab) and vocab[i].startswith(word):
+            buckets.append(self._postings[vocab[i]])
+            i += 1
+        if len(buckets) == 1:
+            return buckets[0]
+        return set().union(*buckets)
+
+    def search(self, query: str):
+        """
+        Hunt ids matching every word of query; None when the query has no
+        words (i.e. "no filter") or the index is still being built.
+        """
+        words = list(dict.fromkeys(tokenize(query)))
+        if not words or self.building:
+            return None
+
+        with tracing.span("search.query", words=len(words)) as s:
+            self.refresh()
+
+            # Longest words first: usually the most selective
+            result = None
+            for word in sorted(words, key=len, reverse=True):
+                docs = self._match(word)
+                result = docs if result is None else result & docs
+                if not result:
+                    break
+
+            hunt_of = self._hunt_of
+            hunt_ids = {hunt_of[d] for d in result or ()}
+            hunt_ids.discard(None)
+            s.set("hits", len(hunt_ids))
+        return hunt_ids
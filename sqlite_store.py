@@ -0,0 +1,272 @@
+# sqlite_store.py
+"""
+SQLite storage for the entity tables (hunt / company / reminder / progress).
+
+Each table has the same columns as its *_FIELDS list (all TEXT) plus a hidden
+"pos" column that keeps the list order the rest of the app relies on.
+Rows go in and out as list-of-lists, exactly like the CSV files.
+
+save() only touches rows that changed since the last load/save, inside one
+transaction, so its cost follows the size of the edit, not of the history.
+Rows are keyed by id. save() and upsert() refuse (ValueError, nothing
+written) rows with a blank id or an id another row in the same call uses:
+renaming them here would go around the repository's indexes, and rows that
+point at a repeated id could end up under the wrong one. The CSV migrator
+(replace_all) gives such rows fresh ids instead; they come from a file,
+not from the app's live rows.
+"""
+import sqlite3
+import threading
+import uuid
+from pathlib import Path
+
+# Extra (non-primary-key) indexes per table: foreign keys + lookups
+TABLE_INDEXES = {
+    "hunt": ["companyId"],
+    "company": ["name COLLATE NOCASE"],
+    "reminder": ["huntId", "dateTime"],
+    "progress": ["huntId"],
+}
+
+
+def _quote(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+
+class SqliteStore:
+    def __init__(self, db_path: Path):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+
+        # table -> {id: (pos, tuple(row))} as last seen on disk
+        self._known = {}
+        self._ensured = set()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    # ------------------------------------------------------------------
+    # Schema
+    # ------------------------------------------------------------------
+    def ensure_table(self, table, fields):
+        if (table, tuple(fields)) in self._ensured:
+            return
+
+        cols = ", ".join(
+            f"{_quote(f)} TEXT PRIMARY KEY" if f == "id" else f"{_quote(f)} TEXT NOT NULL DEFAULT ''"
+            for f in fields
+        )
+        with self._lock, self._conn:
+            self._conn.execute(
+                f"CREATE TABLE IF NOT EXISTS {_quote(table)} ({cols}, pos INTEGER NOT NULL)"
+            )
+
+            # Columns added to *_FIELDS after the table was created
+            existing = {r[1] for r in self._conn.execute(f"PRAGMA table_info({_quote(table)})")}
+            for f in fields:
+                if f not in existing:
+                    self._conn.execute(
+                        f"ALTER TABLE {_quote(table)} ADD COLUMN {_quote(f)} TEXT NOT NULL DEFAULT ''"
+                    )
+
+            self._conn.execute(
+                f"CREATE INDEX IF NOT EXISTS {_quote(table + '_pos')} ON {_quote(table)} (pos)"
+            )
+            for spec in TABLE_INDEXES.get(table, []):
+                col = spec.split()[0]
+                self._conn.execute(
+                    f"CREATE INDEX IF NOT EXISTS {_quote(table + '_' + col)} "
+                    f"ON {_quote(table)} ({_quote(col)}{spec[len(col):]})"
+                )
+
+        self._ensured.add((table, tuple(fields)))
+
+    # ------------------------------------------------------------------
+    # Load
+    # ------------------------------------------------------------------
+    def load(self, table, fields):
+        self.ensure_table(table, fields)
+        cols = ", ".join(_quote(f) for f in fields)
+        with self._lock:
+            cur = self._conn.execute(f"SELECT {cols}, pos FROM {_quote(table)} ORDER BY pos")
+            result = cur.fetchall()
+
+        id_idx = fields.index("id")
+        rows = []
+        known = {}
+        for rec in result:
+            row = list(rec[:-1])
+            rows.append(row)
+            known[row[id_idx]] = (rec[-1], tuple(row))
+
+        self._known[table] = known
+        return rows
+
+    # ------------------------------------------------------------------
+    # Save (diff against the last known state)
+    # ------------------------------------------------------------------
+    def save(self, table, fields, rows):
+        if table not in self._known:
+            self.load(table, fields)
+
+        width = len(fields)
+        id_idx = fields.index("id")
+        known = self._known[table]
+
+        rows = [self._normalize(row, width) for row in rows if row]
+        self._check_ids(table, rows, id_idx)
+
+        ids = [row[id_idx] for row in rows]
+        id_set = set(ids)
+
+        # Keep existing positions when the relative order is unchanged,
+        # otherwise renumber everything.
+        old_order = sorted(known, key=lambda k: known[k][0])
+        survivors = [row_id for row_id in old_order if row_id in id_set]
+        added = [row_id for row_id in ids if row_id not in known]
+        if len(id_set) == len(ids) and ids == survivors + added:
+            next_pos = max((p for p, _ in known.values()), default=-1) + 1
+            positions = {}
+            for row_id in ids:
+                if row_id in known:
+                    positions[row_id] = known[row_id][0]
+                else:
+                    positions[row_id] = next_pos
+                    next_pos += 1
+        else:
+            positions = {row_id: i for i, row_id in enumerate(ids)}
+
+        upserts = []
+        for row in rows:
+            row_id = row[id_idx]
+            state = (positions[row_id], tuple(row))
+            if known.get(row_id) != state:
+                upserts.append((row, positions[row_id]))
+
+        deletes = [row_id for row_id in known if row_id not in id_set]
+
+        self._write(table, fields, upserts, deletes)
+
+    def upsert(self, table, fields, rows):
+        """Insert or replace individual rows (new ids go to the end)."""
+        if table not in self._known:
+            self.load(table, fields)
+
+        width = len(fields)
+        id_idx = fields.index("id")
+        known = self._known[table]
+        next_pos = max((p for p, _ in known.values()), default=-1) + 1
+
+        rows = [self._normalize(row, width) for row in rows if row]
+        self._check_ids(table, rows, id_idx)
+
+        upserts = []
+        for row in rows:
+            row_id = row[id_idx]
+            if row_id in known:
+                pos = known[row_id][0]
+            else:
+                pos = next_pos
+                next_pos += 1
+            upserts.append((row, pos))
+
+        self._write(table, fields, upserts, [])
+
+    def delete(self, table, fields, ids):
+        if table not in self._known:
+            self.load(table, fields)
+        self._write(table, fields, [], [i for i in ids if i in self._known[table]])
+
+    def replace_all(self, table, fields, rows):
+        """Wipe the table and insert rows (used by the CSV migrator)."""
+        self.ensure_table(table, fields)
+        with self._lock, self._conn:
+            self._conn.execute(f"DELETE FROM {_quote(table)}")
+        self._known[table] = {}
+        self.save(table, fields, self._with_unique_ids(rows, fields.index("id")))
+
+    def _write(self, table, fields, upserts, deletes):
+        if not upserts and not deletes:
+            return
+
+        self.ensure_table(table, fields)
+        cols = ", ".join(_quote(f) for f in fields)
+        marks = ", ".join("?" for _ in fields)
+        id_idx = fields.index("id")
+        known = self._known[table]
+
+        with self._lock, self._conn:
+            if deletes:
+                self._conn.executemany(
+                    f"DELETE FROM {_quote(table)} WHERE id = ?",
+                    [(row_id,) for row_id in deletes],
+                )
+            if upserts:
+                self._conn.executemany(
+                    f"INSERT OR REPLACE INTO {_quote(table)} ({cols}, pos) VALUES ({marks}, ?)",
+                    [tuple(row) + (pos,) for row, pos in upserts],
+                )
+
+        for row_id in deletes:
+            known.pop(row_id, None)
+        for row, pos in upserts:
+            known[row[id_idx]] = (pos, tuple(row))
+
+    # ------------------------------------------------------------------
+    # Helpers
+    # ------------------------------------------------------------------
+    def _check_ids(self, table, rows, id_idx):
+        seen = set()
+        blank = 0
+        repeated = []
+        for row in rows:
+            row_id = row[id_idx]
+            if not row_id:
+                blank += 1
+            elif row_id in seen:
+                repeated.append(row_id)
+            seen.add(row_id)
+
+        if blank or repeated:
+            problems = []
+            if blank:
+                problems.append(f"{blank} row(s) without an id")
+            if repeated:
+                problems.append("repeated id(s) " + ", ".join(sorted(set(repeated))[:5]))
+            raise ValueError(f"Cannot save {table}: " + "; ".join(problems))
+
+    def _with_unique_ids(self, rows, id_idx):
+        """Copies of rows, blank or repeated ids replaced by new ones."""
+        result = []
+        seen = set()
+        for row in rows:
+            row = list(row)
+            if len(row) > id_idx and (not row[id_idx] or row[id_idx] in seen):
+                # Same format as model.new_id()
+                row[id_idx] = uuid.uuid4().hex
+            if len(row) > id_idx:
+                seen.add(row[id_idx])
+            result.append(row)
+        return result
+
+    def _normalize(self, row, width):
+        row = ["" if v is None else str(v) for v in row]
+        if len(row) < width:
+            row = row + [""] * (width - len(row))
+        elif len(row) > width:
+            row = row[:width]
+        return row
+
+
+#Only run the migrator if this file is executed directly, NOT if it is imported.
+if __name__ == "__main__":
+    import model
+
+    model.migrate_csv_to_sqlite()
+    print(f"Migrated CSV data into {model.SQLITE_DB}")
@@ -0,0 +1,106 @@
+# startup_profile.py
+"""
+Cold-start timings for `python main.py --profile-startup`.
+
+Reports, once the first frame has been drawn:
+  - wall time of each boot phase (mark())
+  - the slowest module imports (self time, nested imports excluded)
+  - time to first paint against STARTUP_BUDGET_MS
+
+`--exit-after-paint` closes the app right after the report, so the cold
+start can be measured repeatedly from a script.
+"""
+import builtins
+import json
+import sys
+import time
+
+# Target from process start to first painted frame
+STARTUP_BUDGET_MS = 1500
+
+TOP_IMPORTS = 15
+
+
+class StartupProfiler:
+    def __init__(self):
+        self.t0 = time.perf_counter()
+        self.marks = []       # (label, ms since t0)
+        self.imports = {}     # module name -> self time in ms
+        self._stack = []      # child time accumulated per active import
+        self._orig_import = None
+
+    # ------------------------------------------------------------------
+    # Import timing
+    # ------------------------------------------------------------------
+    def start(self):
+        """Time every module imported from now on."""
+        self._orig_import = builtins.__import__
+        builtins.__import__ = self._timed_import
+
+    def stop(self):
+        if self._orig_import is not None:
+            builtins.__import__ = self._orig_import
+            self._orig_import = None
+
+    def _timed_import(self, name, globals=None, locals=None, fromlist=(), level=0):
+        # Only first-time loads cost anything worth reporting
+        if level or name in sys.modules:
+            return self._orig_import(name, globals, locals, fromlist, level)
+
+        self._stack.append(0.0)
+        start = time.perf_counter()
+        try:
+            return self._orig_import(name, globals, locals, fromlist, level)
+        finally:
+            elapsed = (time.perf_counter() - start) * 1000
+            children = self._stack.pop()
+            self.imports[name] = self.imports.get(name, 0.0) + elapsed - children
+            if self._stack:
+                self._stack[-1] += elapsed
+
+    # ------------------------------------------------------------------
+    # Phases
+    # ------------------------------------------------------------------
+    def mark(self, label: str):
+        self.marks.append((label, (time.perf_counter() - self.t0) * 1000))
+
+    def report_after_paint(self, root, exit_after: bool = False):
+        """Print the report once Tk has drawn the first frame."""
+        def on_idle():
+            root.update_idletasks()
+            self.mark("first paint")
+            self.stop()
+            self.print_report()
+            if exit_after:
+                root.destroy()
+
+        root.after_idle(on_idle)
+
+    # ------------------------------------------------------------------
+    # Report
+    # ------------------------------------------------------------------
+    def summary(self) -> dict:
+        first_paint = dict(self.marks).get("first paint")
+        top = sorted(self.imports.items(), key=lambda kv: kv[1], reverse=True)
+        return {
+            "marks_ms": {label: round(ms, 1) for label, ms in self.marks},
+            "imports_ms": {name: round(ms, 1) for name, ms in top[:TOP_IMPORTS]},
+            "import_total_ms": round(sum(self.imports.values()), 1),
+            "budget_ms": STARTUP_BUDGET_MS,
+            "within_budget": first_paint is not None and first_paint <= STARTUP_BUDGET_MS,
+        }
+
+    def print_report(self):
+        s = self.summary()
+
+        print("=== JobHound startup profile ===")
+        for label, ms in s["marks_ms"].items():
+            print(f"  {ms:8.1f} ms  {label}")
+
+        print(f"--- slowest imports (self time, total {s['import_total_ms']:.1f} ms) ---")
+        for name, ms in s["imports_ms"].items():
+            print(f"  {ms:8.1f} ms  {name}")
+
+        verdict = "OK" if s["within_budget"] else "OVER BUDGET"
+        print(f"--- first paint budget {STARTUP_BUDGET_MS} ms: {verdict} ---")
+        print(json.dumps(s))
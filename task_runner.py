@@ -0,0 +1,164 @@
+# task_runner.py
+"""
+Run slow calls (AI requests, Gmail, DOCX rendering) off the Tk thread.
+
+Workers never touch widgets. Everything they produce (result, error,
+progress) goes through a queue that the Tk thread drains with root.after,
+so callbacks always run on the Tk thread.
+
+    runner = task_runner.get_runner(widget)
+    task = runner.submit(
+        parse_job_ad, raw,
+        on_done=self._show_result,
+        on_error=self._show_error,
+    )
+    ...
+    task.cancel()
+
+Cancellation is cooperative: a cancelled task's callbacks are never called,
+a task that has not started yet is dropped, and a running task can check
+task.cancelled (submit(..., pass_task=True) hands it the TaskHandle).
+"""
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+POLL_MS = 50
+DEFAULT_WORKERS = 4
+
+
+class TaskHandle:
+    def __init__(self, runner, name: str = ""):
+        self.runner = runner
+        self.name = name
+        self.future = None
+        self._cancelled = threading.Event()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    def cancel(self):
+        """Stop caring about this task (its callbacks will not fire)."""
+        self._cancelled.set()
+        if self.future is not None:
+            self.future.cancel()
+
+    def done(self) -> bool:
+        return self.future is not None and self.future.done()
+
+    def report(self, value):
+        """Called from the worker: deliver a progress value to on_progress."""
+        if not self.cancelled:
+            self.runner._events.put(("progress", self, value))
+
+
+class TaskRunner:
+    def __init__(self, root, max_workers: int = DEFAULT_WORKERS):
+        self.root = root
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix="jobhound-task",
+        )
+        self._events = queue.Queue()
+        self._callbacks = {}   # TaskHandle -> (on_done, on_error, on_progress)
+        self._poll_job = None
+
+    # ------------------------------------------------------------------
+    def submit(
+        self,
+        fn,
+        *args,
+        on_done=None,
+        on_error=None,
+        on_progress=None,
+        name: str = "",
+        pass_task: bool = False,
+        **kwargs,
+    ) -> TaskHandle:
+        """
+        Run fn(*args, **kwargs) on a worker thread.
+        - on_done(result) / on_error(exc) / on_progress(value) run on the Tk thread
+        - pass_task=True also passes task=<TaskHandle> to fn
+        """
+        task = TaskHandle(self, name or getattr(fn, "__name__", "task"))
+        if pass_task:
+            kwargs["task"] = task
+
+        self._callbacks[task] = (on_done, on_error, on_progress)
+
+        def run():
+            if task.cancelled:
+                return
+            try:
+                result = fn(*args, **kwargs)
+            except BaseException as e:
+                self._events.put(("error", task, e))
+            else:
+                self._events.put(("done", task, result))
+
+        task.future = self._executor.submit(run)
+        self._schedule_poll()
+        return task
+
+    def shutdown(self):
+        for task in list(self._callbacks):
+            task.cancel()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    # ------------------------------------------------------------------
+    def _schedule_poll(self):
+        if self._poll_job is None:
+            self._poll_job = self.root.after(POLL_MS, self._poll)
+
+    def _poll(self):
+        self._poll_job = None
+
+        while True:
+            try:
+                kind, task, value = self._events.get_nowait()
+            except queue.Empty:
+                break
+
+            callbacks = self._callbacks.get(task)
+            if callbacks is None:
+                continue
+            on_done, on_error, on_progress = callbacks
+
+            if kind != "progress":
+                del self._callbacks[task]
+            if task.cancelled:
+                continue
+
+            try:
+                if kind == "done" and on_done is not None:
+                    on_done(value)
+                elif kind == "error" and on_error is not None:
+                    on_error(value)
+                elif kind == "progress" and on_progress is not None:
+                    on_progress(value)
+            except Exception as e:
+                print(f"Error in task callback ({task.name}):", e)
+
+        # Forget tasks that were cancelled before they ever ran
+        for task in [t for t in self._callbacks if t.cancelled and t.done()]:
+            del self._callbacks[task]
+
+        # Keep polling only while something is still in flight
+        if self._callbacks:
+            self._schedule_poll()
+
+
+#----------------------------------------------------------------------
+# get_runner
+_RUNNERS = {}
+
+
+def get_runner(widget) -> TaskRunner:
+    """Shared runner for the Tk application that owns widget."""
+    root = widget.nametowidget(".")
+    runner = _RUNNERS.get(root)
+    if runner is None:
+        runner = TaskRunner(root)
+        _RUNNERS[root] = runner
+    return runner
@@ -0,0 +1,217 @@
+# tracing.py
+"""
+Lightweight timing spans for hot paths and slow calls.
+
+    with tracing.span("main.flush_dirty_rows", rows=len(dirty)):
+        ...
+
+    @tracing.traced("ai.parse_job_ad")
+    def parse(...): ...
+
+    tracing.instrument(controller, CONTROLLER_ENTRY_POINTS, prefix="controller")
+
+Every finished span goes into an in-process ring buffer (the last
+RING_SIZE spans) and into per-name aggregates (count, total/max ms,
+errors, payload sizes, token estimates). Payload size is len() of the
+arguments / result: characters for text, items for lists and dicts. AI
+calls also carry in_tokens / out_tokens (estimate_tokens). It is cheap
+enough to leave on all the time.
+
+snapshot() returns both as plain data; dump() writes them to a JSON file
+for offline analysis. DiagnosticsWindow shows them live (Ctrl+Shift+D in
+the main window). Set JOBHOUND_TRACE=0 to turn recording off.
+"""
+import functools
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from pathlib import Path
+
+from app_paths import DATA_DIR
+
+TRACE_DIR = DATA_DIR / "traces"
+RING_SIZE = 2000
+
+ENABLED = os.environ.get("JOBHOUND_TRACE", "1").strip() not in ("0", "false", "no", "")
+
+# Controller methods wrapped by instrument() (missing ones are skipped)
+CONTROLLER_ENTRY_POINTS = [
+    "on_save_clicked",
+    "on_new_hunt_clicked",
+    "create_new_hunt",
+    "finalize_hunt_display_columns",
+    "update_reminders_from_display",
+    "replace_progress_for_hunt_from_display",
+    "add_reminder_for_hunt",
+    "add_progress_for_hunt",
+    "ai_jobParse",
+    "on_companies_clicked",
+    "on_reminder_clicked",
+    "on_personal_details",
+    "open_reminder_window",
+    "open_progress_window",
+    "open_resume_window",
+    "on_email_clicked_for_hunt",
+    "on_map_clicked_for_hunt",
+]
+
+_lock = threading.Lock()
+_spans = deque(maxlen=RING_SIZE)
+_stats = {}   # name -> aggregate dict
+
+
+def payload_size(value):
+    """len() of value, or None when it has no length."""
+    try:
+        return len(value)
+    except TypeError:
+        return None
+
+
+def estimate_tokens(value) -> int:
+    """
+    Rough model token count of value (text, or JSON for anything else):
+    about 4 characters per token, the usual rule of thumb for BPE
+    tokenizers on English text. No tokenizer dependency.
+    """
+    if value is None:
+        return 0
+    if not isinstance(value, str):
+        value = json.dumps(value, ensure_ascii=False, separators=(",", ":"), default=str)
+    return (len(value) + 3) // 4
+
+
+#----------------------------------------------------------------------
+# Recording
+class Span:
+    def __init__(self, name: str, attrs: dict):
+        self.name = name
+        self.attrs = attrs
+        self.start = time.time()
+        self._t0 = time.perf_counter()
+
+    def set(self, key, value):
+        self.attrs[key] = value
+
+
+def _record(span: Span, duration_ms: float, error):
+    record = {
+        "name": span.name,
+        "start": round(span.start, 3),
+        "ms": round(duration_ms, 3),
+        "thread": threading.current_thread().name,
+    }
+    if error is not None:
+        record["error"] = f"{type(error).__name__}: {error}"
+    if span.attrs:
+        record["attrs"] = span.attrs
+
+    with _lock:
+        _spans.append(record)
+
+        stat = _stats.get(span.name)
+        if stat is None:
+            stat = _stats[span.name] = {
+                "count": 0,
+                "errors": 0,
+                "total_ms": 0.0,
+                "max_ms": 0.0,
+                "in_size": 0,
+                "out_size": 0,
+                "in_tokens": 0,
+                "out_tokens": 0,
+            }
+        stat["count"] += 1
+        stat["total_ms"] += duration_ms
+        stat["max_ms"] = max(stat["max_ms"], duration_ms)
+        if error is not None:
+            stat["errors"] += 1
+        for key in ("in_size", "out_size", "in_tokens", "out_tokens"):
+            if isinstance(span.attrs.get(key), int):
+                stat[key] += span.attrs[key]
+
+
+@contextmanager
+def span(name: str, **attrs):
+    """Time the with-block; attrs (and span.set(...)) are kept on the record."""
+    if not ENABLED:
+        yield Span(name, attrs)
+        return
+
+    s = Span(name, attrs)
+    try:
+        yield s
+    except BaseException as e:
+        _record(s, (time.perf_counter() - s._t0) * 1000, e)
+        raise
+    else:
+        _record(s, (time.perf_counter() - s._t0) * 1000, None)
+
+
+def traced(name: str = None):
+    """Decorator form of span(); records argument and result sizes."""
+    def decorate(fn):
+        span_name = name or getattr(fn, "__qualname__", "call")
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not ENABLED:
+                return fn(*args, **kwargs)
+
+            sizes = [payload_size(a) for a in list(args) + list(kwargs.values())]
+            with span(span_name, in_size=sum(s for s in sizes if s is not None)) as s:
+                result = fn(*args, **kwargs)
+                out_size = payload_size(result)
+                if out_size is not None:
+                    s.set("out_size", out_size)
+                return result
+
+        wrapper.__traced__ = True
+        return wrapper
+    return decorate
+
+
+def instrument(obj, method_names, prefix: str = ""):
+    """Wrap the named methods of obj (an instance) in traced(); idempotent."""
+    prefix = prefix or type(obj).__name__
+    for method_name in method_names:
+        method = getattr(obj, method_name, None)
+        if method is None or getattr(method, "__traced__", False):
+            continue
+        setattr(obj, method_name, traced(f"{prefix}.{method_name}")(method))
+    return obj
+
+
+#----------------------------------------------------------------------
+# Reading
+def snapshot() -> dict:
+    with _lock:
+        spans = list(_spans)
+        stats = {}
+        for name, stat in _stats.items():
+            stat = dict(stat)
+            stat["avg_ms"] = stat["total_ms"] / stat["count"] if stat["count"] else 0.0
+            stats[name] = stat
+    return {"spans": spans, "stats": stats}
+
+
+def clear():
+    with _lock:
+        _spans.clear()
+        _stats.clear()
+
+
+def dump(path=None) -> Path:
+    """Write snapshot() as JSON (default: DATA_DIR/traces/trace-<time>.json)."""
+    if path is None:
+        path = TRACE_DIR / time.strftime("trace-%Y%m%d-%H%M%S.json")
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    data = snapshot()
+    data["dumped_at"] = time.time()
+    path.write_text(json.dumps(data, indent=2, default=str), encoding="utf-8")
+    return path